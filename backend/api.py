@@ -36,6 +36,19 @@ class VideoRequest(BaseModel):
     output_resolution: str = "1080x1920"
     content_type: str = "General"
     custom_config: Optional[Dict[str, Any]] = None
+    caption_mode: str = "word"  # "word" (one popping event per word) | "phrase" (2-4 words, karaoke fill)
+    crop_engine: str = "thread"  # "thread" | "process" (shards the video by frame range)
+    crop_workers: int = 0  # 0 = auto (CPU count - 2)
+    crop_sampler: str = "opencv"  # "opencv" (grab/retrieve) | "ffmpeg" (downscaled pipe)
+    crop_analysis_height: int = 360  # Face detection input height (0 = full res)
+    crop_smoothing: str = "ema"  # "ema" | "zero_phase" (forward-backward, no lag)
+    render_backend: str = "ffmpeg"  # "ffmpeg" (crop/scale/subs in one process) | "moviepy"
+    max_parallel_renders: int = 0  # 0 = auto (NVENC session limit / CPU count)
+    encoder_profile: str = "auto"  # "auto" | "nvenc" | "x264_quality" | "x264_faster" | "x264_veryfast" | "x265"
+    transcribe_mode: str = "single"  # "single" | "chunked" (VAD shards transcribed in parallel on CPU)
+    shared_decode: bool = True  # ffmpeg backend: overlapping/adjacent clips share one decode
+    draft: bool = False  # 540x960 ultrafast preview for caption/style iteration
+    draft_seconds: float = 0  # Draft only: render just the first N seconds (0 = whole clip)
 
 
 # --- App Setup ---
@@ -46,6 +59,16 @@ async def lifespan(app: FastAPI):
     # Startup
     global loop
     loop = asyncio.get_event_loop()
+
+    # Warm Whisper worker: the model loads while the backend sits idle
+    from src.ingest_transcribe import WHISPER_SERVER, get_whisper_server
+
+    if WHISPER_SERVER:
+        try:
+            get_whisper_server()
+        except Exception as e:
+            print(f"⚠️ Whisper server failed to start: {e}")
+
     print("🚀 Backend Startup Complete")
     yield
     # Shutdown
@@ -53,6 +76,20 @@ async def lifespan(app: FastAPI):
     if processing_thread and processing_thread.is_alive():
         cancel_event.set()
 
+    try:
+        from src.ingest_transcribe import stop_whisper_servers
+
+        stop_whisper_servers()
+    except Exception as e:
+        print(f"Whisper server shutdown error: {e}")
+
+    try:
+        from src.pipeline import release_draft_session
+
+        release_draft_session()
+    except Exception as e:
+        print(f"Draft session cleanup error: {e}")
+
     try:
         from src.cleanup import cleanup_temp_files
 
@@ -211,6 +248,19 @@ def start_process(req: VideoRequest, background_tasks: BackgroundTasks):
                 output_resolution=req.output_resolution,
                 content_type=req.content_type,
                 custom_config=req.custom_config,
+                caption_mode=req.caption_mode,
+                crop_engine=req.crop_engine,
+                crop_workers=req.crop_workers,
+                crop_sampler=req.crop_sampler,
+                crop_analysis_height=req.crop_analysis_height,
+                crop_smoothing=req.crop_smoothing,
+                render_backend=req.render_backend,
+                max_parallel_renders=req.max_parallel_renders,
+                transcribe_mode=req.transcribe_mode,
+                shared_decode=req.shared_decode,
+                draft=req.draft,
+                draft_seconds=req.draft_seconds,
+                encoder_profile=req.encoder_profile,
                 logger=ws_logger,
                 progress_callback=progress_callback,
                 cancel_event=cancel_event,
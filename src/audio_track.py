@@ -0,0 +1,95 @@
+"""
+Audio-only ingest track.
+
+The source container is demuxed once into a 16 kHz mono FLAC next to the
+video (`<name>.16k.flac`). Whisper, VAD and any later audio analysis read
+that small file instead of re-parsing the video, and the video can be
+deleted or streamed independently of it.
+"""
+
+import os
+import time
+
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_TRACK_SUFFIX = ".16k.flac"
+
+
+def audio_track_path(video_path):
+    """Where the extracted track of `video_path` lives (same folder, same name)."""
+    return os.path.splitext(video_path)[0] + AUDIO_TRACK_SUFFIX
+
+
+def has_audio_track(video_path):
+    """True if an up-to-date extracted track exists for `video_path`."""
+    path = audio_track_path(video_path)
+    try:
+        return os.path.getsize(path) > 0 and os.path.getmtime(path) >= os.path.getmtime(
+            video_path
+        )
+    except OSError:
+        return False
+
+
+def extract_audio_track(video_path, logger=None):
+    """
+    Decodes the first audio stream of `video_path` to 16 kHz mono FLAC, once.
+    Returns the track path (reused while it is newer than the video).
+    """
+    from src.ffmpeg_utils import get_ffmpeg_exe, run_ffmpeg
+
+    path = audio_track_path(video_path)
+    if has_audio_track(video_path):
+        return path
+
+    msg = "🔊 Extracting audio track (16 kHz mono FLAC)..."
+    print(msg, flush=True)
+    if logger:
+        logger.log(msg, "INFO")
+
+    start_time = time.time()
+    # Written under a temporary name so a killed run never leaves a partial track
+    partial = path + ".part"
+    try:
+        run_ffmpeg(
+            [
+                get_ffmpeg_exe(),
+                "-y",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                video_path,
+                "-map",
+                "0:a:0",
+                "-vn",
+                "-ac",
+                "1",
+                "-ar",
+                str(AUDIO_SAMPLE_RATE),
+                "-c:a",
+                "flac",
+                "-f",
+                "flac",
+                partial,
+            ]
+        )
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    msg = (
+        f"✅ Audio track ready ({os.path.getsize(path) / 1024 / 1024:.1f} MB "
+        f"in {time.time() - start_time:.1f}s)"
+    )
+    print(msg, flush=True)
+    if logger:
+        logger.log(msg, "INFO")
+    return path
+
+
+def remove_audio_track(video_path):
+    """Deletes the extracted track of `video_path`, if any."""
+    path = audio_track_path(video_path)
+    if os.path.exists(path):
+        os.remove(path)
@@ -1,11 +1,186 @@
+import json
 import os
 import random
+import threading
 from moviepy.video.io.VideoFileClip import VideoFileClip
 
+# Source B-Roll library (relative to the working directory, as the assets/ folder)
+B_ROLL_DIR = r"assets/b_roll"
+
+# Mezzanine format every B-Roll asset is normalised to once, at ingest
+PROXY_RESOLUTION = (1080, 1920)
+PROXY_FPS = 30
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+_ingest_lock = threading.Lock()
+
+
+def get_proxy_dir():
+    """<cache root>/b_roll - proxies + manifest.json."""
+    from src.disk_cache import get_cache_root
+
+    return os.path.join(get_cache_root(), "b_roll")
+
+
+def _load_manifest(proxy_dir):
+    try:
+        with open(os.path.join(proxy_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "assets": {}}
+
+
+def _save_manifest(proxy_dir, manifest):
+    path = os.path.join(proxy_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def transcode_proxy(source_path, proxy_path, resolution=PROXY_RESOLUTION, fps=PROXY_FPS):
+    """
+    Scales/center-crops a B-Roll file to fill `resolution` at `fps`, with a
+    keyframe every second so segments can be cut with stream copy. No audio.
+    """
+    from src.ffmpeg_utils import get_ffmpeg_exe, run_ffmpeg
+
+    width, height = resolution
+    tmp_path = f"{proxy_path}.tmp.mp4"
+    run_ffmpeg(
+        [
+            get_ffmpeg_exe(),
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            source_path,
+            "-an",
+            "-vf",
+            f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+            f"crop={width}:{height},fps={fps},setsar=1",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-crf",
+            "18",
+            "-pix_fmt",
+            "yuv420p",
+            "-g",
+            str(fps),
+            "-keyint_min",
+            str(fps),
+            "-sc_threshold",
+            "0",
+            "-movflags",
+            "+faststart",
+            tmp_path,
+        ]
+    )
+    os.replace(tmp_path, proxy_path)
+
+
+def ingest_b_roll(
+    asset_dir,
+    proxy_dir=None,
+    resolution=PROXY_RESOLUTION,
+    fps=PROXY_FPS,
+    logger=None,
+):
+    """
+    Transcodes new/changed files in `asset_dir` into 9:16 proxies and returns
+    the manifest's asset entries ({source name: {"proxy", "duration", ...}}).
+    Unchanged sources (same size + mtime + format) are not touched again;
+    proxies of deleted sources are removed.
+    """
+    from src.ffmpeg_utils import probe_video
+
+    proxy_dir = proxy_dir or get_proxy_dir()
+    if not os.path.exists(asset_dir):
+        return {}
+
+    with _ingest_lock:
+        os.makedirs(proxy_dir, exist_ok=True)
+        manifest = _load_manifest(proxy_dir)
+        assets = manifest["assets"]
+        changed = False
+
+        sources = sorted(
+            f for f in os.listdir(asset_dir) if f.lower().endswith((".mp4", ".mov"))
+        )
+        for name in sources:
+            source_path = os.path.join(asset_dir, name)
+            stat = os.stat(source_path)
+            signature = [stat.st_size, stat.st_mtime_ns, list(resolution), fps]
+
+            entry = assets.get(name)
+            if (
+                entry
+                and entry.get("signature") == signature
+                and os.path.exists(os.path.join(proxy_dir, entry["proxy"]))
+            ):
+                continue
+
+            msg = f"🎞️ Ingesting B-Roll: {name} -> {resolution[0]}x{resolution[1]}@{fps}"
+            print(msg)
+            if logger:
+                logger.log(msg, "INFO", "CYAN")
+
+            # The extension stays in the name: intro.mp4 and intro.mov get
+            # their own proxy
+            stem, ext = os.path.splitext(name)
+            proxy_name = f"{stem}_{ext[1:]}_{resolution[0]}x{resolution[1]}_{fps}.mp4"
+            proxy_path = os.path.join(proxy_dir, proxy_name)
+            try:
+                transcode_proxy(source_path, proxy_path, resolution, fps)
+                duration = probe_video(proxy_path)[3]
+            except Exception as e:
+                print(f"⚠️ Failed to ingest B-Roll {name}: {e}")
+                assets.pop(name, None)
+                changed = True
+                continue
+
+            assets[name] = {
+                "proxy": proxy_name,
+                "duration": duration,
+                "signature": signature,
+            }
+            changed = True
+
+        # Drop proxies whose source is gone
+        for name in [n for n in assets if n not in sources]:
+            stale = os.path.join(proxy_dir, assets.pop(name)["proxy"])
+            if os.path.exists(stale):
+                os.remove(stale)
+            changed = True
+
+        if changed:
+            _save_manifest(proxy_dir, manifest)
+        return dict(assets)
+
 
 class BRollManager:
-    def __init__(self, asset_dir=r"assets/b_roll"):
+    def __init__(
+        self,
+        asset_dir=B_ROLL_DIR,
+        proxy_dir=None,
+        resolution=PROXY_RESOLUTION,
+        fps=PROXY_FPS,
+        logger=None,
+    ):
         self.asset_dir = asset_dir
+        self.proxy_dir = proxy_dir or get_proxy_dir()
+        self.resolution = tuple(resolution)
+        self.fps = fps
+        self.logger = logger
+        self._assets = None
+
         self.b_roll_files = []
         if os.path.exists(asset_dir):
             self.b_roll_files = [
@@ -14,54 +189,68 @@ class BRollManager:
                 if f.lower().endswith((".mp4", ".mov"))
             ]
 
-    def get_random_b_roll(self, duration, target_resolution=(1080, 1920)):
+    @property
+    def assets(self):
+        """[(proxy_path, duration)], ingesting new sources on first access."""
+        if self._assets is None:
+            entries = ingest_b_roll(
+                self.asset_dir, self.proxy_dir, self.resolution, self.fps, self.logger
+            )
+            self._assets = [
+                (os.path.join(self.proxy_dir, e["proxy"]), e["duration"])
+                for _, e in sorted(entries.items())
+                if e["duration"] > 0
+            ]
+        return self._assets
+
+    def pick_segment(self, duration):
         """
-        Returns a VideoFileClip of the requested duration.
-        If the source is shorter, it loops.
-        It resizes/crops to fill the target resolution.
+        Chooses a random proxy segment: (proxy_path, start, loops). `start`
+        sits on a keyframe (proxies have one per second); `loops` is True
+        when the proxy is shorter than `duration` and must be looped.
         """
-        if not self.b_roll_files:
+        if not self.assets:
             return None
 
-        # Pick random file
-        file_path = random.choice(self.b_roll_files)
+        proxy_path, proxy_duration = random.choice(self.assets)
+        if proxy_duration < duration:
+            return proxy_path, 0.0, True
+
+        # Whole seconds only: cuts land on a keyframe, so stream copy is exact
+        max_start = int(proxy_duration - duration)
+        return proxy_path, float(random.randint(0, max_start)), False
+
+    def get_random_b_roll(self, duration, target_resolution=PROXY_RESOLUTION):
+        """
+        Returns a VideoFileClip of the requested duration, cut from an
+        ingested 9:16 proxy (looped if the proxy is shorter). Only resizes
+        when `target_resolution` differs from the proxy format.
+        """
+        segment = self.pick_segment(duration)
+        if segment is None:
+            return None
+        proxy_path, start, loops = segment
 
         try:
-            clip = VideoFileClip(file_path)
+            clip = VideoFileClip(proxy_path, audio=False)
         except Exception as e:
-            print(f"⚠️ Failed to load B-Roll {file_path}: {e}")
+            print(f"⚠️ Failed to load B-Roll {proxy_path}: {e}")
             return None
 
-        # Loop if needed
-        if clip.duration < duration:
-            clip = clip.loop(duration=duration)
+        if loops:
+            from moviepy.video.fx import Loop
+
+            clip = clip.with_effects([Loop(duration=duration)])
         else:
-            # Pick a random start point
-            max_start = clip.duration - duration
-            start = random.uniform(0, max_start)
             clip = clip.subclipped(start, start + duration)
 
-        # Resize/Crop to 9:16 (target_resolution)
-        # 1. Resize to cover (keeping aspect ratio)
-        target_w, target_h = target_resolution
-        clip_ratio = clip.w / clip.h
-        target_ratio = target_w / target_h
-
-        if clip_ratio > target_ratio:
-            # Source is wider than target: resize by height
-            new_h = target_h
-            new_w = int(new_h * clip_ratio)
-            clip = clip.resized(height=new_h)
-            # Center crop width
-            x_center = new_w / 2
-            clip = clip.cropped(x1=x_center - target_w / 2, width=target_w)
-        else:
-            # Source is taller/narrower: resize by width
-            new_w = target_w
-            new_h = int(new_w / clip_ratio)
-            clip = clip.resized(width=new_w)
-            # Center crop height
-            y_center = new_h / 2
-            clip = clip.cropped(y1=y_center - target_h / 2, height=target_h)
+        if tuple(target_resolution) != self.resolution:
+            clip = clip.resized(new_size=tuple(target_resolution))
 
         return clip.with_effects([])  # Ensure valid clip
+
+
+if __name__ == "__main__":
+    # Pre-ingest the library: python -m src.b_roll_manager
+    for name, entry in sorted(ingest_b_roll(B_ROLL_DIR).items()):
+        print(f"{name}: {entry['proxy']} ({entry['duration']:.1f}s)")
@@ -0,0 +1,222 @@
+"""
+Parallel chunked transcription (CPU).
+
+faster-whisper decodes a long source serially in one call. On CPU (int8)
+that is the slowest stage of the pipeline, so this mode extracts the audio
+once, cuts it at VAD silences into ~SHARD_SECONDS shards, transcribes the
+shards in a process pool (one model per process, cpu_threads split between
+them) and stitches the word timestamps back with each shard's offset.
+
+Cuts only land in silences, so no word is split between two shards.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+SHARD_SECONDS = 300
+# Silences shorter than this are not considered as cut points
+MIN_CUT_SILENCE = 0.3
+
+# Concurrent shard transcriptions (0 = auto); each process holds a model
+CHUNK_WORKERS = int(os.getenv("WHISPER_CHUNK_WORKERS", "0"))
+
+_shard_model = None
+
+
+def chunk_worker_count(num_shards, workers=0):
+    """Processes for the pool: one model each, ~4 CPU threads per model by default."""
+    if workers <= 0:
+        workers = CHUNK_WORKERS or max(1, (os.cpu_count() or 2) // 4)
+    return max(1, min(num_shards, workers))
+
+
+def extract_pcm(media_path, output_path, sample_rate=SAMPLE_RATE):
+    """Decodes the audio track once to raw mono float32 PCM (memory-mappable)."""
+    from src.ffmpeg_utils import get_ffmpeg_exe, run_ffmpeg
+
+    run_ffmpeg(
+        [
+            get_ffmpeg_exe(),
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            media_path,
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(sample_rate),
+            "-f",
+            "f32le",
+            output_path,
+        ]
+    )
+    return output_path
+
+
+def load_pcm(path):
+    """Read-only float32 view of a raw PCM file (no copy)."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="r")
+
+
+def speech_segments(audio, sample_rate=SAMPLE_RATE):
+    """Silero VAD speech regions: [(start_sample, end_sample)]."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(
+        min_silence_duration_ms=int(MIN_CUT_SILENCE * 1000), speech_pad_ms=100
+    )
+    return [
+        (s["start"], s["end"])
+        for s in get_speech_timestamps(audio, options, sampling_rate=sample_rate)
+    ]
+
+
+def plan_shards(speech, total_samples, shard_samples):
+    """
+    Cuts [0, total_samples) into shards of about `shard_samples`, each cut
+    at the middle of the silence nearest to the target length (within half a
+    shard). Without a usable silence the cut is made at the target.
+    Returns [(start_sample, end_sample)].
+    """
+    if total_samples <= 0:
+        return []
+
+    bounds = [0] + [x for segment in speech for x in segment] + [total_samples]
+    silences = [(a + b) // 2 for a, b in zip(bounds[::2], bounds[1::2]) if b > a]
+
+    cuts = [0]
+    while total_samples - cuts[-1] > shard_samples * 1.5:
+        target = cuts[-1] + shard_samples
+        low = cuts[-1] + shard_samples // 2
+        high = cuts[-1] + shard_samples * 3 // 2
+        candidates = [s for s in silences if low < s < high]
+        if candidates:
+            cuts.append(min(candidates, key=lambda s: abs(s - target)))
+        else:
+            cuts.append(target)
+    cuts.append(total_samples)
+    return list(zip(cuts, cuts[1:]))
+
+
+def load_cpu_model(model_size, cpu_threads):
+    """int8 faster-whisper model on the CPU with `cpu_threads` threads."""
+    from faster_whisper import WhisperModel
+    from src.transcribe_worker import BASE_DIR
+
+    return WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type="int8",
+        cpu_threads=cpu_threads,
+        download_root=os.path.join(BASE_DIR, "models", "whisper"),
+    )
+
+
+def _init_shard_worker(loader, model_size, cpu_threads):
+    global _shard_model
+    _shard_model = loader(model_size, cpu_threads)
+
+
+def _transcribe_shard(pcm_path, start, end, sample_rate):
+    """Words of one shard, in absolute source time."""
+    from src.transcribe_worker import transcribe_words
+
+    audio = np.array(load_pcm(pcm_path)[start:end])
+    offset = start / sample_rate
+    return [
+        {
+            "start": round(w["start"] + offset, 3),
+            "end": round(w["end"] + offset, 3),
+            "word": w["word"],
+        }
+        for w in transcribe_words(_shard_model, audio)
+    ]
+
+
+def transcribe_chunked(
+    media_path,
+    model_size="large-v3-turbo",
+    workers=0,
+    shard_seconds=SHARD_SECONDS,
+    temp_dir=None,
+    loader=load_cpu_model,
+    logger=None,
+    on_words=None,
+):
+    """
+    Word list for `media_path`, transcribed shard-parallel. on_words(batch)
+    receives each shard's words in source order as soon as it and every
+    earlier shard are done. `loader(model_size, cpu_threads)` builds the
+    model in each pool process.
+    """
+    import multiprocessing
+
+    temp_dir = temp_dir or os.path.dirname(os.path.abspath(media_path))
+    os.makedirs(temp_dir, exist_ok=True)
+    pcm_path = os.path.join(
+        temp_dir, f"{os.path.splitext(os.path.basename(media_path))[0]}.{os.getpid()}.f32"
+    )
+
+    start_time = time.time()
+    try:
+        extract_pcm(media_path, pcm_path)
+        audio = load_pcm(pcm_path)
+        shards = plan_shards(
+            speech_segments(audio), len(audio), int(shard_seconds * SAMPLE_RATE)
+        )
+        del audio
+        if not shards:
+            return []
+
+        workers = chunk_worker_count(len(shards), workers)
+        cpu_threads = max(1, (os.cpu_count() or 2) // workers)
+
+        msg = (
+            f"🎙️  Chunked transcription: {len(shards)} shards, "
+            f"{workers} workers x {cpu_threads} threads"
+        )
+        print(msg, flush=True)
+        if logger:
+            logger.log(msg, "INFO")
+
+        words = []
+        # spawn: the backend process holds threads (and maybe CUDA) - never fork it
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_shard_worker,
+            initargs=(loader, model_size, cpu_threads),
+        ) as executor:
+            futures = [
+                executor.submit(_transcribe_shard, pcm_path, a, b, SAMPLE_RATE)
+                for a, b in shards
+            ]
+            try:
+                for future in futures:
+                    batch = future.result()
+                    words.extend(batch)
+                    if on_words and batch:
+                        on_words(batch)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        elapsed = time.time() - start_time
+        msg = f"✅ Chunked transcription: {len(words)} words in {elapsed:.1f}s"
+        print(msg, flush=True)
+        if logger:
+            logger.log(msg, "INFO")
+        return words
+    finally:
+        if os.path.exists(pcm_path):
+            os.remove(pcm_path)
@@ -0,0 +1,226 @@
+import numpy as np
+
+
+def _merge_runs(runs, distance):
+    """Merges sorted [start, end) runs separated by less than `distance`."""
+    keep_apart = runs[1:, 0] - runs[:-1, 1] >= distance
+    first = np.concatenate(([0], np.flatnonzero(keep_apart) + 1))
+    last = np.concatenate((first[1:] - 1, [len(runs) - 1]))
+    return np.stack((runs[first, 0], runs[last, 1]), axis=1)
+
+
+class CropTrack:
+    """
+    Array-backed result of SmartCropper.analyze_video.
+
+    One entry per analyzed (sampled) source frame:
+        frames    - sorted int32 source frame indices
+        crop_x    - int16 left edge of the 9:16 crop window (source pixels)
+        face_bits - np.packbits() of the "face detected" mask
+
+    Lookups are vectorized: a whole clip's frames are resolved in one
+    np.interp / np.searchsorted call instead of a Python search per frame.
+    Tracks round-trip through .npz so they can be cached on disk.
+    """
+
+    def __init__(
+        self, frames, crop_x, face_mask, fps, width, height, crop_width, stride=1
+    ):
+        self.frames = np.asarray(frames, dtype=np.int32)
+        self.crop_x = np.asarray(crop_x, dtype=np.int16)
+        self.face_bits = np.packbits(np.asarray(face_mask, dtype=bool))
+        self.fps = float(fps)
+        self.width = int(width)
+        self.height = int(height)
+        self.crop_width = int(crop_width)
+        # Sample spacing in frames: a frame further than this from its
+        # previous sample lies outside the analyzed windows.
+        self.stride = max(1, int(stride))
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def face_mask(self):
+        """Per-sample face-detected flags as a bool array."""
+        return np.unpackbits(self.face_bits, count=len(self.frames)).astype(bool)
+
+    @property
+    def default_crop_x(self):
+        """Centered crop, used when there is no analysis data."""
+        return (self.width - self.crop_width) // 2
+
+    def crop_x_at_frames(self, frame_indices):
+        """Linearly interpolated crop_x (int32) for an array of source frame indices."""
+        frame_indices = np.asarray(frame_indices)
+        if not len(self.frames):
+            return np.full(frame_indices.shape, self.default_crop_x, dtype=np.int32)
+
+        values = np.interp(frame_indices, self.frames, self.crop_x)
+        values = np.floor(values).astype(np.int32)
+        return np.clip(values, 0, max(0, self.width - self.crop_width))
+
+    def crop_x_at(self, times):
+        """crop_x for an array of absolute timestamps (seconds)."""
+        frame_indices = (np.asarray(times, dtype=np.float64) * self.fps).astype(np.int64)
+        return self.crop_x_at_frames(frame_indices)
+
+    def face_at_frames(self, frame_indices, default=True):
+        """
+        Face-detected flag per source frame, held from the previous sample.
+        Frames outside the analyzed windows return `default`.
+        """
+        frame_indices = np.asarray(frame_indices)
+        result = np.full(frame_indices.shape, bool(default), dtype=bool)
+        if not len(self.frames):
+            return result
+
+        pos = np.searchsorted(self.frames, frame_indices, side="right") - 1
+        covered = pos >= 0
+        pos = np.clip(pos, 0, len(self.frames) - 1)
+        covered &= (frame_indices - self.frames[pos]) < self.stride
+
+        result[covered] = self.face_mask[pos[covered]]
+        return result
+
+    def _sample_spans(self):
+        """[start, end) source frames each sample stands for (up to `stride`)."""
+        frames = self.frames.astype(np.int64)
+        next_frames = np.append(frames[1:], frames[-1] + self.stride)
+        return frames, np.minimum(frames + self.stride, next_frames)
+
+    def no_face_runs(self, start_frame=0, end_frame=None, hysteresis=0, merge_distance=0):
+        """
+        Run-length encoded "no face" spans as an int64 (n, 2) array of
+        [start, end) source frames, clipped to [start_frame, end_frame).
+
+        Each sample covers the frames up to the next sample (at most
+        `stride`); frames outside the analyzed windows count as face present.
+        hysteresis (frames): face blips shorter than this inside a gap are
+        filled, then gaps shorter than this are dropped (debounces detector
+        flicker). merge_distance (frames): gaps closer than this are merged.
+        """
+        empty = np.empty((0, 2), dtype=np.int64)
+        if not len(self.frames):
+            return empty
+
+        frames, span_end = self._sample_spans()
+        no_face = ~self.face_mask
+
+        # Run boundaries: no-face samples whose neighbour is a face sample
+        # or lies across a hole in the analyzed windows
+        contiguous = span_end[:-1] == frames[1:]
+        prev_no_face = np.concatenate(([False], no_face[:-1] & contiguous))
+        next_no_face = np.concatenate((no_face[1:] & contiguous, [False]))
+        runs = np.stack(
+            (
+                frames[no_face & ~prev_no_face],
+                span_end[no_face & ~next_no_face],
+            ),
+            axis=1,
+        )
+
+        if hysteresis > 0 and len(runs):
+            runs = _merge_runs(runs, hysteresis)
+            runs = runs[runs[:, 1] - runs[:, 0] >= hysteresis]
+        if merge_distance > 0 and len(runs):
+            runs = _merge_runs(runs, merge_distance)
+
+        if end_frame is None:
+            end_frame = int(span_end[-1])
+        runs = np.clip(runs, start_frame, end_frame)
+        runs = runs[runs[:, 1] > runs[:, 0]]
+        return runs if len(runs) else empty
+
+    def no_face_intervals(
+        self, start_t=None, end_t=None, min_gap=2.0, hysteresis=0.0, merge_distance=0.0
+    ):
+        """
+        (start, end) seconds of "no face" gaps at least `min_gap` long, within
+        [start_t, end_t) (whole track by default). All thresholds in seconds.
+        """
+        start_frame = int(start_t * self.fps) if start_t is not None else 0
+        end_frame = int(end_t * self.fps) if end_t is not None else None
+        runs = self.no_face_runs(
+            start_frame,
+            end_frame,
+            hysteresis=int(round(hysteresis * self.fps)),
+            merge_distance=int(round(merge_distance * self.fps)),
+        )
+        runs = runs[runs[:, 1] - runs[:, 0] >= int(min_gap * self.fps)]
+        return [(a / self.fps, b / self.fps) for a, b in runs.tolist()]
+
+    def face_presence_report(self, min_gap=2.0, hysteresis=0.0, merge_distance=0.0):
+        """Face coverage summary over the analyzed windows of the source."""
+        if not len(self.frames):
+            return {
+                "analyzed_sec": 0.0,
+                "face_sec": 0.0,
+                "no_face_sec": 0.0,
+                "face_ratio": 1.0,
+                "gaps": [],
+                "longest_gap_sec": 0.0,
+            }
+
+        frames, span_end = self._sample_spans()
+        analyzed = float((span_end - frames).sum()) / self.fps
+        no_face = float(((span_end - frames)[~self.face_mask]).sum()) / self.fps
+        gaps = self.no_face_intervals(
+            min_gap=min_gap, hysteresis=hysteresis, merge_distance=merge_distance
+        )
+        return {
+            "analyzed_sec": analyzed,
+            "face_sec": analyzed - no_face,
+            "no_face_sec": no_face,
+            "face_ratio": (analyzed - no_face) / analyzed if analyzed else 1.0,
+            "gaps": gaps,
+            "longest_gap_sec": max((b - a for a, b in gaps), default=0.0),
+        }
+
+    def save(self, path):
+        """Writes the track to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            frames=self.frames,
+            crop_x=self.crop_x,
+            face_bits=self.face_bits,
+            meta=np.array(
+                [self.fps, self.width, self.height, self.crop_width, self.stride],
+                dtype=np.float64,
+            ),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            fps, width, height, crop_width, stride = data["meta"].tolist()
+            frames = data["frames"]
+            face_mask = np.unpackbits(data["face_bits"], count=len(frames)).astype(bool)
+            return cls(
+                frames,
+                data["crop_x"],
+                face_mask,
+                fps,
+                int(width),
+                int(height),
+                int(crop_width),
+                int(stride),
+            )
+
+    @classmethod
+    def from_maps(
+        cls, crop_map, face_presence_map, fps, width, height, crop_width, stride=1
+    ):
+        """Builds a track from legacy {frame_idx: crop_x} / {frame_idx: bool} dicts."""
+        frames = sorted(crop_map) if crop_map else []
+        face_presence_map = face_presence_map or {}
+        return cls(
+            frames,
+            [crop_map[f] for f in frames],
+            [face_presence_map.get(f, True) for f in frames],
+            fps,
+            width,
+            height,
+            crop_width,
+            stride,
+        )
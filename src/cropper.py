@@ -1,5 +1,11 @@
 import cv2
+import math
 import os
+import threading
+
+import numpy as np
+
+from src.crop_track import CropTrack
 
 # DO NOT CHANGE THIS ORDER
 # Suppress MediaPipe/TensorFlow C++ warnings (0 = all, 1 = info, 2 = warning, 3 = error)
@@ -11,13 +17,401 @@ import mediapipe as mp
 mp_face_detection = mp.solutions.face_detection
 mp_drawing = mp.solutions.drawing_utils
 
+# Detector settings (full-range model, tuned for podcast/interview framing)
+DETECTOR_MODEL_SELECTION = 1
+DETECTOR_MIN_CONFIDENCE = 0.6
+
+# Face sampling rate in Hz (stride adapts to the source fps: 24fps -> every 4th frame)
+ANALYSIS_SAMPLE_HZ = 6.0
+# Frames are downscaled to this height before detection (0 = full resolution).
+# MediaPipe resizes to a small internal tensor anyway, so 1080p/4K input only
+# costs decode bandwidth and a full-size cvtColor.
+ANALYSIS_HEIGHT = 360
+
+# Crop smoothing: EMA factor per sample (scene cuts snap with alpha = 1.0)
+SMOOTHING_ALPHA = 0.2
+# Block length of the closed-form EMA (keeps (1 - alpha)^-n well inside float64)
+EMA_BLOCK = 128
+
+# Extra seconds analyzed around each requested time range (smoothing warm-up)
+RANGE_PADDING_SEC = 2.0
+
+# Process engine: minimum shard length in frames (keeps seek overhead small)
+MIN_SHARD_FRAMES = 24 * 30
+
+# End of a frame range that runs to the end of the video (frame counts are estimates)
+OPEN_END = 2**31 - 1
+
+# One SmartCropper per pool process (built on the first shard it receives)
+_process_cropper = None
+
+
+def stride_for_fps(fps, sample_hz=ANALYSIS_SAMPLE_HZ):
+    """Frame stride that samples `sample_hz` frames per second of source video."""
+    if not sample_hz or sample_hz <= 0:
+        return 1
+    return max(1, int(round((fps or 24.0) / sample_hz)))
+
+
+def analysis_size(src_width, src_height, analysis_height=ANALYSIS_HEIGHT):
+    """(width, height) frames are analyzed at - never upscaled, even dimensions."""
+    if not analysis_height or analysis_height >= src_height:
+        return src_width, src_height
+    out_w = max(2, int(round(src_width * analysis_height / src_height / 2)) * 2)
+    return out_w, int(analysis_height)
+
+
+def frame_ranges_for(time_ranges, fps, total_frames, stride, padding=RANGE_PADDING_SEC):
+    """
+    Converts (start_sec, end_sec) ranges into sorted, merged [start, end) frame
+    ranges, padded by `padding` seconds and with starts aligned to `stride`.
+    No ranges = the whole video.
+    """
+    if not time_ranges:
+        return [(0, total_frames)]
+
+    padded = []
+    for start_sec, end_sec in time_ranges:
+        start = max(0, int((start_sec - padding) * fps))
+        start -= start % stride
+        end = min(total_frames, int(math.ceil((end_sec + padding) * fps)))
+        if end > start:
+            padded.append((start, end))
+
+    return merge_frame_ranges(padded)
+
+
+def merge_frame_ranges(ranges):
+    """Sorted union of [start, end) ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_frame_ranges(frame_ranges, covered, stride):
+    """
+    Parts of `frame_ranges` not in `covered` (both sorted and merged), with
+    starts moved up to the next multiple of `stride` so the sampled frames
+    line up with the ones already analyzed.
+    """
+    missing = []
+    for start, end in frame_ranges:
+        pos = start
+        for covered_start, covered_end in covered:
+            if covered_end <= pos or covered_start >= end:
+                continue
+            if covered_start > pos:
+                missing.append((pos, covered_start))
+            pos = max(pos, covered_end)
+            if pos >= end:
+                break
+        if pos < end:
+            missing.append((pos, end))
+
+    aligned = []
+    for start, end in missing:
+        start += -start % stride
+        if end > start:
+            aligned.append((start, end))
+    return aligned
+
+
+def save_detections(path, indices, rel_xs, covered):
+    """Raw face samples + the frame ranges they cover, as a compressed .npz."""
+    np.savez_compressed(
+        path,
+        indices=np.asarray(indices, dtype=np.int32),
+        rel_xs=np.asarray(rel_xs, dtype=np.float32),
+        covered=np.asarray(covered, dtype=np.int64).reshape(-1, 2),
+    )
+
+
+def load_detections(path):
+    """(indices, rel_xs, covered ranges) written by save_detections."""
+    with np.load(path) as data:
+        covered = [tuple(r) for r in data["covered"].tolist()]
+        return data["indices"], data["rel_xs"], covered
+
+
+def _ema(x, alpha, y_prev):
+    """
+    Vectorized y[n] = (1 - alpha) * y[n-1] + alpha * x[n], starting from y_prev.
+    Solved in closed form per block: y[n] = d^(n+1) * (y_prev + alpha * sum(x[k] / d^(k+1))).
+    """
+    if alpha >= 1.0:
+        return x.copy()
+
+    d = 1.0 - alpha
+    y = np.empty_like(x)
+    for b in range(0, len(x), EMA_BLOCK):
+        xb = x[b : b + EMA_BLOCK]
+        powers = d ** np.arange(1, len(xb) + 1)
+        y[b : b + len(xb)] = powers * (y_prev + alpha * np.cumsum(xb / powers))
+        y_prev = y[b + len(xb) - 1]
+    return y
+
+
+def smooth_crop_path(rel_x, reset_mask, alpha=SMOOTHING_ALPHA, mode="ema", initial=0.5):
+    """
+    Segment-wise EMA over relative face positions. Every sample flagged in
+    `reset_mask` (scene cut / new clip window) snaps to its target and starts a
+    new segment. mode="zero_phase" runs a second, backward pass per segment
+    (forward-backward filtering) which removes the EMA's lag.
+    """
+    n = len(rel_x)
+    smoothed = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return smoothed
+
+    starts = np.flatnonzero(reset_mask)
+    bounds = np.unique(np.concatenate(([0], starts, [n])))
+
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        segment = rel_x[a:b]
+        y_prev = segment[0] if reset_mask[a] else initial
+        forward = _ema(segment, alpha, y_prev)
+        if mode == "zero_phase":
+            forward = _ema(forward[::-1], alpha, forward[-1])[::-1]
+        smoothed[a:b] = forward
+    return smoothed
+
+
+def build_crop_track(
+    indices,
+    rel_xs,
+    fps,
+    width,
+    height,
+    target_width,
+    stride,
+    scene_boundaries=None,
+    window_starts=(),
+    smoothing="ema",
+):
+    """
+    Post-process raw detections into a CropTrack (vectorized):
+    hold last face when none is detected, snap at scene cuts / clip windows,
+    smooth in between and convert to clamped crop_x pixels.
+        indices: sorted sample frame indices; rel_xs: face center (NaN = no face)
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    rel_xs = np.asarray(rel_xs, dtype=np.float64)
+    face_mask = ~np.isnan(rel_xs)
+
+    # 1. HOLD: forward-fill the last detected position (0.5 at the start of
+    #    the video and of every new clip window)
+    window_mask = np.isin(indices, np.asarray(list(window_starts), dtype=np.int64))
+    anchors = face_mask | window_mask
+    if len(anchors):
+        anchors[0] = True
+    filled = np.where(face_mask, rel_xs, 0.5)
+    last_anchor = np.maximum.accumulate(np.where(anchors, np.arange(len(indices)), 0))
+    target = filled[last_anchor]
+
+    # 2. CUT PROXIMITY: a sample within `stride` frames of a scene cut snaps
+    cut_frames = []
+    for scene in scene_boundaries or []:
+        # scene_boundaries contains dicts with 'start', 'end', 'duration'
+        t = scene.get("start", scene) if isinstance(scene, dict) else scene
+        cut_frames.append(int(t * fps))
+    reset_mask = window_mask.copy()
+    if cut_frames and len(indices):
+        cuts = np.unique(np.asarray(cut_frames, dtype=np.int64))
+        pos = np.searchsorted(cuts, indices)
+        after = np.abs(cuts[np.minimum(pos, len(cuts) - 1)] - indices)
+        before = np.abs(indices - cuts[np.maximum(pos - 1, 0)])
+        reset_mask |= np.minimum(after, before) <= stride
+
+    # 3. SMOOTH (segment-wise, resetting at cuts)
+    smoothed = smooth_crop_path(target, reset_mask, mode=smoothing)
+
+    # 4. Convert to Crop X (Top-Left corner) with boundary checks
+    center_pix = np.floor(smoothed * width)
+    crop_x = np.trunc(center_pix - (target_width / 2))
+    crop_x = np.clip(crop_x, 0, width - target_width)
+
+    return CropTrack(
+        indices, crop_x, face_mask, fps, width, height, target_width, stride
+    )
+
+
+def iter_sampled_frames(
+    video_path, start_frame, end_frame, stride, analysis_height=ANALYSIS_HEIGHT
+):
+    """
+    Yields (frame_idx, bgr_frame) for every frame in [start_frame, end_frame)
+    whose index is a multiple of `stride`.
+    Skipped frames only go through cap.grab() - no BGR conversion, no copy.
+    Sampled frames are downscaled to `analysis_height`.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        frame_idx = 0
+        if start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            # Some containers can only seek to a keyframe - trust the reported position
+            frame_idx = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if frame_idx > start_frame or frame_idx < 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                frame_idx = 0
+
+        while end_frame is None or frame_idx < end_frame:
+            if not cap.grab():
+                break
+            if frame_idx >= start_frame and frame_idx % stride == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    h, w = frame.shape[:2]
+                    out_w, out_h = analysis_size(w, h, analysis_height)
+                    if out_h != h:
+                        frame = cv2.resize(
+                            frame, (out_w, out_h), interpolation=cv2.INTER_AREA
+                        )
+                    yield frame_idx, frame
+            frame_idx += 1
+    finally:
+        cap.release()
+
+
+def iter_ffmpeg_frames(
+    video_path,
+    start_frame,
+    end_frame,
+    stride,
+    fps,
+    src_width,
+    src_height,
+    analysis_height=ANALYSIS_HEIGHT,
+):
+    """
+    Same contract as iter_sampled_frames, but FFmpeg does the sampling
+    (select filter) and downscaling, and pipes raw BGR frames to us.
+    start_frame must be a multiple of stride.
+    """
+    import subprocess
+    from src.ffmpeg_utils import get_ffmpeg_exe
+
+    out_w, out_h = analysis_size(src_width, src_height, analysis_height)
+    frame_bytes = out_w * out_h * 3
+
+    cmd = [get_ffmpeg_exe(), "-v", "error", "-nostdin"]
+    if start_frame > 0:
+        cmd += ["-ss", f"{start_frame / fps:.6f}"]
+    cmd += ["-i", video_path]
+    if end_frame is not None:
+        cmd += ["-t", f"{(end_frame - start_frame) / fps:.6f}"]
+    cmd += [
+        "-an",
+        "-vf",
+        f"select='not(mod(n\\,{stride}))',scale={out_w}:{out_h}",
+        "-fps_mode",
+        "passthrough",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "bgr24",
+        "pipe:1",
+    ]
+
+    process = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=frame_bytes
+    )
+    try:
+        frame_idx = start_frame
+        while True:
+            buf = process.stdout.read(frame_bytes)
+            if len(buf) < frame_bytes:
+                break
+            frame = np.frombuffer(buf, dtype=np.uint8).reshape((out_h, out_w, 3))
+            yield frame_idx, frame
+            frame_idx += stride
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def open_frame_sampler(video_path, start_frame, end_frame, stride, sampler, meta):
+    """Returns the (frame_idx, frame) iterator for the requested sampler."""
+    if sampler == "ffmpeg":
+        return iter_ffmpeg_frames(
+            video_path,
+            start_frame,
+            end_frame,
+            stride,
+            meta["fps"],
+            meta["width"],
+            meta["height"],
+            meta["analysis_height"],
+        )
+    return iter_sampled_frames(
+        video_path, start_frame, end_frame, stride, meta["analysis_height"]
+    )
+
+
+def _analyze_frame_range(
+    video_path, start_frame, end_frame, stride, focus_region, sampler, meta
+):
+    """
+    Process-pool worker: detects faces on every `stride`-th frame of
+    [start_frame, end_frame). Opens its own decoder and seeks to the range.
+    Returns (frame_indices int32, rel_x float32 with NaN = no face).
+    """
+    global _process_cropper
+    if _process_cropper is None:
+        _process_cropper = SmartCropper()
+
+    indices = []
+    rel_xs = []
+
+    for frame_idx, frame in open_frame_sampler(
+        video_path, start_frame, end_frame, stride, sampler, meta
+    ):
+        rel_x = _process_cropper.get_face_center(frame, None, focus_region)
+        indices.append(frame_idx)
+        rel_xs.append(np.nan if rel_x is None else rel_x)
+
+    return np.array(indices, dtype=np.int32), np.array(rel_xs, dtype=np.float32)
+
 
 class SmartCropper:
     def __init__(self):
-        # We use the explicitly imported sub-module here
-        self.face_detection = mp_face_detection.FaceDetection(
-            model_selection=1, min_detection_confidence=0.65
-        )
+        # Worker-local detector pool: each thread lazily builds ONE MediaPipe
+        # graph and reuses it for every frame it processes. Building a graph
+        # per frame (old behaviour) costs far more than the inference itself.
+        self._local = threading.local()
+        self._detectors = []
+        self._detectors_lock = threading.Lock()
+
+    @property
+    def face_detection(self):
+        """FaceDetection instance owned by the calling thread (created on first use)."""
+        detector = getattr(self._local, "face_detection", None)
+        if detector is None:
+            detector = mp_face_detection.FaceDetection(
+                model_selection=DETECTOR_MODEL_SELECTION,
+                min_detection_confidence=DETECTOR_MIN_CONFIDENCE,
+            )
+            self._local.face_detection = detector
+            with self._detectors_lock:
+                self._detectors.append(detector)
+        return detector
+
+    def close(self):
+        """Releases every pooled detector graph (they are rebuilt lazily if needed)."""
+        with self._detectors_lock:
+            detectors, self._detectors = self._detectors, []
+            self._local = threading.local()
+        for detector in detectors:
+            try:
+                detector.close()
+            except Exception:
+                pass
 
     def get_face_center(self, image, prior_x=None, focus_region="auto"):
         """
@@ -26,63 +420,231 @@ class SmartCropper:
         try:
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
-            with mp_face_detection.FaceDetection(
-                model_selection=1, min_detection_confidence=0.6
-            ) as face_detection:
-                results = face_detection.process(image_rgb)
-
-                if results.detections:
-                    best_face = None
-                    best_score = -1
-
-                    for detection in results.detections:
-                        bbox = detection.location_data.relative_bounding_box
-                        center_x = bbox.xmin + (bbox.width / 2)
-                        box_area = bbox.width * bbox.height
-
-                        # --- SCORING LOGIC ---
-                        score = 0
-
-                        if focus_region == "left":
-                            # Bonus for being on the left (0.0 - 0.45)
-                            # We use 0.45 to be slightly generous
-                            score = box_area * (3.0 if center_x < 0.45 else 0.5)
-                        elif focus_region == "right":
-                            # Bonus for being on the right (0.55 - 1.0)
-                            score = box_area * (3.0 if center_x > 0.55 else 0.5)
-                        elif focus_region == "center":
-                            # Bonus for being in center (0.35 - 0.65)
-                            score = box_area * (3.0 if 0.35 < center_x < 0.65 else 0.5)
-                        else:  # "auto"
-                            # Weighted: Size is King, but Center is Queen.
-                            # Size^1.2 makes large faces significantly better.
-                            # Bias against extreme edges using dist_from_center.
-                            dist_from_center = abs(0.5 - center_x)
-                            center_bias = (1 - dist_from_center) ** 0.8
-                            score = (box_area**1.2) * center_bias
-
-                        # Stickiness Bonus (Process Continuity)
-                        if prior_x is not None:
-                            dist_to_prior = abs(center_x - prior_x)
-                            # If very close to prior, huge bonus (maintain lock)
-                            if dist_to_prior < 0.1:
-                                score *= 2.0
-                            elif dist_to_prior > 0.3:
-                                score *= 0.5
-
-                        if score > best_score:
-                            best_score = score
-                            best_face = detection
-
-                    if best_face:
-                        bbox = best_face.location_data.relative_bounding_box
-                        return bbox.xmin + (bbox.width / 2)
+            results = self.face_detection.process(image_rgb)
+
+            if results.detections:
+                best_face = None
+                best_score = -1
+
+                for detection in results.detections:
+                    bbox = detection.location_data.relative_bounding_box
+                    center_x = bbox.xmin + (bbox.width / 2)
+                    box_area = bbox.width * bbox.height
+
+                    # --- SCORING LOGIC ---
+                    score = 0
+
+                    if focus_region == "left":
+                        # Bonus for being on the left (0.0 - 0.45)
+                        # We use 0.45 to be slightly generous
+                        score = box_area * (3.0 if center_x < 0.45 else 0.5)
+                    elif focus_region == "right":
+                        # Bonus for being on the right (0.55 - 1.0)
+                        score = box_area * (3.0 if center_x > 0.55 else 0.5)
+                    elif focus_region == "center":
+                        # Bonus for being in center (0.35 - 0.65)
+                        score = box_area * (3.0 if 0.35 < center_x < 0.65 else 0.5)
+                    else:  # "auto"
+                        # Weighted: Size is King, but Center is Queen.
+                        # Size^1.2 makes large faces significantly better.
+                        # Bias against extreme edges using dist_from_center.
+                        dist_from_center = abs(0.5 - center_x)
+                        center_bias = (1 - dist_from_center) ** 0.8
+                        score = (box_area**1.2) * center_bias
+
+                    # Stickiness Bonus (Process Continuity)
+                    if prior_x is not None:
+                        dist_to_prior = abs(center_x - prior_x)
+                        # If very close to prior, huge bonus (maintain lock)
+                        if dist_to_prior < 0.1:
+                            score *= 2.0
+                        elif dist_to_prior > 0.3:
+                            score *= 0.5
+
+                    if score > best_score:
+                        best_score = score
+                        best_face = detection
+
+                if best_face:
+                    bbox = best_face.location_data.relative_bounding_box
+                    return bbox.xmin + (bbox.width / 2)
 
         except Exception:
             pass
 
         return None
 
+    def _detect_threaded(
+        self,
+        video_path,
+        frame_ranges,
+        total_frames,
+        stride,
+        batch_size,
+        focus_region,
+        workers,
+        sampler,
+        meta,
+        progress_callback,
+        logger,
+    ):
+        """Single decoder, detection fanned out to a thread pool. Returns (indices, rel_xs)."""
+        import concurrent.futures
+
+        cpu_count = os.cpu_count() or 4
+        max_workers = workers or max(1, cpu_count - 2)
+        if max_workers > 16:
+            max_workers = 16
+
+        def process_batch(executor, frames_data):
+            results = []
+            # pass None for prior_x in parallel, but pass focus_region!
+            future_to_idx = {
+                executor.submit(self.get_face_center, f, None, focus_region): idx
+                for f, idx in frames_data
+            }
+            for future in concurrent.futures.as_completed(future_to_idx):
+                try:
+                    results.append((future_to_idx[future], future.result()))
+                except Exception:
+                    pass
+            return results
+
+        if logger:
+            logger.log(f"🚀 Analyzing with {max_workers} threads...", "INFO")
+
+        def iter_frames():
+            # Seek straight to each range; the last one is open-ended because
+            # CAP_PROP_FRAME_COUNT is only an estimate.
+            for start, end in frame_ranges:
+                yield from open_frame_sampler(
+                    video_path,
+                    start,
+                    end if end < total_frames else None,
+                    stride,
+                    sampler,
+                    meta,
+                )
+
+        all_results = []
+        frames = iter_frames()
+        range_frames = sum(end - start for start, end in frame_ranges)
+        done_frames = 0
+        range_idx = 0
+
+        # One executor for the whole pass so each worker thread keeps its
+        # pooled detector alive across batches.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                batch_frames = []
+                for frame_idx, frame in frames:
+                    batch_frames.append((frame, frame_idx))
+                    if len(batch_frames) >= batch_size:
+                        break
+
+                if not batch_frames:
+                    break
+
+                batch_results = process_batch(executor, batch_frames)
+                all_results.extend(batch_results)
+
+                if progress_callback:
+                    # Frames covered so far across all (possibly disjoint) ranges
+                    while frame_idx >= frame_ranges[range_idx][1] and range_idx + 1 < len(
+                        frame_ranges
+                    ):
+                        done_frames += (
+                            frame_ranges[range_idx][1] - frame_ranges[range_idx][0]
+                        )
+                        range_idx += 1
+                    covered = done_frames + frame_idx + 1 - frame_ranges[range_idx][0]
+                    progress_callback(min(1.0, covered / max(range_frames, 1)))
+
+        indices = np.array([idx for idx, _ in all_results], dtype=np.int32)
+        rel_xs = np.array(
+            [np.nan if rel_x is None else rel_x for _, rel_x in all_results],
+            dtype=np.float32,
+        )
+        return indices, rel_xs
+
+    def _detect_in_processes(
+        self,
+        video_path,
+        frame_ranges,
+        total_frames,
+        stride,
+        focus_region,
+        workers,
+        sampler,
+        meta,
+        progress_callback,
+        logger,
+    ):
+        """
+        Shards the frame ranges across a ProcessPoolExecutor. Every worker
+        decodes its own shard, so decode + MediaPipe scale past the GIL.
+        Returns (indices, rel_xs) arrays merged from all shards (NaN = no face).
+        """
+        import concurrent.futures
+
+        max_workers = workers or max(1, (os.cpu_count() or 4) - 2)
+        range_frames = sum(end - start for start, end in frame_ranges)
+
+        # ~4 shards per worker for load balancing; boundaries on stride multiples
+        # so the sampled frames are identical to the threaded engine.
+        shard_len = max(MIN_SHARD_FRAMES, range_frames // (max_workers * 4) + 1)
+        shard_len = ((shard_len + stride - 1) // stride) * stride
+        shards = [
+            (start, min(start + shard_len, range_end))
+            for range_start, range_end in frame_ranges
+            for start in range(range_start, max(range_end, range_start + 1), shard_len)
+        ]
+        max_workers = min(max_workers, len(shards))
+
+        if logger:
+            logger.log(
+                f"🚀 Analyzing with {max_workers} processes ({len(shards)} shards)...",
+                "INFO",
+            )
+
+        index_parts = []
+        rel_x_parts = []
+        done_frames = 0
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # The last shard is open-ended: CAP_PROP_FRAME_COUNT is only an estimate
+            future_to_shard = {
+                executor.submit(
+                    _analyze_frame_range,
+                    video_path,
+                    start,
+                    end if end < total_frames else None,
+                    stride,
+                    focus_region,
+                    sampler,
+                    meta,
+                ): (start, end)
+                for start, end in shards
+            }
+            for future in concurrent.futures.as_completed(future_to_shard):
+                start, end = future_to_shard[future]
+                try:
+                    indices, rel_xs = future.result()
+                    index_parts.append(indices)
+                    rel_x_parts.append(rel_xs)
+                except Exception as e:
+                    if logger:
+                        logger.error(f"Face analysis shard {start}-{end} failed: {e}")
+
+                done_frames += end - start
+                if progress_callback:
+                    progress_callback(min(1.0, done_frames / max(range_frames, 1)))
+
+        if not index_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        return np.concatenate(index_parts), np.concatenate(rel_x_parts)
+
     def analyze_video(
         self,
         video_path,
@@ -90,18 +652,40 @@ class SmartCropper:
         logger=None,
         focus_region="auto",
         scene_boundaries=None,
+        engine="thread",
+        workers=0,
+        sample_hz=ANALYSIS_SAMPLE_HZ,
+        sampler="opencv",
+        analysis_height=ANALYSIS_HEIGHT,
+        time_ranges=None,
+        range_padding=RANGE_PADDING_SEC,
+        smoothing="ema",
+        cache=None,
     ):
         """
         Analyzes video for face centering with Sticky Focus and Region Preference.
         Args:
             scene_boundaries: List of timestamps (seconds) where scenes change.
+            engine: "thread" (one decoder, threaded detection) or "process"
+                (video sharded by frame range across a ProcessPoolExecutor).
+            workers: Worker count for the chosen engine (0 = auto).
+            sample_hz: Face samples per second of video (stride adapts to fps).
+            sampler: "opencv" (grab/retrieve) or "ffmpeg" (select filter +
+                downscaled raw pipe).
+            analysis_height: Detection input height in px (0 = full resolution).
+                Face positions are relative, so crop output is unaffected.
+            time_ranges: Optional [(start_sec, end_sec)] - only these windows
+                (plus `range_padding` seconds each side) are decoded/analyzed.
+            smoothing: "ema" (causal, as before) or "zero_phase"
+                (forward-backward, no lag).
+            cache: Optional DiskCache - raw face samples are stored per video
+                content hash + detector settings, together with the frame
+                ranges they cover; later calls only analyze uncovered windows.
         """
-        import concurrent.futures
-
         if not os.path.exists(video_path):
             if logger:
                 logger.error(f"Video not found: {video_path}")
-            return {}, 1, 1
+            return None
 
         cap = cv2.VideoCapture(video_path)
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -114,121 +698,149 @@ class SmartCropper:
         if target_width > width:
             target_width = width
 
+        cap.release()
+
         # Config - Optimized for speed without sacrificing quality
-        stride = 4  # Analyze every 4th frame (~6fps @ 24fps source)
+        stride = stride_for_fps(fps, sample_hz)  # 6Hz -> every 4th frame @ 24fps
         batch_size = 32
-
-        cpu_count = os.cpu_count() or 4
-        max_workers = max(1, cpu_count - 2)
-        if max_workers > 16:
-            max_workers = 16
-
-        def process_batch(frames_data):
-            results = []
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=max_workers
-            ) as executor:
-                # pass None for prior_x in parallel, but pass focus_region!
-                future_to_idx = {
-                    executor.submit(self.get_face_center, f, None, focus_region): idx
-                    for f, idx in frames_data
-                }
-                for future in concurrent.futures.as_completed(future_to_idx):
-                    try:
-                        results.append((future_to_idx[future], future.result()))
-                    except:
-                        pass
-            return results
-
-        if logger:
-            logger.log(f"🚀 Analyzing with {max_workers} threads...", "INFO")
-
-        frame_idx = 0
-        all_results = []
-
-        while cap.isOpened():
-            batch_frames = []
-            for _ in range(batch_size):
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                if frame_idx % stride == 0:
-                    batch_frames.append((frame.copy(), frame_idx))
-                frame_idx += 1
-
-            if not batch_frames:
-                break
-
-            batch_results = process_batch(batch_frames)
-            all_results.extend(batch_results)
-
+        meta = {
+            "fps": fps,
+            "width": width,
+            "height": height,
+            "analysis_height": analysis_height,
+        }
+        frame_ranges = frame_ranges_for(
+            time_ranges, fps, total_frames, stride, range_padding
+        )
+        # Ranges reaching the estimated frame count run to the real end of the video
+        wanted = [
+            (start, OPEN_END if end >= total_frames else end)
+            for start, end in frame_ranges
+        ]
+
+        # Raw detections are cached per video + detector settings, independent
+        # of the clip windows: new windows only analyze what isn't covered yet.
+        # Smoothing / scene cuts are applied afterwards, on every call.
+        cache_key = None
+        indices = np.empty(0, dtype=np.int32)
+        rel_xs = np.empty(0, dtype=np.float32)
+        covered = []
+        if cache is not None:
+            from src.disk_cache import file_fingerprint
+
+            cache_key = cache.make_key(
+                video=file_fingerprint(video_path),
+                focus_region=focus_region,
+                sample_hz=sample_hz,
+                sampler=sampler,
+                analysis_height=analysis_height,
+                detector=[DETECTOR_MODEL_SELECTION, DETECTOR_MIN_CONFIDENCE],
+            )
+            cached_path = cache.get(cache_key, ".npz")
+            if cached_path:
+                try:
+                    indices, rel_xs, covered = load_detections(cached_path)
+                except Exception as e:
+                    if logger:
+                        logger.error(f"Ignoring unreadable crop cache entry: {e}")
+
+        missing = [
+            (start, min(end, total_frames))
+            for start, end in missing_frame_ranges(wanted, covered, stride)
+            if start < total_frames
+        ]
+
+        if not missing:
+            if logger:
+                logger.log(
+                    f"⚡ Crop analysis cache hit ({len(covered)} cached window(s)).",
+                    "INFO",
+                )
             if progress_callback:
-                progress_callback(min(1.0, frame_idx / total_frames))
-
-        cap.release()
-        all_results.sort(key=lambda x: x[0])
-
-        # --- POST-PROCESSING (The "Stickiness" & "Hold" Logic) ---
-        frame_mapping = {}
-        face_presence_map = {}  # New: Track face detection status
-
-        # Initialize state
-        current_rel_x = 0.5
-        last_valid_rel_x = 0.5
-
-        # Pre-calculate scene cut frames
-        scene_cut_frames = set()
-        if scene_boundaries:
-            for scene in scene_boundaries:
-                # scene_boundaries contains dicts with 'start', 'end', 'duration'
-                t = scene.get("start", scene) if isinstance(scene, dict) else scene
-                scene_cut_frames.add(int(t * fps))
-
-        for idx, detected_rel_x in all_results:
-            # Face Detection Status
-            face_presence_map[idx] = detected_rel_x is not None
-
-            target_rel_x = last_valid_rel_x  # Default to HOLD
-
-            if detected_rel_x is not None:
-                # If we found a face, update our target
-                target_rel_x = detected_rel_x
-                last_valid_rel_x = detected_rel_x
-
-            # Determine Smoothing Factor
-            # Normal: 0.2 (smooth)
-            # Scene Cut: 1.0 (instant snap)
-
-            # Check if this frame (or near it due to stride) is a scene cut
-            is_cut = False
-            for offset in range(stride + 1):
-                if (idx + offset) in scene_cut_frames or (
-                    idx - offset
-                ) in scene_cut_frames:
-                    is_cut = True
-                    break
-
-            this_alpha = 1.0 if is_cut else 0.2
-
-            # Apply Exponential Smoothing
-            current_rel_x = (this_alpha * target_rel_x) + (
-                (1 - this_alpha) * current_rel_x
+                progress_callback(1.0)
+        else:
+            if logger and (time_ranges or covered):
+                todo = sum(end - start for start, end in missing)
+                logger.log(
+                    f"🎯 Analyzing {len(missing)} clip window(s): "
+                    f"{todo / fps:.0f}s of {total_frames / fps:.0f}s"
+                    + (" (rest from cache)" if covered else ""),
+                    "INFO",
+                )
+
+            if engine == "process":
+                new_indices, new_rel_xs = self._detect_in_processes(
+                    video_path,
+                    missing,
+                    total_frames,
+                    stride,
+                    focus_region,
+                    workers,
+                    sampler,
+                    meta,
+                    progress_callback,
+                    logger,
+                )
+            else:
+                new_indices, new_rel_xs = self._detect_threaded(
+                    video_path,
+                    missing,
+                    total_frames,
+                    stride,
+                    batch_size,
+                    focus_region,
+                    workers,
+                    sampler,
+                    meta,
+                    progress_callback,
+                    logger,
+                )
+                self.close()
+
+            indices = np.concatenate([new_indices, indices])
+            rel_xs = np.concatenate([new_rel_xs, rel_xs])
+            covered = merge_frame_ranges(
+                covered
+                + [(start, OPEN_END if end >= total_frames else end) for start, end in missing]
             )
 
-            # Convert to absolute pixels
-            center_pix = int(current_rel_x * width)
-
-            # Calculate Crop X (Top-Left corner)
-            crop_x = int(center_pix - (target_width / 2))
-
-            # Boundary Checks
-            crop_x = max(0, min(crop_x, width - target_width))
-
-            frame_mapping[idx] = crop_x
+            if cache_key:
+                try:
+                    cache.put(
+                        cache_key,
+                        ".npz",
+                        lambda path: save_detections(path, indices, rel_xs, covered),
+                    )
+                except Exception as e:
+                    if logger:
+                        logger.error(f"Could not write crop cache entry: {e}")
+
+        # Sorted, one sample per frame, restricted to the requested windows
+        indices, first = np.unique(indices, return_index=True)
+        rel_xs = rel_xs[first]
+        keep = np.zeros(len(indices), dtype=bool)
+        for start, end in wanted:
+            keep |= (indices >= start) & (indices < end)
+        indices, rel_xs = indices[keep], rel_xs[keep]
+
+        # --- POST-PROCESSING (The "Stickiness" & "Hold" Logic, vectorized) ---
+        track = build_crop_track(
+            indices,
+            rel_xs,
+            fps,
+            width,
+            height,
+            target_width,
+            stride,
+            scene_boundaries=scene_boundaries,
+            # Disjoint clip windows are independent shots: reset state at each one
+            window_starts=[start for start, _ in frame_ranges[1:]],
+            smoothing=smoothing,
+        )
 
         if logger:
             logger.log(
-                f"✅ Crop Analysis Complete. Generated {len(frame_mapping)} coordinates.",
+                f"✅ Crop Analysis Complete. Generated {len(track)} coordinates.",
                 "INFO",
             )
 
@@ -237,7 +849,7 @@ class SmartCropper:
 
         gc.collect()
 
-        return frame_mapping, target_width, height, face_presence_map
+        return track
 
 
 # --- Test Block ---
@@ -251,10 +863,10 @@ if __name__ == "__main__":
 
     if os.path.exists(test_video):
         cropper = SmartCropper()
-        crop_data, w, h = cropper.analyze_video(test_video)
+        track = cropper.analyze_video(test_video)
 
-        print(f"Sample Frame 0 Crop X: {crop_data.get(0)}")
-        print(f"Sample Frame 100 Crop X: {crop_data.get(100)}")
+        print(f"Sample Frame 0 Crop X: {track.crop_x_at_frames([0])[0]}")
+        print(f"Sample Frame 100 Crop X: {track.crop_x_at_frames([100])[0]}")
     else:
         print(f"ℹ️ No test video found at {test_video}.")
         print("   Run 'python src/processor.py' first to download a video.")
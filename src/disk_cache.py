@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+# Bytes hashed from the head / middle / tail of a media file for its fingerprint
+FINGERPRINT_SAMPLE_BYTES = 4 * 1024 * 1024
+
+
+def get_cache_root():
+    """<project root>/cache - sits next to temp/ and models/ (PyInstaller aware)."""
+    if getattr(sys, "frozen", False):
+        root_dir = os.path.dirname(sys.executable)
+    else:
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(root_dir, "cache")
+
+
+def file_fingerprint(path, sample_bytes=FINGERPRINT_SAMPLE_BYTES):
+    """
+    Content hash of a (large) media file: SHA-256 over its size plus the
+    first, middle and last `sample_bytes`. Independent of the file name, so a
+    re-download of the same video maps to the same cache entries.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+
+    with open(path, "rb") as f:
+        if size <= sample_bytes * 3:
+            digest.update(f.read())
+        else:
+            for offset in (0, (size - sample_bytes) // 2, size - sample_bytes):
+                f.seek(offset)
+                digest.update(f.read(sample_bytes))
+
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Small content-addressed file cache with size-based LRU eviction.
+    Entries are plain files named <key><suffix>; a hit refreshes the file's
+    mtime, and the least recently used files are deleted once the namespace
+    grows past `max_bytes`.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, namespace, max_bytes, root=None):
+        self.dir = os.path.join(root or get_cache_root(), namespace)
+        self.max_bytes = max_bytes
+        os.makedirs(self.dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(**params):
+        """Stable key from JSON-serialisable parameters."""
+        blob = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+    def path_for(self, key, suffix=""):
+        return os.path.join(self.dir, f"{key}{suffix}")
+
+    def get(self, key, suffix=""):
+        """Path of a cached entry (marked as recently used), or None on a miss."""
+        path = self.path_for(key, suffix)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key, suffix, write_fn):
+        """
+        Stores an entry: write_fn(tmp_path) writes the file, which is then
+        moved into place atomically. Returns the final path.
+        """
+        path = self.path_for(key, suffix)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp{suffix}"
+        try:
+            write_fn(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+        return path
+
+    def evict(self):
+        """Deletes least recently used entries until the namespace fits max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.dir):
+                if ".tmp" in name:
+                    continue
+                full = os.path.join(self.dir, name)
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, full))
+                total += stat.st_size
+
+            for _, size, full in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(full)
+                    total -= size
+                except OSError:
+                    pass
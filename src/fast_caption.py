@@ -1,3 +1,20 @@
+# Bump when the generated ASS changes, so cached caption files are rebuilt
+ASS_FORMAT_VERSION = 1
+
+# Write buffer for .ass files (events are streamed, not joined in memory)
+ASS_WRITE_BUFFER = 64 * 1024
+
+# caption_mode="phrase": 2-4 words per Dialogue event, highlighted with \kf.
+# A phrase closes at PHRASE_MAX_WORDS, or once it has PHRASE_MIN_WORDS at a
+# pause / sentence punctuation; pauses over PHRASE_BREAK_GAP always close it
+CAPTION_MODES = ("word", "phrase")
+PHRASE_MIN_WORDS = 2
+PHRASE_MAX_WORDS = 4
+PHRASE_PAUSE = 0.4
+PHRASE_BREAK_GAP = 1.0
+PHRASE_END = (".", "!", "?", ",")
+
+
 class SubtitleGenerator:
     STYLES = {
         "Hormozi": {
@@ -140,12 +157,17 @@ class SubtitleGenerator:
         font_size=60,
         position="center",
         custom_config=None,  # NEW: Allow full custom override
+        caption_mode="word",  # "word" (one popping event per word) | "phrase"
     ):
         # 1. Select Base Style
         base_style = self.STYLES.get(style_name, self.STYLES["Hormozi"])
         self.style_config = base_style.copy()
 
         self.font_size = font_size
+        if caption_mode not in CAPTION_MODES:
+            print(f"⚠️ Unknown caption mode '{caption_mode}', using word")
+            caption_mode = "word"
+        self.caption_mode = caption_mode
 
         # 2. Apply Custom Overrides
         if custom_config:
@@ -200,9 +222,12 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         Each word displays from slightly before it's spoken until the next word begins.
         word_list: list of dicts {'word': str, 'start': float, 'end': float}
         """
-        events = []
+        return list(self.iter_karaoke_events(word_list))
+
+    def iter_karaoke_events(self, word_list):
+        """Yields the Dialogue lines of generate_karaoke_line one at a time."""
         if not word_list:
-            return events
+            return
 
         # Extract highlight color from config (default to yellow if missing)
         hl_color = self.style_config.get("HighlightColour", "&H0000FFFF")
@@ -238,11 +263,75 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             # Unicode emoji via standard fonts.
             final_text = f"{anim_tags}{word_text}"
 
-            events.append(
-                f"Dialogue: 0,{start_tc},{end_tc},Default,,0,0,0,,{final_text}"
+            yield f"Dialogue: 0,{start_tc},{end_tc},Default,,0,0,0,,{final_text}"
+
+    @staticmethod
+    def group_phrases(word_list):
+        """Splits the words into phrases of PHRASE_MIN_WORDS-PHRASE_MAX_WORDS."""
+        phrases = []
+        current = []
+        for i, w in enumerate(word_list):
+            current.append(w)
+            if i + 1 == len(word_list):
+                break
+            gap = word_list[i + 1]["start"] - w["end"]
+            if (
+                len(current) >= PHRASE_MAX_WORDS
+                or gap > PHRASE_BREAK_GAP
+                or (
+                    len(current) >= PHRASE_MIN_WORDS
+                    and (gap > PHRASE_PAUSE or w["word"].rstrip().endswith(PHRASE_END))
+                )
+            ):
+                phrases.append(current)
+                current = []
+        if current:
+            phrases.append(current)
+        return phrases
+
+    def iter_phrase_events(self, word_list):
+        """
+        One Dialogue event per phrase; \\kf sweeps the highlight colour across
+        each word while it is spoken (SecondaryColour -> PrimaryColour), so
+        libass lays out a few static lines instead of one animated event
+        per word.
+        """
+        hl_color = self.style_config.get("HighlightColour", "&H0000FFFF")
+        base_color = self.style_config.get("PrimaryColour", "&H00FFFFFF")
+        phrases = self.group_phrases(word_list)
+
+        for p, phrase in enumerate(phrases):
+            display_start = max(0, phrase[0]["start"] - 0.05)
+
+            # Gap-free: stay up until the next phrase appears, unless the
+            # speaker pauses for longer than PHRASE_BREAK_GAP
+            end = phrase[-1]["end"] + 0.2
+            if p + 1 < len(phrases):
+                next_start = max(0, phrases[p + 1][0]["start"] - 0.05)
+                if next_start - phrase[-1]["end"] <= PHRASE_BREAK_GAP:
+                    end = next_start
+                else:
+                    end = min(end, next_start)
+
+            # Karaoke boundaries in centiseconds from the event start; each word
+            # runs until the next one begins (rounded once, so no drift)
+            bounds = [w["start"] for w in phrase] + [phrase[-1]["end"]]
+            marks = [max(0, int(round((t - display_start) * 100))) for t in bounds]
+            tags = rf"{{\fad(50,50)\1c{hl_color}\2c{base_color}\k{marks[0]}}}"
+            text = " ".join(
+                rf"{{\kf{max(1, marks[i + 1] - marks[i])}}}{w['word'].upper()}"
+                for i, w in enumerate(phrase)
             )
 
-        return events
+            start_tc = self.time_to_ass(display_start)
+            end_tc = self.time_to_ass(end)
+            yield f"Dialogue: 0,{start_tc},{end_tc},Default,,0,0,0,,{tags}{text}"
+
+    def iter_events(self, word_list):
+        """Dialogue lines for the configured caption_mode."""
+        if self.caption_mode == "phrase":
+            return self.iter_phrase_events(word_list)
+        return self.iter_karaoke_events(word_list)
 
     def get_emoji(self, word):
         EMOJI_MAPPING = {
@@ -292,11 +381,41 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         clean = word.strip(",.!?").upper()
         return EMOJI_MAPPING.get(clean)
 
+    def cache_key(self, words):
+        """
+        Key of the .ass file for `words`: the output depends only on the word
+        slice, the resolved style (custom_config and position applied), the
+        font size, the caption mode and the play resolution.
+        """
+        from src.disk_cache import DiskCache
+
+        return DiskCache.make_key(
+            version=ASS_FORMAT_VERSION,
+            style=self.style_config,
+            font_size=self.font_size,
+            caption_mode=self.caption_mode,
+            play_res=[self.play_res_x, self.play_res_y],
+            words=[[w["word"], w["start"], w["end"]] for w in words],
+        )
+
+    def write_ass(self, words, f):
+        """Streams the header and events to an open text file."""
+        f.write(self.generate_header())
+        f.writelines(f"{event}\n" for event in self.iter_events(words))
+
     def generate_ass_file(self, words, output_path):
-        header = self.generate_header()
-        events = self.generate_karaoke_line(words, 0, 0)
+        with open(output_path, "w", encoding="utf-8", buffering=ASS_WRITE_BUFFER) as f:
+            self.write_ass(words, f)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(header)
-            for e in events:
-                f.write(e + "\n")
+    def cached_ass_file(self, words, cache):
+        """
+        Path of the .ass file for `words` in `cache` (a DiskCache), generated
+        only on a miss. Cached files are shared between renders: don't delete.
+        """
+        key = self.cache_key(words)
+        path = cache.get(key, ".ass")
+        if path is None:
+            path = cache.put(
+                key, ".ass", lambda tmp_path: self.generate_ass_file(words, tmp_path)
+            )
+        return path
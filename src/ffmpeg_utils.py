@@ -0,0 +1,258 @@
+import os
+import shutil
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_exe():
+    """
+    Resolves the FFmpeg binary once per process.
+    Order: FFMPEG_BINARY env (same variable MoviePy honours) -> ffmpeg on PATH
+    -> the binary bundled with imageio-ffmpeg (always present with MoviePy).
+    """
+    env_binary = os.getenv("FFMPEG_BINARY")
+    if env_binary and env_binary != "auto-detect" and os.path.exists(env_binary):
+        return env_binary
+
+    on_path = shutil.which("ffmpeg")
+    if on_path:
+        return on_path
+
+    try:
+        from imageio_ffmpeg import get_ffmpeg_exe as imageio_ffmpeg_exe
+
+        return imageio_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+
+def run_ffmpeg(cmd, total_frames=None, proglog_logger=None):
+    """
+    Runs an FFmpeg command built with `-progress pipe:1 -nostats`, forwarding
+    frame progress to a proglog logger (same "frame_index" bar MoviePy uses).
+    Raises RuntimeError with the tail of FFmpeg's output on failure.
+    """
+    import subprocess
+    from collections import deque
+
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+
+    if proglog_logger and total_frames:
+        proglog_logger(frame_index__total=total_frames)
+
+    log_tail = deque(maxlen=20)
+    for line in process.stdout:
+        line = line.strip()
+        if line.startswith("frame="):
+            if proglog_logger and total_frames:
+                try:
+                    proglog_logger(frame_index__index=int(line.split("=", 1)[1]))
+                except ValueError:
+                    pass
+        elif line and "=" not in line.split(" ", 1)[0]:
+            log_tail.append(line)
+
+    return_code = process.wait()
+    if return_code != 0:
+        raise RuntimeError(
+            f"FFmpeg exited with code {return_code}: " + " | ".join(log_tail)
+        )
+
+
+def escape_filter_path(path):
+    """
+    Path usable inside a quoted filtergraph option: native separators become
+    forward slashes, literal backslashes and the drive colon are escaped.
+    """
+    if os.sep != "/":
+        path = path.replace(os.sep, "/")
+    return path.replace("\\", "\\\\").replace(":", "\\:")
+
+
+def probe_audio_codec(path):
+    """Codec name of the first audio stream ("aac", "opus", ...), None if silent."""
+    import re
+    import subprocess
+
+    result = subprocess.run(
+        [get_ffmpeg_exe(), "-hide_banner", "-i", path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    match = re.search(r"Stream #\S+.*?: Audio: (\w+)", result.stderr)
+    return match.group(1) if match else None
+
+
+def probe_video(path):
+    """(width, height, fps, duration) of a video file via OpenCV."""
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise OSError(f"Could not open video {path}")
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+        return width, height, fps, frame_count / fps
+    finally:
+        cap.release()
+
+
+# Premiere Pro compatible H.264 stream settings
+H264_PARAMS = ["-profile:v", "high", "-level:v", "4.2", "-pix_fmt", "yuv420p"]
+
+# Encoder profiles. "bitrate" profiles honour output_bitrate (VBR), "crf"
+# profiles are constant-quality and "fixed" ones carry their own rate
+# control; both ignore output_bitrate.
+ENCODER_PROFILES = {
+    "nvenc": {
+        "label": "NVIDIA NVENC",
+        "codec": "h264_nvenc",
+        "preset": "p4",
+        "params": H264_PARAMS,
+        "rate_control": "bitrate",
+    },
+    "x264_quality": {
+        "label": "CPU x264 (slow, CRF 18)",
+        "codec": "libx264",
+        "preset": "slow",
+        "params": H264_PARAMS + ["-crf", "18"],
+        "rate_control": "crf",
+    },
+    "x264_faster": {
+        "label": "CPU x264 (faster, CRF 20)",
+        "codec": "libx264",
+        "preset": "faster",
+        "params": H264_PARAMS + ["-crf", "20"],
+        "rate_control": "crf",
+    },
+    "x264_veryfast": {
+        "label": "CPU x264 (veryfast, CRF 21)",
+        "codec": "libx264",
+        "preset": "veryfast",
+        "params": H264_PARAMS + ["-crf", "21"],
+        "rate_control": "crf",
+    },
+    "x265": {
+        "label": "CPU x265 (medium, CRF 22)",
+        "codec": "libx265",
+        "preset": "medium",
+        # hvc1 tag so QuickTime / Premiere recognise the HEVC stream
+        "params": ["-pix_fmt", "yuv420p", "-crf", "22", "-tag:v", "hvc1"],
+        "rate_control": "crf",
+    },
+    # Style previews: speed over quality, small files
+    "draft": {
+        "label": "CPU x264 draft (ultrafast, 1.5 Mbps)",
+        "codec": "libx264",
+        "preset": "ultrafast",
+        "params": [
+            "-pix_fmt",
+            "yuv420p",
+            "-b:v",
+            "1500k",
+            "-maxrate",
+            "2M",
+            "-bufsize",
+            "3M",
+        ],
+        "rate_control": "fixed",
+    },
+}
+
+# Used when the requested encoder is missing (or the GPU fails mid-render)
+CPU_FALLBACK_PROFILE = "x264_quality"
+
+
+@lru_cache(maxsize=None)
+def encoder_available(codec):
+    """
+    Test-encodes a few synthetic frames with `codec`, once per process.
+    Catches both missing encoders and present-but-unusable ones (no NVIDIA
+    GPU / driver, session limit reached at startup).
+    """
+    import subprocess
+
+    cmd = [
+        get_ffmpeg_exe(),
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-f",
+        "lavfi",
+        "-i",
+        "color=c=black:s=256x256:r=30:d=0.2",
+        "-frames:v",
+        "3",
+        "-c:v",
+        codec,
+        "-f",
+        "null",
+        "-",
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            timeout=30,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+def select_encoder(profile="auto"):
+    """
+    Resolves an encoder profile name to one that works on this machine.
+    "auto" prefers NVENC and falls back to x264; unavailable profiles fall
+    back to CPU_FALLBACK_PROFILE.
+    """
+    if profile in (None, "", "auto"):
+        profile = "nvenc"
+    if profile not in ENCODER_PROFILES:
+        print(f"⚠️ Unknown encoder profile '{profile}', using auto")
+        profile = "nvenc"
+
+    if encoder_available(ENCODER_PROFILES[profile]["codec"]):
+        return profile
+    return CPU_FALLBACK_PROFILE
+
+
+def encoder_args(profile, output_bitrate="auto"):
+    """(codec, preset, extra ffmpeg params) for a resolved encoder profile."""
+    spec = ENCODER_PROFILES[profile]
+    params = list(spec["params"])
+    if spec["rate_control"] == "bitrate":
+        params += bitrate_params(output_bitrate)
+    return spec["codec"], spec["preset"], params
+
+
+def bitrate_params(output_bitrate):
+    """VBR rate-control args for bitrate-driven encoders."""
+    if output_bitrate == "auto":
+        # VBR targeting 26 Mbps (Premiere Pro "Match Source - High Bitrate")
+        return ["-b:v", "26M", "-maxrate", "30M", "-bufsize", "52M"]
+    return [
+        "-b:v",
+        output_bitrate,
+        "-maxrate",
+        output_bitrate,
+        "-bufsize",
+        output_bitrate,
+    ]
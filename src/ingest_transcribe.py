@@ -1,5 +1,10 @@
+import json
 import os
+import queue
+import subprocess
 import sys
+import threading
+import time
 
 import torch
 import yt_dlp
@@ -11,6 +16,51 @@ from faster_whisper import WhisperModel
 # before any heavy libraries are imported.
 load_dotenv()
 
+# Keep one warm Whisper worker process (model resident) instead of spawning
+# a worker per job. "0" restores the per-job subprocess.
+WHISPER_SERVER = os.getenv("WHISPER_SERVER", "1") == "1"
+
+# A worker that dies between jobs is restarted after this delay (seconds),
+# doubled for each crash before it reports "ready" again, up to the max
+WHISPER_RESTART_BACKOFF = 1.0
+WHISPER_RESTART_BACKOFF_MAX = 30.0
+
+# Log lines from the worker worth forwarding to the job's logger
+WORKER_LOG_KEYS = ["[WORKER]", "Processing", "Transcribing", "%"]
+
+
+def get_root_dir():
+    """Project root (the folder containing the .exe when frozen)."""
+    if getattr(sys, "frozen", False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_worker_message(line):
+    """Protocol message of a transcribe_worker stdout line, or None for log output."""
+    from src.transcribe_worker import PROTOCOL_PREFIX
+
+    if not line.startswith(PROTOCOL_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(PROTOCOL_PREFIX) :])
+    except ValueError:
+        print(f"⚠️ Bad transcription worker message: {line[:200]}", flush=True)
+        return {"type": "invalid"}
+
+
+def worker_command(root_dir, *args):
+    """Command line running src/transcribe_worker.py with the venv Python."""
+    worker_script = os.path.join(root_dir, "src", "transcribe_worker.py")
+
+    # Determine Python executable (use venv)
+    python_exe = os.path.join(root_dir, ".venv", "Scripts", "python.exe")
+    if not os.path.exists(python_exe):
+        # Fallback to current interpreter
+        python_exe = sys.executable
+
+    return [python_exe, worker_script] + [str(a) for a in args]
+
 
 class VideoIngestor:
     def __init__(self):
@@ -150,6 +200,26 @@ class VideoIngestor:
             print(f"❌ Download Error: {e}")
             return None, None
 
+    def extract_audio(self, video_path, logger=None):
+        """
+        Audio-only track for transcription and analysis (16 kHz mono FLAC
+        next to the video, see audio_track). Falls back to the video itself
+        if it can't be extracted.
+        """
+        from src.audio_track import extract_audio_track
+        from src.ffmpeg_utils import probe_audio_codec
+
+        try:
+            if probe_audio_codec(video_path) is None:
+                raise RuntimeError("no audio stream")
+            return extract_audio_track(video_path, logger=logger)
+        except Exception as e:
+            msg = f"⚠️ Audio extraction failed ({e}). Reading audio from the video."
+            print(msg, flush=True)
+            if logger:
+                logger.log(msg, "WARNING")
+            return video_path
+
     def get_video_info(self, url):
         """
         Fetches metadata (duration, title) without downloading.
@@ -183,21 +253,239 @@ class VideoIngestor:
         return float(parts[0])  # Just seconds
 
 
+class WhisperServer:
+    """
+    Supervisor of a long-lived `transcribe_worker.py --serve` process that
+    keeps the Whisper model loaded between jobs. Jobs are serialised (one
+    model, one GPU); if the worker dies it is restarted and the job retried
+    once, so the crash isolation of the per-job subprocess is kept. A worker
+    that dies while idle is restarted right away (with a backoff), so the
+    next job doesn't wait for the model load.
+    """
+
+    def __init__(self, model_size="large-v3-turbo", cmd=None, root_dir=None):
+        self.model_size = model_size
+        self.root_dir = root_dir or get_root_dir()
+        self.cmd = cmd or worker_command(self.root_dir, "--serve", model_size)
+        self.process = None
+        self.restarts = 0
+        self._messages = None
+        self._logger = None
+        self._next_id = 0
+        self._backoff = WHISPER_RESTART_BACKOFF
+        self._stopped = threading.Event()
+        self._lock = threading.RLock()  # process start / stop
+        self._job_lock = threading.Lock()  # one job at a time
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Spawns the worker if it isn't running. Returns without waiting for the model."""
+        with self._lock:
+            self._stopped.clear()
+            if self.running:
+                return
+            if self.process is not None:
+                self.restarts += 1
+
+            msg = f"🎙️  Starting Whisper server ({self.model_size})..."
+            print(msg, flush=True)
+
+            self._messages = queue.Queue()
+            self.process = subprocess.Popen(
+                self.cmd,
+                cwd=self.root_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,  # Line buffered
+                encoding="utf-8",
+                errors="replace",
+            )
+            threading.Thread(
+                target=self._read_output,
+                args=(self.process, self._messages),
+                daemon=True,
+            ).start()
+
+    def _read_output(self, process, messages):
+        """Routes worker stdout: protocol lines to `messages`, the rest to the log."""
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            message = parse_worker_message(line)
+            if message is not None:
+                if message.get("type") == "ready":
+                    self._backoff = WHISPER_RESTART_BACKOFF
+                messages.put(message)
+                continue
+
+            print(line, flush=True)
+            logger = self._logger
+            if logger and any(k in line for k in WORKER_LOG_KEYS):
+                logger.log(line, "INFO")
+        # EOF: the worker exited (or crashed)
+        messages.put(None)
+        self._restart_after_exit(process)
+
+    def _restart_after_exit(self, process):
+        """Brings a fresh worker up after `process` died, unless stopped or replaced."""
+        code = process.wait()
+        # During a job transcribe() restarts the worker and retries itself
+        if (
+            self._stopped.is_set()
+            or self._job_lock.locked()
+            or self.process is not process
+        ):
+            return
+
+        backoff = self._backoff
+        self._backoff = min(backoff * 2, WHISPER_RESTART_BACKOFF_MAX)
+        print(
+            f"⚠️ Whisper server exited (code {code}). Restarting in {backoff:g}s...",
+            flush=True,
+        )
+        if self._stopped.wait(backoff):
+            return
+        with self._lock:
+            # A job may have restarted it already, or stop() was called
+            if self.process is process and not self._stopped.is_set():
+                self.start()
+
+    def _run_job(self, video_path, on_words):
+        """
+        Sends one job and forwards its word batches to on_words as they
+        arrive. True once the job is done, False if the worker died.
+        """
+        self.start()
+        self._next_id += 1
+        job_id = self._next_id
+        messages = self._messages
+        try:
+            self.process.stdin.write(
+                json.dumps({"id": job_id, "video_path": video_path}) + "\n"
+            )
+            self.process.stdin.flush()
+        except OSError:
+            pass  # Died before the job was sent; the reader reports the EOF
+
+        while True:
+            message = messages.get()
+            if message is None:
+                return False
+            if message.get("id") != job_id:
+                continue  # "ready" and stale replies
+            if message["type"] == "words":
+                on_words(message["words"])
+            elif message["type"] == "done":
+                return True
+            elif message["type"] == "error":
+                raise RuntimeError(f"Transcription failed: {message.get('message')}")
+
+    def transcribe(self, video_path, logger=None, on_words=None):
+        """
+        Word list for `video_path`, from the warm model. on_words(batch) gets
+        each decoded segment's words while the job is still running.
+        """
+        words = []
+        resume_after = None
+
+        def collect(batch):
+            # A retried job decodes from the start again: skip delivered words
+            if resume_after is not None:
+                batch = [w for w in batch if w["end"] > resume_after]
+            if batch:
+                words.extend(batch)
+                if on_words:
+                    on_words(batch)
+
+        with self._job_lock:
+            self._logger = logger
+            try:
+                for attempt in range(2):
+                    if self._run_job(video_path, collect):
+                        return words
+                    if words:
+                        resume_after = words[-1]["end"]
+
+                    # Crashed: bring a fresh worker up (it also serves the next job)
+                    code = self.process.wait()
+                    msg = f"⚠️ Whisper server exited (code {code}). Restarting..."
+                    print(msg, flush=True)
+                    if logger:
+                        logger.log(msg, "WARNING")
+                    self.start()
+                raise RuntimeError(
+                    f"Transcription worker crashed twice on this job (exit code {code})."
+                )
+            finally:
+                self._logger = None
+
+    def stop(self, timeout=10):
+        with self._lock:
+            self._stopped.set()
+            process = self.process
+            if process is None or process.poll() is not None:
+                return
+            try:
+                process.stdin.write(json.dumps({"type": "shutdown"}) + "\n")
+                process.stdin.flush()
+                process.stdin.close()
+                process.wait(timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+            print("🛑 Whisper server stopped.", flush=True)
+
+
+_whisper_servers = {}
+_whisper_servers_lock = threading.Lock()
+
+
+def get_whisper_server(model_size="large-v3-turbo"):
+    """Process-wide WhisperServer for `model_size` (started on first use)."""
+    with _whisper_servers_lock:
+        server = _whisper_servers.get(model_size)
+        if server is None:
+            server = _whisper_servers[model_size] = WhisperServer(model_size)
+    server.start()
+    return server
+
+
+def stop_whisper_servers():
+    with _whisper_servers_lock:
+        servers = list(_whisper_servers.values())
+        _whisper_servers.clear()
+    for server in servers:
+        server.stop()
+
+
 class Transcriber:
-    def __init__(self, model_size="large-v3-turbo"):
+    def __init__(
+        self, model_size="large-v3-turbo", mode="single", chunk_workers=0, cache=None
+    ):
         self.model_size = model_size
+        # "single" (one Whisper pass) | "chunked" (VAD shards, CPU process pool)
+        self.mode = mode
+        self.chunk_workers = chunk_workers
+        # Optional DiskCache of finished transcripts (see transcript_cache)
+        self.cache = cache
+        self.cache_hit = False
+        # True when the last transcribe() ran in a per-job worker that has
+        # exited since (its GPU memory is being released)
+        self.worker_exited = False
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.compute_type = "float16" if self.device == "cuda" else "int8"
         self.model = None
 
         # Determine project root
-        if getattr(sys, "frozen", False):
-            self.root_dir = os.path.dirname(sys.executable)
-        else:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            self.root_dir = os.path.dirname(base_dir)
+        self.root_dir = get_root_dir()
 
-    def transcribe(self, video_path, logger=None):
+    def transcribe(self, video_path, logger=None, on_words=None):
         """
         Primary transcription method — uses SUBPROCESS ISOLATION by default.
 
@@ -205,46 +493,130 @@ class Transcriber:
         This is a C-level crash that Python try/except cannot catch.
         Running Whisper in a subprocess lets the OS reclaim GPU memory on
         process exit, completely avoiding the destructor crash.
+
+        With WHISPER_SERVER the subprocess is a persistent, supervised
+        worker, so the model is loaded once per backend instead of per job.
+
+        Words are streamed from the worker as segments are decoded;
+        on_words(batch) is called with each batch before the full list is
+        returned.
+
+        mode="chunked" transcribes VAD-split shards in parallel on the CPU
+        (see chunked_transcribe); the pool processes keep the isolation.
+
+        With a cache, a transcript of the same media content and settings
+        is returned without running Whisper (on_words gets it as one batch).
         """
-        return self.transcribe_subprocess(video_path, logger=logger)
+        self.cache_hit = False
+        self.worker_exited = False
+        cache_key = None
+        if self.cache is not None:
+            from src.transcript_cache import load_words
+
+            cache_key = self.cache_key(video_path)
+            cached_path = self.cache.get(cache_key, ".npz")
+            if cached_path:
+                try:
+                    words = load_words(cached_path)
+                    msg = f"⚡ Transcript cache hit ({len(words)} words). Skipping Whisper."
+                    print(msg, flush=True)
+                    if logger:
+                        logger.log(msg, "INFO")
+                    self.cache_hit = True
+                    if on_words and words:
+                        on_words(words)
+                    return words
+                except Exception as e:
+                    print(f"⚠️ Ignoring unreadable transcript cache entry: {e}", flush=True)
+
+        if self.mode == "chunked":
+            words = self.transcribe_chunked(video_path, logger=logger, on_words=on_words)
+        elif WHISPER_SERVER:
+            words = self.transcribe_server(video_path, logger=logger, on_words=on_words)
+        else:
+            words = self.transcribe_subprocess(video_path, logger=logger, on_words=on_words)
+
+        if cache_key is not None:
+            from src.transcript_cache import save_words
+
+            self.cache.put(cache_key, ".npz", lambda path: save_words(words, path))
+        return words
+
+    def cache_key(self, media_path):
+        """Transcript cache key: media content + everything that changes the words."""
+        from src.disk_cache import file_fingerprint
+        from src.transcript_cache import TRANSCRIPT_FORMAT_VERSION
+        from src.transcribe_worker import TRANSCRIBE_OPTIONS
+
+        if self.mode == "chunked":
+            from src.chunked_transcribe import MIN_CUT_SILENCE, SHARD_SECONDS
+
+            device, compute_type = "cpu", "int8"
+            shards = {"min_cut_silence": MIN_CUT_SILENCE, "shard_seconds": SHARD_SECONDS}
+        else:
+            device, compute_type = self.device, self.compute_type
+            shards = None
+
+        return self.cache.make_key(
+            media=file_fingerprint(media_path),
+            model_size=self.model_size,
+            device=device,
+            compute_type=compute_type,
+            mode=self.mode,
+            options=TRANSCRIBE_OPTIONS,
+            shards=shards,
+            format=TRANSCRIPT_FORMAT_VERSION,
+        )
+
+    def transcribe_chunked(self, video_path, logger=None, on_words=None):
+        """Shard-parallel CPU transcription of `video_path`."""
+        from src.chunked_transcribe import transcribe_chunked
+
+        msg = "🎙️  Starting Transcription (Chunked, Parallel CPU)..."
+        print(msg)
+        if logger:
+            logger.log(msg, "INFO")
+
+        return transcribe_chunked(
+            video_path,
+            model_size=self.model_size,
+            workers=self.chunk_workers,
+            temp_dir=os.path.join(self.root_dir, "temp"),
+            logger=logger,
+            on_words=on_words,
+        )
+
+    def transcribe_server(self, video_path, logger=None, on_words=None):
+        """Transcribes on the warm worker process (see WhisperServer)."""
+        msg = "🎙️  Starting Transcription (Persistent Whisper Server)..."
+        print(msg)
+        if logger:
+            logger.log(msg, "INFO")
+
+        start_time = time.time()
+        word_list = get_whisper_server(self.model_size).transcribe(
+            video_path, logger=logger, on_words=on_words
+        )
+        elapsed = time.time() - start_time
+
+        msg = f"✅ Transcription Complete ({len(word_list)} words in {elapsed:.1f}s)"
+        print(msg, flush=True)
+        if logger:
+            logger.log(msg, "INFO")
+        return word_list
 
-    def transcribe_subprocess(self, video_path, logger=None):
+    def transcribe_subprocess(self, video_path, logger=None, on_words=None):
         """
         Runs Whisper transcription in a SEPARATE PROCESS to avoid CTranslate2
-        CUDA destructor segfault. Results are passed via a temporary JSON file.
+        CUDA destructor segfault. Words are streamed back over stdout as
+        NDJSON segments, so there is no overall timeout for long sources.
         """
-        import subprocess
-        import json
-        import time
-
         msg = "🎙️  Starting Transcription (Subprocess Isolation Mode)..."
         print(msg)
         if logger:
             logger.log(msg, "INFO")
 
-        # Paths
-        worker_script = os.path.join(self.root_dir, "src", "transcribe_worker.py")
-        temp_dir = os.path.join(self.root_dir, "temp")
-        os.makedirs(temp_dir, exist_ok=True)
-        output_json = os.path.join(temp_dir, "transcription_result.json")
-
-        # Clean up any previous result file
-        if os.path.exists(output_json):
-            os.remove(output_json)
-
-        # Determine Python executable (use venv)
-        python_exe = os.path.join(self.root_dir, ".venv", "Scripts", "python.exe")
-        if not os.path.exists(python_exe):
-            # Fallback to current interpreter
-            python_exe = sys.executable
-
-        cmd = [
-            python_exe,
-            worker_script,
-            video_path,
-            output_json,
-            self.model_size,
-        ]
+        cmd = worker_command(self.root_dir, video_path, self.model_size)
 
         msg = "🚀 Launching transcription subprocess..."
         print(msg, flush=True)
@@ -252,71 +624,58 @@ class Transcriber:
             logger.log(msg, "INFO")
 
         start_time = time.time()
+        word_list = []
+        done = False
+
+        # Run subprocess — stream stdout/stderr to parent's console
+        process = subprocess.Popen(
+            cmd,
+            cwd=self.root_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,  # Line buffered
+            encoding="utf-8",
+            errors="replace",
+        )
 
-        try:
-            # Run subprocess — stream stdout/stderr to parent's console
-            process = subprocess.Popen(
-                cmd,
-                cwd=self.root_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,  # Line buffered
-                encoding="utf-8",
-                errors="replace",
-            )
+        # Stream output in real-time: word segments as they are decoded
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+
+            message = parse_worker_message(line)
+            if message is not None:
+                if message["type"] == "words":
+                    word_list.extend(message["words"])
+                    if on_words:
+                        on_words(message["words"])
+                elif message["type"] == "done":
+                    done = True
+                continue
+
+            print(line, flush=True)
+            # Forward interesting logs to the main logger (WebSocket)
+            if logger:
+                # Filter for relevant worker logs to avoid double-printing everything
+                if any(k in line for k in WORKER_LOG_KEYS):
+                    logger.log(line, "INFO")
 
-            # Stream output in real-time
-            for line in process.stdout:
-                line = line.strip()
-                if line:
-                    print(line, flush=True)
-                    # Forward interesting logs to the main logger (WebSocket)
-                    if logger:
-                        # Filter for relevant worker logs to avoid double-printing everything
-                        if any(
-                            k in line
-                            for k in ["[WORKER]", "Processing", "Transcribing", "%"]
-                        ):
-                            logger.log(line, "INFO")
-
-            # Wait for completion
-            return_code = process.wait(timeout=600)
-
-            elapsed = time.time() - start_time
-
-            if return_code != 0:
-                # Check for segfault codes or other errors using the same logic as before
-                if os.path.exists(output_json):
-                    expected_segfault_codes = [3221226505, -1073741819, -11]
-                    if return_code in expected_segfault_codes:
-                        msg = f"✅ Transcription Subprocess finished (exit code {return_code} suppressed - data saved)."
-                        print(msg, flush=True)
-                        if logger:
-                            logger.log(msg, "INFO")
-                    else:
-                        msg = f"⚠️ Subprocess connection closed ({return_code}). Checking for results..."
-                        print(msg, flush=True)
-                else:
-                    raise RuntimeError(
-                        f"Transcription subprocess failed with exit code {return_code}"
-                    )
-
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Transcription subprocess timed out after 10 minutes.")
-
-        # Read results from JSON
-        if not os.path.exists(output_json):
-            raise RuntimeError(f"Transcription output file not found: {output_json}")
-
-        with open(output_json, "r", encoding="utf-8") as f:
-            word_list = json.load(f)
-
-        # Clean up temp JSON
-        try:
-            os.remove(output_json)
-        except Exception:
-            pass
+        # Wait for completion
+        return_code = process.wait()
+        elapsed = time.time() - start_time
+
+        if not done:
+            raise RuntimeError(
+                f"Transcription subprocess failed with exit code {return_code}"
+            )
+        if return_code != 0:
+            # CTranslate2 destructor crash after all words were delivered
+            msg = f"✅ Transcription Subprocess finished (exit code {return_code} suppressed - all words received)."
+            print(msg, flush=True)
+            if logger:
+                logger.log(msg, "INFO")
 
         msg = f"✅ Transcription Complete ({len(word_list)} words in {elapsed:.1f}s)"
         print(msg, flush=True)
@@ -325,6 +684,7 @@ class Transcriber:
 
         # Brief pause to let GPU memory settle after subprocess exit
         time.sleep(1)
+        self.worker_exited = True
 
         return word_list
 
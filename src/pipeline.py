@@ -7,12 +7,125 @@ from dotenv import load_dotenv
 from src.ingest_transcribe import VideoIngestor, Transcriber
 from src.analyzer import analyze_transcript
 from src.cropper import SmartCropper
-from src.renderer import VideoRenderer
+from src.renderer import DRAFT_PROFILE, VideoRenderer
 from src.logger import VideoLogger
+from src.disk_cache import DiskCache
+from src.ffmpeg_utils import ENCODER_PROFILES, select_encoder
 
 # Load Environment Variables
 load_dotenv()
 
+# Size cap of the on-disk crop/face analysis cache (LRU eviction)
+CROP_CACHE_MAX_MB = int(os.getenv("CROP_CACHE_MAX_MB", "512"))
+
+# Size cap of the on-disk transcript cache (LRU eviction)
+TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "64"))
+
+# Concurrent NVENC sessions the GPU/driver allows (consumer GeForce: 3-5)
+NVENC_MAX_SESSIONS = int(os.getenv("NVENC_MAX_SESSIONS", "3"))
+
+# Clips closer than this (seconds) share one decode when shared_decode is on
+SHARED_DECODE_MAX_GAP = 1.0
+
+
+# The last draft job's source video, transcript, clips and crop track, kept so
+# style iterations on the same source only re-render (one session at a time)
+_draft_session = None
+_draft_session_lock = threading.Lock()
+
+
+def _discard_session(session):
+    """Deletes the source video a draft session kept on disk."""
+    path = session["video_path"]
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+
+def take_draft_session(source_key):
+    """
+    Removes and returns the kept draft session if it is for `source_key`
+    and its video still exists. A session for another source is discarded.
+    """
+    global _draft_session
+    with _draft_session_lock:
+        session, _draft_session = _draft_session, None
+    if session is None:
+        return None
+    if session["source_key"] == source_key and os.path.exists(session["video_path"]):
+        return session
+    _discard_session(session)
+    return None
+
+
+def keep_draft_session(session):
+    """Stores `session` for the next call, discarding the previous one."""
+    global _draft_session
+    with _draft_session_lock:
+        previous, _draft_session = _draft_session, session
+    if previous is not None and previous["video_path"] != session["video_path"]:
+        _discard_session(previous)
+
+
+def release_draft_session():
+    """Deletes the kept draft source (backend shutdown)."""
+    global _draft_session
+    with _draft_session_lock:
+        session, _draft_session = _draft_session, None
+    if session is not None:
+        _discard_session(session)
+
+
+def encoder_limit(encoder_profile="auto"):
+    """
+    How many clips may encode at once with `encoder_profile`: bounded by the
+    CPU (each render runs its own decode + filter threads) and, for NVENC
+    only, by the GPU's session limit.
+    """
+    cpu_limit = max(1, (os.cpu_count() or 2) // 4)
+    codec = ENCODER_PROFILES[select_encoder(encoder_profile)]["codec"]
+    if codec.endswith("_nvenc"):
+        return max(1, min(NVENC_MAX_SESSIONS, cpu_limit))
+    return cpu_limit
+
+
+def render_worker_count(num_clips, max_parallel=0, encoder_profile="auto"):
+    """
+    How many clips to render at once (see encoder_limit).
+    max_parallel > 0 overrides the automatic limit.
+    """
+    if num_clips <= 0:
+        return 1
+    if max_parallel > 0:
+        return max(1, min(num_clips, max_parallel))
+    return max(1, min(num_clips, encoder_limit(encoder_profile)))
+
+
+def group_render_jobs(jobs, max_gap=SHARED_DECODE_MAX_GAP, max_size=NVENC_MAX_SESSIONS):
+    """
+    Groups (i, clip, output_path) jobs whose clips overlap or are at most
+    `max_gap` seconds apart (e.g. contiguous "series_part" splits), so each
+    group can be decoded once and fanned out to one encoder per clip.
+    Groups hold at most `max_size` clips (one encoder each, see encoder_limit).
+    """
+    groups = []
+    group_end = None
+    for job in sorted(jobs, key=lambda job: (job[1]["start"], job[1]["end"])):
+        clip = job[1]
+        if (
+            groups
+            and len(groups[-1]) < max_size
+            and clip["start"] - group_end <= max_gap
+        ):
+            groups[-1].append(job)
+            group_end = max(group_end, clip["end"])
+        else:
+            groups.append([job])
+            group_end = clip["end"]
+    return groups
+
 
 def run_ai_pipeline(
     url,
@@ -29,6 +142,19 @@ def run_ai_pipeline(
     output_resolution,
     content_type,
     custom_config=None,
+    caption_mode="word",
+    crop_engine="thread",
+    crop_workers=0,
+    crop_sampler="opencv",
+    crop_analysis_height=360,
+    crop_smoothing="ema",
+    render_backend="ffmpeg",
+    max_parallel_renders=0,
+    encoder_profile="auto",
+    transcribe_mode="single",
+    shared_decode=True,
+    draft=False,
+    draft_seconds=0,
     logger=None,
     progress_callback=None,
     cancel_event=None,
@@ -50,6 +176,21 @@ def run_ai_pipeline(
         logger.info(f"[PROGRESS {int(p * 100)}%] {msg}")
 
     video_path = None
+    audio_path = None
+
+    # Draft iterations on the same source skip download / Whisper, and with
+    # the same clip settings the LLM pass and face analysis too
+    source_key = [url, start_time, end_time, res, transcribe_mode]
+    analysis_key = [
+        min_sec,
+        max_sec,
+        content_type,
+        focus_region,
+        crop_sampler,
+        crop_analysis_height,
+        crop_smoothing,
+    ]
+    session = take_draft_session(source_key)
 
     try:
         # 1. DOWNLOAD
@@ -59,95 +200,186 @@ def run_ai_pipeline(
         if cancel_event.is_set():
             return
 
-        update_progress(0.1, f"Downloading segment ({res}p)...")
         logger.log(f"🔗 URL: {url}", color="cyan")
         logger.log(f"🎯 Focus Mode: {focus_region.upper()}", color="cyan")
 
-        ingestor = VideoIngestor()
-        video_path, video_title = ingestor.download(
-            url,
-            start_time,
-            end_time,
-            resolution=res,
-            logger=logger,
-            cancel_event=cancel_event,
-        )
+        if session is not None:
+            video_path = session["video_path"]
+            video_title = session["video_title"]
+            words = session["words"]
+            logger.log(
+                "♻️ Reusing the draft session's source video and transcript.",
+                color="cyan",
+            )
+            if video_title:
+                logger.rename_log_file(video_title)
+        else:
+            update_progress(0.1, f"Downloading segment ({res}p)...")
+            ingestor = VideoIngestor()
+            video_path, video_title = ingestor.download(
+                url,
+                start_time,
+                end_time,
+                resolution=res,
+                logger=logger,
+                cancel_event=cancel_event,
+            )
 
-        if cancel_event.is_set():
-            return
-        if not video_path:
-            logger.log("❌ Download failed.", color="red")
-            return
+            if cancel_event.is_set():
+                return
+            if not video_path:
+                logger.log("❌ Download failed.", color="red")
+                return
 
-        if video_title:
-            logger.rename_log_file(video_title)
+            if video_title:
+                logger.rename_log_file(video_title)
 
-        # 2. TRANSCRIPTION
-        update_progress(0.3, "Transcribing Audio (Whisper)...")
-        if cancel_event.is_set():
-            return
+            # 2. AUDIO TRACK (demuxed once; Whisper and VAD read it, not the video)
+            update_progress(0.25, "Extracting audio track...")
+            audio_path = ingestor.extract_audio(video_path, logger=logger)
 
-        try:
-            transcriber = Transcriber()
-            words = transcriber.transcribe(video_path, logger=logger)
-            print(f"[PIPELINE] Transcription complete. Words: {len(words)}", flush=True)
-        except Exception as transcribe_err:
-            logger.log(f"❌ Transcription failed: {transcribe_err}", color="red")
-            raise
-
-        print("[PIPELINE] Waiting for GPU to stabilize...", flush=True)
-        time.sleep(2)
-
-        # 3. AI ANALYSIS
-        update_progress(0.5, "AI Analyzing for Viral Moments...")
-        if cancel_event.is_set():
-            return
+            # 3. TRANSCRIPTION
+            update_progress(0.3, "Transcribing Audio (Whisper)...")
+            if cancel_event.is_set():
+                return
 
-        # AI analysis progress callback
-        def ai_progress(status_msg):
-            update_progress(0.55, status_msg)
-
-        clips, scenes = analyze_transcript(
-            words,
-            min_sec=min_sec,
-            max_sec=max_sec,
-            logger=logger,
-            video_path=video_path,
-            progress_callback=ai_progress,
-            content_type=content_type,
-        )
+            # Words stream in as Whisper decodes: report how far into the audio it is
+            try:
+                from src.ffmpeg_utils import probe_video
 
-        if not clips:
-            logger.log("⚠️ No viral clips found.", color="orange")
-            update_progress(1.0, "Done (No Clips Found)")
-            return
+                source_duration = probe_video(video_path)[3]
+            except Exception:
+                source_duration = 0
+
+            def on_words(batch):
+                decoded = batch[-1]["end"]
+                if source_duration > 0:
+                    update_progress(
+                        0.3 + 0.18 * min(1.0, decoded / source_duration),
+                        f"Transcribing Audio (Whisper)... {int(decoded // 60):02d}:{int(decoded % 60):02d}"
+                        f" / {int(source_duration // 60):02d}:{int(source_duration % 60):02d}",
+                    )
 
-        if cancel_event.is_set():
-            return
+            try:
+                transcriber = Transcriber(
+                    mode=transcribe_mode,
+                    # Re-runs on the same source (new style / clip length) skip Whisper
+                    cache=DiskCache("transcripts", TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024),
+                )
+                words = transcriber.transcribe(audio_path, logger=logger, on_words=on_words)
+                print(f"[PIPELINE] Transcription complete. Words: {len(words)}", flush=True)
+            except Exception as transcribe_err:
+                logger.log(f"❌ Transcription failed: {transcribe_err}", color="red")
+                raise
+
+            # Only a per-job worker releases GPU memory; the warm server
+            # and cache hits leave nothing to wait for
+            if transcriber.worker_exited:
+                print("[PIPELINE] Waiting for GPU to stabilize...", flush=True)
+                time.sleep(2)
+
+            session = {
+                "source_key": source_key,
+                "video_path": video_path,
+                "video_title": video_title,
+                "words": words,
+            }
+
+        if session.get("analysis_key") == analysis_key:
+            # Same clip/crop settings as the draft: only the look changes
+            clips = session["clips"]
+            crop_track = session["crop_track"]
+            logger.log(
+                f"♻️ Reusing the draft session's {len(clips)} clips and crop track.",
+                color="cyan",
+            )
+        else:
+            # 4. AI ANALYSIS
+            update_progress(0.5, "AI Analyzing for Viral Moments...")
+            if cancel_event.is_set():
+                return
 
-        # 4. SMART CROP
-        update_progress(0.7, "Analyzing Face Movement...")
-        if cancel_event.is_set():
-            return
+            # AI analysis progress callback
+            def ai_progress(status_msg):
+                update_progress(0.55, status_msg)
 
-        cropper = SmartCropper()
+            clips, scenes = analyze_transcript(
+                words,
+                min_sec=min_sec,
+                max_sec=max_sec,
+                logger=logger,
+                video_path=video_path,
+                progress_callback=ai_progress,
+                content_type=content_type,
+            )
 
-        def crop_progress(p):
-            val = 0.7 + (p * 0.15)
-            update_progress(val, f"Smart Cropping: {int(p * 100)}%")
+            if not clips:
+                logger.log("⚠️ No viral clips found.", color="orange")
+                update_progress(1.0, "Done (No Clips Found)")
+                return
 
-        crop_map, w, h, face_map = cropper.analyze_video(
-            video_path,
-            progress_callback=crop_progress,
-            logger=logger,
-            focus_region=focus_region,
-            scene_boundaries=scenes,
-        )
+            if cancel_event.is_set():
+                return
+
+            # 5. SMART CROP
+            update_progress(0.7, "Analyzing Face Movement...")
+            if cancel_event.is_set():
+                return
+
+            cropper = SmartCropper()
+
+            def crop_progress(p):
+                val = 0.7 + (p * 0.15)
+                update_progress(val, f"Smart Cropping: {int(p * 100)}%")
+
+            crop_track = cropper.analyze_video(
+                video_path,
+                progress_callback=crop_progress,
+                logger=logger,
+                focus_region=focus_region,
+                scene_boundaries=scenes,
+                engine=crop_engine,
+                workers=crop_workers,
+                sampler=crop_sampler,
+                analysis_height=crop_analysis_height,
+                smoothing=crop_smoothing,
+                # Re-renders of the same source (e.g. new caption style) skip detection
+                cache=DiskCache("crop_tracks", CROP_CACHE_MAX_MB * 1024 * 1024),
+                # Only the selected clips are rendered - skip the rest of the video
+                time_ranges=[(c["start"], c["end"]) for c in clips],
+            )
+
+            if crop_track is not None and len(crop_track):
+                # Same RLE gaps the renderer fills with B-Roll, over all clips
+                from src.renderer import (
+                    B_ROLL_HYSTERESIS,
+                    B_ROLL_MERGE_DISTANCE,
+                    B_ROLL_MIN_GAP,
+                )
+
+                report = crop_track.face_presence_report(
+                    min_gap=B_ROLL_MIN_GAP,
+                    hysteresis=B_ROLL_HYSTERESIS,
+                    merge_distance=B_ROLL_MERGE_DISTANCE,
+                )
+                logger.log(
+                    f"🙂 Face on screen {report['face_ratio'] * 100:.0f}% of analyzed footage | "
+                    f"{len(report['gaps'])} B-Roll gaps (longest {report['longest_gap_sec']:.1f}s)",
+                    color="cyan",
+                )
+
+            session.update(analysis_key=analysis_key, clips=clips, crop_track=crop_track)
 
         if cancel_event.is_set():
             return
 
-        # 5. RENDERING
+        # 6. RENDERING
+        # New/changed B-Roll assets are normalised once, before clips render
+        # in parallel (a no-op when the proxy library is up to date)
+        from src.b_roll_manager import B_ROLL_DIR, ingest_b_roll
+
+        ingest_b_roll(B_ROLL_DIR, logger=logger)
+
         update_progress(0.85, f"Rendering {len(clips)} Clips...")
         renderer = VideoRenderer()
         output_folder = os.path.join(os.getcwd(), "output")
@@ -162,14 +394,30 @@ def run_ai_pipeline(
 
         batch_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        from concurrent.futures import ThreadPoolExecutor, as_completed
         from src.logger import UIProglog
 
-        generated_clips = []
-
+        # Simple progress adapter for Proglog
+        # Looking at UIProglog in logger.py, it calls ui_callback(percentage, msg).
+        class SocketProglog(UIProglog):
+            def __init__(self, callback):
+                super().__init__(ui_callback=callback)
+
+        # Per-clip render progress, aggregated into one overall percentage
+        progress_lock = threading.Lock()
+        clip_progress = [0.0] * len(clips)
+
+        def report_clip_progress(i, p):
+            with progress_lock:
+                clip_progress[i] = p
+                overall = sum(clip_progress) / len(clips)
+                update_progress(
+                    0.5 + (overall * 0.5),
+                    f"Rendering Clip {i + 1}... {int(p * 100)}%",
+                )
+
+        jobs = []
         for i, clip in enumerate(clips):
-            if cancel_event.is_set():
-                break
-
             safe_title = sanitize_filename(video_title[:40])
             clip_start_sec = int(clip["start"])
             clip_end_sec = int(clip["end"])
@@ -178,7 +426,8 @@ def run_ai_pipeline(
 
             clip_filename = (
                 f"{safe_title.replace(' ', '_')}_{batch_timestamp}_"
-                f"Clip{i + 1}_Start{start_fmt}_Dur{clip_duration}s_{style}.mp4"
+                f"Clip{i + 1}_Start{start_fmt}_Dur{clip_duration}s_{style}"
+                f"{'_draft' if draft else ''}.mp4"
             )
             output_path = os.path.join(output_folder, clip_filename)
 
@@ -187,46 +436,113 @@ def run_ai_pipeline(
                 for w in words
                 if w["start"] >= clip["start"] and w["end"] <= clip["end"]
             ]
+            jobs.append((i, clip, output_path))
 
-            logger.log(f"🎞️ Rendering Clip {i + 1}...", color="blue")
-
-            # Simple progress adapter for Proglog
-            # We can't use FletProglog directly if it depends on UI controls,
-            # but we can pass a simple lambda to it if it accepts a callback.
-            # Looking at FletProglog in logger.py, it calls ui_callback(percentage, msg).
-            # We can pass our update_progress here.
-
-            class SocketProglog(UIProglog):
-                def __init__(self, callback):
-                    super().__init__(ui_callback=callback)
-
-            renderer.render_clip(
+        def render_job(group):
+            if cancel_event.is_set():
+                return []
+
+            if len(group) == 1:
+                i, clip, output_path = group[0]
+                logger.log(f"🎞️ Rendering Clip {i + 1}...", color="blue")
+
+                renderer.render_clip(
+                    video_path,
+                    clip,
+                    crop_track,
+                    output_path,
+                    style_name=style,
+                    font_size=caption_size,
+                    position=caption_pos,
+                    output_bitrate=output_bitrate,
+                    output_resolution=output_resolution,
+                    custom_config=custom_config,
+                    caption_mode=caption_mode,
+                    backend=render_backend,
+                    encoder_profile=encoder_profile,
+                    draft=draft,
+                    draft_seconds=draft_seconds,
+                    logger=logger,
+                    proglog_logger=SocketProglog(
+                        callback=lambda p, m: report_clip_progress(i, p)
+                    ),
+                )
+                return [(i, output_path)]
+
+            names = ", ".join(str(i + 1) for i, _, _ in group)
+            logger.log(f"🎞️ Rendering Clips {names} (shared decode)...", color="blue")
+
+            def report_group_progress(p, m):
+                for i, _, _ in group:
+                    report_clip_progress(i, p)
+
+            renderer.render_clip_group(
                 video_path,
-                clip,
-                crop_map,
-                output_path,
-                face_presence_map=face_map,
+                [(clip, output_path) for _, clip, output_path in group],
+                crop_track,
                 style_name=style,
                 font_size=caption_size,
                 position=caption_pos,
                 output_bitrate=output_bitrate,
                 output_resolution=output_resolution,
                 custom_config=custom_config,
+                caption_mode=caption_mode,
+                encoder_profile=encoder_profile,
+                draft=draft,
+                draft_seconds=draft_seconds,
                 logger=logger,
-                proglog_logger=SocketProglog(
-                    callback=lambda p, m: update_progress(
-                        0.5 + (p * 0.5), f"Rendering Clip {i + 1}... {int(p * 100)}%"
-                    )
-                ),
+                proglog_logger=SocketProglog(callback=report_group_progress),
             )
+            return [(i, output_path) for i, _, output_path in group]
 
-            generated_clips.append(output_path)
-            # Broadcast the new clip availability to Frontend
-            update_progress(
-                0.5 + ((i + 1) / len(clips) * 0.5),
-                f"CLIP_READY:{output_path}|Clip {i + 1}",
+        # Resolved once: NVENC is bound by its session limit, x264 by the CPU
+        render_profile = select_encoder(DRAFT_PROFILE if draft else encoder_profile)
+        max_encoders = encoder_limit(render_profile)
+
+        # Shared decode: overlapping/adjacent clips render in one FFmpeg process
+        if shared_decode and (render_backend == "ffmpeg" or draft):
+            groups = group_render_jobs(jobs, max_size=max_encoders)
+        else:
+            groups = [[job] for job in jobs]
+
+        num_workers = render_worker_count(
+            len(groups), max_parallel_renders, render_profile
+        )
+        if max_parallel_renders <= 0:
+            # Each group holds one encoder per clip
+            largest = max((len(g) for g in groups), default=1)
+            num_workers = max(1, min(num_workers, max_encoders // largest))
+        if len(groups) < len(jobs):
+            logger.log(
+                f"🔗 {len(jobs)} clips share {len(groups)} decodes", color="cyan"
+            )
+        if num_workers > 1:
+            logger.log(
+                f"⚡ Rendering {len(groups)} jobs, {num_workers} at a time", color="cyan"
             )
 
+        generated_clips = []
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [executor.submit(render_job, group) for group in groups]
+            try:
+                # Completion order: each clip is announced as soon as it exists
+                for future in as_completed(futures):
+                    for i, output_path in future.result():
+                        generated_clips.append(output_path)
+                        report_clip_progress(i, 1.0)
+                        # Broadcast the new clip availability to Frontend
+                        with progress_lock:
+                            update_progress(
+                                0.5 + (sum(clip_progress) / len(clips) * 0.5),
+                                f"CLIP_READY:{output_path}|Clip {i + 1}",
+                            )
+            except BaseException:
+                # Don't start queued clips after a failure
+                for future in futures:
+                    future.cancel()
+                raise
+
         if not cancel_event.is_set():
             update_progress(1.0, "Done!")
             logger.log("🎉 Process Complete!", color="green")
@@ -244,15 +560,27 @@ def run_ai_pipeline(
         raise
 
     finally:
-        if video_path and os.path.exists(video_path):
+        if audio_path and audio_path != video_path:
             try:
-                os.remove(video_path)
+                from src.audio_track import remove_audio_track
+
+                remove_audio_track(video_path)
             except Exception:
                 pass
 
-        try:
-            from src.cleanup import cleanup_temp_files
+        if draft and session is not None and os.path.exists(session["video_path"]):
+            # Kept (with the temp folder) for the next draft / final render
+            keep_draft_session(session)
+        else:
+            if video_path and os.path.exists(video_path):
+                try:
+                    os.remove(video_path)
+                except Exception:
+                    pass
 
-            cleanup_temp_files()
-        except Exception:
-            pass
+            try:
+                from src.cleanup import cleanup_temp_files
+
+                cleanup_temp_files()
+            except Exception:
+                pass
@@ -1,30 +1,149 @@
 import os
+import random
+from bisect import bisect_right
+from functools import lru_cache
+import numpy as np
 from moviepy.video.io.VideoFileClip import VideoFileClip
-from moviepy.audio.AudioClip import CompositeAudioClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
 from dotenv import load_dotenv
 from src.fast_caption import SubtitleGenerator
 from src.b_roll_manager import BRollManager
+from src.crop_track import CropTrack
+from src.disk_cache import DiskCache
+from src.ffmpeg_utils import (
+    CPU_FALLBACK_PROFILE,
+    ENCODER_PROFILES,
+    encoder_args,
+    select_encoder,
+)
 
 # Load Environment Variables
 load_dotenv()
 
 # Note: ImageMagick is no longer required since we use .ass subtitles instead of TextClip
 
+# FFmpeg backend: crop_x changes smaller than this (px) are not re-sent to the
+# crop filter (chroma subsampling rounds x to even values anyway)
+CROP_COMMAND_MIN_DELTA = 2
+
+
+# B-Roll placement on "no face" gaps (seconds): gaps shorter than
+# B_ROLL_MIN_GAP keep the speaker crop; detector flicker shorter than
+# B_ROLL_HYSTERESIS is ignored and gaps closer than B_ROLL_MERGE_DISTANCE
+# become one B-Roll segment
+B_ROLL_MIN_GAP = 2.0
+B_ROLL_HYSTERESIS = 0.25
+B_ROLL_MERGE_DISTANCE = 0.5
+
+# Background music: bed level between phrases (the old constant 0.10); while
+# Whisper's word timings say someone is talking the voice drives a sidechain
+# compressor that pulls the bed further below it
+MUSIC_VOLUME = 0.10
+MUSIC_DUCKING = "threshold=0.02:ratio=8:attack=20:release=400"
+SPEECH_MERGE_GAP = 0.35  # seconds between words still treated as one phrase
+SPEECH_PADDING = 0.10  # duck slightly before / after each phrase
+
+# Size cap of the on-disk .ass caption cache (LRU eviction)
+CAPTION_CACHE_MAX_MB = int(os.getenv("CAPTION_CACHE_MAX_MB", "64"))
+
+# Draft previews for style iteration: quarter-area frame, ultrafast low-bitrate
+# encode (ffmpeg_utils.ENCODER_PROFILES["draft"]), optionally only the head
+DRAFT_RESOLUTION = "540x960"
+DRAFT_PROFILE = "draft"
+
+
+@lru_cache(maxsize=None)
+def list_music_files(music_dir):
+    """MP3s in the music library, scanned once per process."""
+    if not os.path.exists(music_dir):
+        return ()
+    return tuple(sorted(f for f in os.listdir(music_dir) if f.endswith(".mp3")))
+
+
+def speech_windows(words, duration, merge_gap=SPEECH_MERGE_GAP, padding=SPEECH_PADDING):
+    """Clip-relative (start, end) spans where someone is speaking."""
+    windows = []
+    for w in sorted(words, key=lambda w: w["start"]):
+        start = max(0.0, w["start"] - padding)
+        end = min(duration, w["end"] + padding)
+        if end <= start:
+            continue
+        if windows and start - windows[-1][1] <= merge_gap:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return [(a, b) for a, b in windows]
+
+
+def music_mix_filter(voice, music, duration, words, out="aout"):
+    """
+    filter_complex graph mixing `music` under `voice` (input pad labels).
+    The sidechain key is the voice muted outside the spoken windows, so the
+    bed only ducks for speech and not for breaths or background noise.
+    """
+    fmt = "aformat=sample_rates=48000:channel_layouts=stereo"
+    bed = (
+        f"[{music}]atrim=0:{duration:.3f},asetpts=N/SR/TB,{fmt},"
+        f"volume={MUSIC_VOLUME}"
+    )
+    if voice is None:
+        return f"{bed}[{out}]"
+
+    # apad: the key must outlast the bed, or sidechaincompress stops at the
+    # key's EOF and drops the tail of the music
+    windows = speech_windows(words, duration)
+    if windows:
+        spoken = "+".join(f"between(t,{a:.3f},{b:.3f})" for a, b in windows)
+        key = f"[key_src]volume=0:enable='not({spoken})',apad[key]"
+    else:
+        # No word timings: duck on the voice signal itself
+        key = "[key_src]apad[key]"
+
+    return ";".join(
+        [
+            f"[{voice}]{fmt},asplit=2[voice][key_src]",
+            key,
+            f"{bed}[bed]",
+            f"[bed][key]sidechaincompress={MUSIC_DUCKING}[ducked]",
+            f"[voice][ducked]amix=inputs=2:duration=first:normalize=0[{out}]",
+        ]
+    )
+
+
+def draft_clip(clip_data, seconds=0):
+    """Copy of clip_data cut to its first `seconds` (0 = whole clip)."""
+    if not seconds or seconds <= 0:
+        return clip_data
+    end = min(clip_data["end"], clip_data["start"] + seconds)
+    draft = dict(clip_data, end=end)
+    draft["words"] = [w for w in clip_data.get("words", []) if w["start"] < end]
+    return draft
+
 
 class VideoRenderer:
-    def __init__(self):
+    def __init__(self, cache_root=None):
         self.temp_dir = os.getenv("TEMP", r"E:\AI_Video_Engine\temp")
         if not os.path.exists(self.temp_dir):
             os.makedirs(self.temp_dir)
+        # Root of the caption cache (None = the project cache/ folder)
+        self.cache_root = cache_root
+        self._caption_cache = None
+
+    @property
+    def caption_cache(self):
+        """DiskCache of generated .ass files, shared by re-renders."""
+        if self._caption_cache is None:
+            self._caption_cache = DiskCache(
+                "captions", CAPTION_CACHE_MAX_MB * 1024 * 1024, root=self.cache_root
+            )
+        return self._caption_cache
 
     def render_clip(
         self,
         video_path,
         clip_data,
-        crop_map,
+        crop_map,  # CropTrack (or legacy {frame_idx: crop_x} dict)
         output_path,
-        face_presence_map=None,  # New Argument
+        face_presence_map=None,  # Legacy dict input only (CropTrack carries faces)
         style_name="Hormozi",
         font_size=60,
         position="center",
@@ -33,19 +152,56 @@ class VideoRenderer:
         logger=None,
         proglog_logger=None,
         custom_config=None,  # NEW
+        caption_mode="word",  # "word" (per-word pop) | "phrase" (2-4 words, \kf)
+        backend="ffmpeg",  # "ffmpeg" (single filter graph) | "moviepy" (per-frame)
+        encoder_profile="auto",  # see ffmpeg_utils.ENCODER_PROFILES
+        draft=False,  # Low-res ultrafast preview (forces the ffmpeg backend)
+        draft_seconds=0,  # Draft only: render just the first N seconds (0 = all)
     ):
         """
         Renders a single viral clip with:
         1. 9:16 Crop (Dynamic Center)
         2. ASS Subtitles (Karaoke + Pop)
-        3. NVENC Acceleration (RTX 4060)
+        3. NVENC Acceleration (RTX 4060), probed once per process; CPU
+           boxes go straight to the x264/x265 profile
         4. B-Roll Overlay (when no face detected)
+
+        backend="ffmpeg" runs decode, crop, scale, B-Roll overlay, subtitles
+        and encode in a single FFmpeg process (no frames pass through Python).
+        draft=True renders a DRAFT_RESOLUTION preview with the "draft"
+        encoder profile from the same crop track, for caption/style tweaks.
         """
-        msg = f"🎬 Initializing Render: {output_path} | Style: {style_name} | Font Size: {font_size}px"
+        if draft:
+            clip_data = draft_clip(clip_data, draft_seconds)
+            output_resolution = DRAFT_RESOLUTION
+            encoder_profile = DRAFT_PROFILE
+            backend = "ffmpeg"
+
+        msg = f"🎬 Initializing {'Draft ' if draft else ''}Render: {output_path} | Style: {style_name} | Font Size: {font_size}px"
         print(msg)
         if logger:
             logger.log(msg, "INFO", "BLUE")
 
+        if backend == "ffmpeg":
+            self._render_clip_ffmpeg(
+                video_path,
+                clip_data,
+                crop_map,
+                output_path,
+                face_presence_map=face_presence_map,
+                style_name=style_name,
+                font_size=font_size,
+                position=position,
+                output_bitrate=output_bitrate,
+                output_resolution=output_resolution,
+                logger=logger,
+                proglog_logger=proglog_logger,
+                custom_config=custom_config,
+                caption_mode=caption_mode,
+                encoder_profile=encoder_profile,
+            )
+            return
+
         # 1. Load Video
         try:
             original_clip = VideoFileClip(video_path)
@@ -66,52 +222,33 @@ class VideoRenderer:
             max(0, start_t), min(original_clip.duration, end_t)
         )
 
+        src_w = original_clip.w
+        src_h = original_clip.h
+        crop_w = int(src_h * (9 / 16))
+        if crop_w > src_w:
+            crop_w = src_w
+        fps = original_clip.fps or 30.0
+
+        # Accept a CropTrack (analyze_video) or legacy {frame: crop_x} dicts
+        if isinstance(crop_map, CropTrack):
+            track = crop_map
+        else:
+            track = CropTrack.from_maps(
+                crop_map, face_presence_map, fps, src_w, src_h, crop_w
+            )
+
         # --- B-ROLL LOGIC PRE-CALCULATION ---
         b_roll_intervals = []
         b_roll_clips = []  # To hold clip objects (prevent GC and allow access)
 
-        if face_presence_map:
-            # 1. Convert Map to boolean list for this segment
-            fps = original_clip.fps or 30.0
-            total_frames = int(duration * fps)
-            abs_start_frame = int(start_t * fps)
-
-            # Create a boolean array for the clip duration
-            face_detected = []
-            for i in range(total_frames):
-                abs_idx = abs_start_frame + i
-                # Default to True (Face Present) if unknown, to be conservative
-                face_detected.append(face_presence_map.get(abs_idx, True))
-
-            # 2. Find gaps > 2.0 seconds (approx 60 frames)
-            min_gap_frames = int(2.0 * fps)
-            current_gap_start = None
-
-            for i, is_face in enumerate(face_detected):
-                if not is_face:
-                    if current_gap_start is None:
-                        current_gap_start = i
-                else:
-                    if current_gap_start is not None:
-                        gap_len = i - current_gap_start
-                        if gap_len >= min_gap_frames:
-                            # Start/End in seconds relative to clip start
-                            gap_start_sec = current_gap_start / fps
-                            gap_end_sec = i / fps
-                            b_roll_intervals.append((gap_start_sec, gap_end_sec))
-                        current_gap_start = None
-
-            # Handle edge case: gap extends to end of clip
-            if current_gap_start is not None:
-                gap_len = len(face_detected) - current_gap_start
-                if gap_len >= min_gap_frames:
-                    gap_start_sec = current_gap_start / fps
-                    gap_end_sec = len(face_detected) / fps
-                    b_roll_intervals.append((gap_start_sec, gap_end_sec))
+        if len(track):
+            b_roll_intervals = self._find_no_face_intervals(
+                track, start_t, duration, fps
+            )
 
             # 3. Fetch B-Roll for intervals
             if b_roll_intervals:
-                manager = BRollManager()
+                manager = BRollManager(logger=logger)
                 if manager.b_roll_files:
                     msg = f"🎥 Found {len(b_roll_intervals)} 'No Face' segments. Inserting B-Roll..."
                     print(msg)
@@ -127,59 +264,35 @@ class VideoRenderer:
                             )
 
         # 3. Dynamic Per-Frame 9:16 Crop (follows face)
-        src_w = original_clip.w
-        src_h = original_clip.h
-        crop_w = int(src_h * (9 / 16))
-        if crop_w > src_w:
-            crop_w = src_w
-        fps = original_clip.fps or 30.0
-        default_crop_x = (src_w - crop_w) // 2
-
-        # Pre-sort crop_map keys once for efficient interpolation
-        _sorted_keys = sorted(crop_map.keys()) if crop_map else []
+        # Resolve crop_x for every frame of the clip up front (vectorized interp)
+        first_frame = int(start_t * fps)
+        clip_crop_x = track.crop_x_at_frames(
+            np.arange(first_frame, int(end_t * fps) + 2)
+        )
 
         def _interpolate_crop_x(t):
-            """Find the best crop_x for absolute time t using crop_map."""
-            frame_idx = int(t * fps)
-            # Direct hit
-            if frame_idx in crop_map:
-                return crop_map[frame_idx]
-            if not _sorted_keys:
-                return default_crop_x
-            # Binary search for bracketing keys
-            lo, hi = 0, len(_sorted_keys) - 1
-            while lo < hi:
-                mid = (lo + hi) // 2
-                if _sorted_keys[mid] < frame_idx:
-                    lo = mid + 1
-                else:
-                    hi = mid
-            # Interpolate between neighbors
-            if lo == 0:
-                return crop_map[_sorted_keys[0]]
-            if lo >= len(_sorted_keys):
-                return crop_map[_sorted_keys[-1]]
-            k_before = _sorted_keys[lo - 1]
-            k_after = _sorted_keys[lo]
-            if k_after == k_before:
-                return crop_map[k_before]
-            ratio = (frame_idx - k_before) / (k_after - k_before)
-            val = crop_map[k_before] + ratio * (crop_map[k_after] - crop_map[k_before])
-            val = int(val)
-            return max(0, min(val, src_w - crop_w))
+            """crop_x for absolute time t from the precomputed clip table."""
+            i = int(t * fps) - first_frame
+            return int(clip_crop_x[min(max(i, 0), len(clip_crop_x) - 1)])
+
+        # B-Roll intervals are disjoint: sorted starts + bisect -> O(log n) lookup
+        b_roll_clips.sort(key=lambda br: br["start"])
+        b_roll_starts = [br["start"] for br in b_roll_clips]
+        failed_b_roll = set()  # indices whose clip raised once; never retried
 
         def dynamic_crop(get_frame, t):
             """Per-frame crop that follows the face, OR returns B-Roll."""
             # Check B-Roll Overlays first
-            for br in b_roll_clips:
-                if br["start"] <= t < br["end"]:
-                    # Get frame from B-Roll clip
-                    # relative time in b-roll
-                    b_t = t - br["start"]
-                    try:
-                        return br["clip"].get_frame(b_t)
-                    except Exception:
-                        pass  # Fallback to normal crop if b-roll fails
+            i = bisect_right(b_roll_starts, t) - 1
+            if i >= 0 and t < b_roll_clips[i]["end"] and i not in failed_b_roll:
+                br = b_roll_clips[i]
+                # Get frame from B-Roll clip (relative time in b-roll)
+                try:
+                    return br["clip"].get_frame(t - br["start"])
+                except Exception as e:
+                    # Fallback to normal crop for the rest of this segment
+                    failed_b_roll.add(i)
+                    print(f"⚠️ B-Roll segment at {br['start']:.1f}s failed: {e}")
 
             # Normal Face Tracking Crop
             frame = get_frame(t)
@@ -211,186 +324,554 @@ class VideoRenderer:
                 if logger:
                     logger.error(msg)
 
-        # 3.6 Background Music
-        try:
-            music_dir = os.path.join(os.getcwd(), "assets", "music")
-            music_files = (
-                [f for f in os.listdir(music_dir) if f.endswith(".mp3")]
-                if os.path.exists(music_dir)
-                else []
-            )
+        # 3.6 Background Music (mixed by FFmpeg when the audio is muxed)
+        music_path = self._pick_music(logger)
 
-            if music_files:
-                import random
+        # 4. Generate ASS Subtitles
+        ass_path = self._write_captions(
+            clip_data,
+            style_name,
+            font_size,
+            position,
+            custom_config,
+            caption_mode,
+        )
 
-                bg_music_path = os.path.join(music_dir, random.choice(music_files))
+        # 5. Render with the probed encoder + Subtitles Filter
+        # subtitles='E\:/path/to/file.ass' (see escape_filter_path)
+        from src.ffmpeg_utils import escape_filter_path
 
-                # Load Music
-                bg_music = AudioFileClip(bg_music_path)
+        safe_ass_path = escape_filter_path(ass_path)
 
-                # Loop if needed
-                if bg_music.duration < duration:
-                    bg_music = bg_music.loop(duration=duration)
-                else:
-                    bg_music = bg_music.subclipped(0, duration)
+        # Video only: the audio (source voice + optional ducked music) is cut
+        # and mixed from the source file by FFmpeg, no samples go through Python
+        video_out = os.path.join(
+            self.temp_dir, f"video-only_{os.path.basename(output_path)}"
+        )
 
-                # Set Volume (Ducking - simple constant low volume)
-                # -20dB is approx 0.1
-                bg_music = bg_music.with_volume_scaled(0.10)
+        def encode(codec, preset, params):
+            cropped_clip.write_videofile(
+                video_out,
+                codec=codec,
+                audio=False,
+                preset=preset,
+                ffmpeg_params=params + ["-vf", f"subtitles='{safe_ass_path}'"],
+                threads=8,
+                fps=fps,
+                logger=proglog_logger,
+            )
 
-                # Composite
-                original_audio = cropped_clip.audio
-                final_audio = CompositeAudioClip([original_audio, bg_music])
-                cropped_clip.audio = final_audio
+        try:
+            self._encode(encoder_profile, output_bitrate, encode, output_path, logger)
+            self._mux_audio(
+                video_out,
+                video_path,
+                max(0, start_t),
+                clip.duration,
+                output_path,
+                music_path=music_path,
+                words=self._relative_words(clip_data),
+            )
+        finally:
+            if os.path.exists(video_out):
+                os.remove(video_out)
 
-                msg = f"🎵 Added Background Music: {os.path.basename(bg_music_path)}"
-                print(msg)
-                if logger:
-                    logger.log(msg, "INFO", "PURPLE")
+        # Cleanup
+        original_clip.close()
+        cropped_clip.close()
 
-        except Exception as e:
-            print(f"⚠️ Music Integration Failed: {e}")
+    # --- Shared helpers ---
+
+    @staticmethod
+    def _find_no_face_intervals(track, start_t, duration, fps):
+        """(start, end) seconds, relative to the clip, of B-Roll-worthy no-face gaps."""
+        # Run-length encoded on the track's sample mask (no per-frame Python)
+        gaps = track.no_face_intervals(
+            start_t,
+            start_t + duration,
+            min_gap=B_ROLL_MIN_GAP,
+            hysteresis=B_ROLL_HYSTERESIS,
+            merge_distance=B_ROLL_MERGE_DISTANCE,
+        )
+        return [(a - start_t, b - start_t) for a, b in gaps]
+
+    @staticmethod
+    def _pick_music(logger=None):
+        """Random track from assets/music, or None when the library is empty."""
+        music_dir = os.path.join(os.getcwd(), "assets", "music")
+        music_files = list_music_files(music_dir)
+        if not music_files:
+            return None
+
+        bg_music_path = os.path.join(music_dir, random.choice(music_files))
+        msg = f"🎵 Added Background Music: {os.path.basename(bg_music_path)}"
+        print(msg)
+        if logger:
+            logger.log(msg, "INFO", "PURPLE")
+        return bg_music_path
 
-        # 4. Generate ASS Subtitles
+    @staticmethod
+    def _relative_words(clip_data):
+        """Clip words with timestamps relative to the clip start."""
+        start_t = clip_data["start"]
+        return [
+            {"word": w["word"], "start": w["start"] - start_t, "end": w["end"] - start_t}
+            for w in clip_data.get("words", [])
+        ]
 
+    def _write_captions(
+        self, clip_data, style_name, font_size, position, custom_config, caption_mode
+    ):
+        """
+        Path of the clip's .ass file (timestamps relative to clip start),
+        from the caption cache. The file is shared: callers must not delete it.
+        """
         generator = SubtitleGenerator(
             style_name=style_name,
             font_size=int(font_size),
             position=position,
             custom_config=custom_config,  # NEW
+            caption_mode=caption_mode,
         )
 
         # Adjust timestamp relative to clip start
-        words_relative = []
-        for w in clip_data.get("words", []):
-            words_relative.append(
-                {
-                    "word": w["word"],
-                    "start": w["start"] - start_t,
-                    "end": w["end"] - start_t,
-                }
-            )
+        words_relative = self._relative_words(clip_data)
 
-        ass_path = os.path.join(
-            self.temp_dir, f"captions_{os.path.basename(output_path)}.ass"
-        )
-        # Ensure path uses forward slashes for FFmpeg compatibility
-        ass_path = ass_path.replace("\\", "/")
+        return generator.cached_ass_file(words_relative, self.caption_cache)
 
-        generator.generate_ass_file(words_relative, ass_path)
+    def _encode(self, encoder_profile, output_bitrate, encode, output_path, logger):
+        """
+        Runs encode(codec, preset, params) with the encoder chosen up front by
+        select_encoder(). Only a GPU encoder failing mid-render (e.g. the
+        session limit is hit) is retried on the CPU.
+        """
+        profile = select_encoder(encoder_profile)
+        attempts = [profile]
+        if ENCODER_PROFILES[profile]["codec"].endswith("_nvenc"):
+            attempts.append(CPU_FALLBACK_PROFILE)
+
+        for attempt, name in enumerate(attempts):
+            label = ENCODER_PROFILES[name]["label"]
+            codec, preset, params = encoder_args(name, output_bitrate)
+            try:
+                msg = f"🚀 Rendering with {label} + ASS Captions..."
+                print(msg)
+                if logger:
+                    logger.log(msg, "INFO")
 
-        # 5. Render with NVENC + Subtitles Filter
-        temp_audio = os.path.join(self.temp_dir, "temp-audio.m4a")
+                encode(codec, preset, params)
 
-        try:
-            msg = "🚀 Rendering with NVIDIA NVENC (RTX 4060) + ASS Captions..."
-            print(msg)
-            if logger:
-                logger.log(msg, "INFO")
-
-            # Escape colons in path for ffmpeg filter (e: -> e\:)
-            # Actually, standard forward slashes usually work if quoted.
-            # Best safe way for subtitles filter on Windows:
-            # subtitles='E\:/path/to/file.ass'
-
-            # Simple replace for drive letter colon
-            safe_ass_path = ass_path.replace(":", "\\:")
-
-            # --- Quality Params (Premiere Pro YouTube Export Match) ---
-            extra_params = []
-            if output_bitrate == "auto":
-                # VBR targeting 26 Mbps (Premiere Pro "Match Source - High Bitrate")
-                extra_params.extend(
-                    [
-                        "-b:v",
-                        "26M",
-                        "-maxrate",
-                        "30M",
-                        "-bufsize",
-                        "52M",
-                    ]
-                )
+                msg = f"✅ Render Success ({label}): {output_path}"
+                print(msg)
+                if logger:
+                    logger.log(msg, "INFO", "GREEN")
+                return
+            except Exception as e:
+                if attempt == len(attempts) - 1:
+                    raise
+                msg = f"⚠️ {label} Failed. Falling back to CPU... Error: {e}"
+                print(msg)
+                if logger:
+                    logger.error(msg)
+
+    @staticmethod
+    def _audio_args(
+        video_path, source_input, music_input, duration, music_path, words, out="aout"
+    ):
+        """
+        Output args for the clip audio. `source_input` is the ffmpeg input
+        index of the (already cut) source; with music, the looped track is
+        input `music_input` and is ducked under the voice by music_mix_filter
+        (graph output label `out`, unique per output file).
+        Without music AAC source audio is stream-copied (no re-encode).
+        """
+        from src.ffmpeg_utils import probe_audio_codec
+
+        source_codec = probe_audio_codec(video_path)
+        if not music_path:
+            if source_codec == "aac":
+                codec_args = ["-c:a", "copy"]
             else:
-                extra_params.extend(
-                    [
-                        "-b:v",
-                        output_bitrate,
-                        "-maxrate",
-                        output_bitrate,
-                        "-bufsize",
-                        output_bitrate,
-                    ]
-                )
+                codec_args = ["-c:a", "aac", "-b:a", "320k"]
+            return ["-map", f"{source_input}:a:0?"] + codec_args
+
+        voice = f"{source_input}:a:0" if source_codec else None
+        graph = music_mix_filter(voice, f"{music_input}:a:0", duration, words, out)
+        return [
+            "-filter_complex",
+            graph,
+            "-map",
+            f"[{out}]",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "320k",
+        ]
+
+    @staticmethod
+    def _music_input_args(music_path):
+        if not music_path:
+            return []
+        return ["-stream_loop", "-1", "-i", music_path]
+
+    def _mux_audio(
+        self,
+        video_only,
+        video_path,
+        start_t,
+        duration,
+        output_path,
+        music_path=None,
+        words=(),
+    ):
+        """Muxes the encoded video with the clip's audio cut from the source."""
+        from src.ffmpeg_utils import get_ffmpeg_exe, run_ffmpeg
+
+        run_ffmpeg(
+            [
+                get_ffmpeg_exe(),
+                "-y",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                video_only,
+                "-ss",
+                f"{start_t:.3f}",
+                "-t",
+                f"{duration:.3f}",
+                "-i",
+                video_path,
+            ]
+            + self._music_input_args(music_path)
+            + ["-map", "0:v:0", "-c:v", "copy"]
+            + self._audio_args(video_path, 1, 2, duration, music_path, words)
+            + ["-shortest", output_path]
+        )
 
-            # FULL FFmpeg Params — Premiere Pro compatible
-            ffmpeg_params = [
-                "-preset",
-                "p4",
-                "-profile:v",
-                "high",
-                "-level:v",
-                "4.2",
-                "-pix_fmt",
-                "yuv420p",
-                "-vf",
-                f"subtitles='{safe_ass_path}'",
-            ] + extra_params
+    # --- FFmpeg backend ---
 
-            cropped_clip.write_videofile(
-                output_path,
-                codec="h264_nvenc",
-                audio_codec="aac",
-                audio_bitrate="320k",
-                temp_audiofile=temp_audio,
-                remove_temp=True,
-                ffmpeg_params=ffmpeg_params,
-                threads=8,
-                fps=fps,
-                logger=proglog_logger,
-            )
+    def _write_crop_commands(self, track, start_t, end_t, fps, output_path):
+        """
+        Compiles the crop track into a sendcmd script: one `crop x` command
+        per frame where the crop window actually moves (piecewise constant).
+        Returns (script_path, initial_crop_x).
+        """
+        first_frame = int(start_t * fps)
+        n_frames = max(1, int((end_t - start_t) * fps) + 1)
+        crop_xs = track.crop_x_at_frames(first_frame + np.arange(n_frames))
+
+        # Only emit a command where the crop moves by >= CROP_COMMAND_MIN_DELTA px
+        keep = [0]
+        last = int(crop_xs[0])
+        for i in range(1, n_frames):
+            if abs(int(crop_xs[i]) - last) >= CROP_COMMAND_MIN_DELTA:
+                keep.append(i)
+                last = int(crop_xs[i])
+
+        cmd_path = os.path.join(
+            self.temp_dir, f"crop_{os.path.basename(output_path)}.cmd"
+        )
+        with open(cmd_path, "w", encoding="utf-8") as f:
+            # sendcmd rejects an empty script, so frame 0 is always written
+            for i in keep:
+                f.write(f"{i / fps:.4f} crop x {int(crop_xs[i])};\n")
 
-            msg = f"✅ NVENC Success: {output_path}"
-            print(msg)
-            if logger:
-                logger.log(msg, "INFO", "GREEN")
+        return cmd_path, int(crop_xs[0])
+
+    def _render_clip_ffmpeg(self, video_path, clip_data, crop_map, output_path, **kwargs):
+        """
+        Single-process render: FFmpeg decodes the segment, applies the
+        sendcmd-driven crop, scales, overlays B-Roll proxies on "no face" gaps
+        (overlay enable='between(t,a,b)'), burns the .ass captions and encodes.
+        """
+        self._render_group_ffmpeg(video_path, [(clip_data, output_path)], crop_map, **kwargs)
+
+    def render_clip_group(
+        self,
+        video_path,
+        jobs,
+        crop_map,
+        face_presence_map=None,
+        style_name="Hormozi",
+        font_size=60,
+        position="center",
+        output_bitrate="auto",
+        output_resolution="1080x1920",
+        logger=None,
+        proglog_logger=None,
+        custom_config=None,
+        caption_mode="word",
+        encoder_profile="auto",
+        draft=False,
+        draft_seconds=0,
+    ):
+        """
+        Renders several clips of one source in a single FFmpeg process.
+        `jobs` is a list of (clip_data, output_path). The range covering all
+        clips is decoded, cropped and scaled once, then split/trim fans it
+        out to one encoder per clip, so frames shared by overlapping or
+        adjacent clips (e.g. "series_part" splits) are decoded only once.
+        draft/draft_seconds work as in render_clip.
+        """
+        if draft:
+            jobs = [(draft_clip(clip, draft_seconds), path) for clip, path in jobs]
+            output_resolution = DRAFT_RESOLUTION
+            encoder_profile = DRAFT_PROFILE
+
+        msg = f"🎬 Initializing {'Draft ' if draft else ''}Group Render: {len(jobs)} clips | Style: {style_name} | Font Size: {font_size}px"
+        print(msg)
+        if logger:
+            logger.log(msg, "INFO", "BLUE")
+
+        self._render_group_ffmpeg(
+            video_path,
+            jobs,
+            crop_map,
+            face_presence_map=face_presence_map,
+            style_name=style_name,
+            font_size=font_size,
+            position=position,
+            output_bitrate=output_bitrate,
+            output_resolution=output_resolution,
+            logger=logger,
+            proglog_logger=proglog_logger,
+            custom_config=custom_config,
+            caption_mode=caption_mode,
+            encoder_profile=encoder_profile,
+        )
 
+    def _b_roll_segments(self, track, start_t, duration, fps, logger=None):
+        """B-Roll for the clip's "no face" gaps: [(start, end, proxy, proxy_start, loops)]."""
+        b_roll_segments = []
+        if not len(track):
+            return b_roll_segments
+
+        b_roll_intervals = self._find_no_face_intervals(track, start_t, duration, fps)
+        if b_roll_intervals:
+            manager = BRollManager(logger=logger)
+            if manager.b_roll_files:
+                msg = f"🎥 Found {len(b_roll_intervals)} 'No Face' segments. Inserting B-Roll..."
+                print(msg)
+                if logger:
+                    logger.log(msg, "INFO", "CYAN")
+
+                for b_start, b_end in b_roll_intervals:
+                    segment = manager.pick_segment(b_end - b_start)
+                    if segment:
+                        b_roll_segments.append((b_start, b_end) + segment)
+        return b_roll_segments
+
+    def _render_group_ffmpeg(
+        self,
+        video_path,
+        jobs,
+        crop_map,
+        face_presence_map=None,
+        style_name="Hormozi",
+        font_size=60,
+        position="center",
+        output_bitrate="auto",
+        output_resolution="1080x1920",
+        logger=None,
+        proglog_logger=None,
+        custom_config=None,
+        caption_mode="word",
+        encoder_profile="auto",
+    ):
+        from src.ffmpeg_utils import (
+            escape_filter_path,
+            get_ffmpeg_exe,
+            probe_video,
+            run_ffmpeg,
+        )
+
+        try:
+            src_w, src_h, fps, src_duration = probe_video(video_path)
         except Exception as e:
-            msg = f"⚠️ NVENC Failed. Falling back to CPU... Error: {e}"
+            msg = f"❌ Error: Could not open video {video_path}: {e}"
             print(msg)
             if logger:
                 logger.error(msg)
+            return
 
-            # Fallback CPU Rendering (still high quality)
-            cropped_clip.write_videofile(
-                output_path,
-                codec="libx264",
-                audio_codec="aac",
-                audio_bitrate="320k",
-                temp_audiofile=temp_audio,
-                remove_temp=True,
-                preset="slow",
-                ffmpeg_params=[
-                    "-profile:v",
-                    "high",
-                    "-level:v",
-                    "4.2",
-                    "-pix_fmt",
-                    "yuv420p",
-                    "-crf",
-                    "18",
-                    "-vf",
-                    f"subtitles='{safe_ass_path}'",
-                ],
-                fps=fps,
-                logger=proglog_logger,
+        # (clip_data, output_path, start, end) with the range clamped to the source
+        spans = []
+        for clip_data, output_path in jobs:
+            start_t = max(0, clip_data["start"])
+            end_t = clip_data["end"]
+            if src_duration:
+                end_t = min(src_duration, end_t)
+            spans.append((clip_data, output_path, start_t, end_t))
+        group_start = min(span[2] for span in spans)
+        group_end = max(span[3] for span in spans)
+        shared = len(spans) > 1
+
+        crop_w = int(src_h * (9 / 16))
+        if crop_w > src_w:
+            crop_w = src_w
+
+        if isinstance(crop_map, CropTrack):
+            track = crop_map
+        else:
+            track = CropTrack.from_maps(
+                crop_map, face_presence_map, fps, src_w, src_h, crop_w
             )
 
-        # Cleanup
-        original_clip.close()
-        cropped_clip.close()
-        if os.path.exists(ass_path):
-            os.remove(ass_path)
+        # Crop follows absolute source time, so it is compiled once for the
+        # whole covering range and applied before the fan-out
+        cmd_path, initial_x = self._write_crop_commands(
+            track, group_start, group_end, fps, spans[0][1]
+        )
+        temp_files = [cmd_path]
+
+        # Shared video chain: sendcmd -> crop -> (scale) [-> split]
+        out_w, out_h = crop_w, src_h
+        base = [
+            f"sendcmd=f='{escape_filter_path(cmd_path)}'",
+            f"crop=w={crop_w}:h={src_h}:x={initial_x}:y=0",
+        ]
+        if output_resolution != "source":
+            try:
+                out_w, out_h = map(int, output_resolution.split("x"))
+                base.append(f"scale={out_w}:{out_h}")
+            except ValueError:
+                msg = f"⚠️ Invalid output resolution '{output_resolution}' — using source size"
+                print(msg)
+                if logger:
+                    logger.error(msg)
+        if shared:
+            base.append(f"split={len(spans)}" + "".join(f"[s{k}]" for k in range(len(spans))))
+            graph = [f"[0:v:0]{','.join(base)}"]
+        else:
+            graph = [f"[0:v:0]{','.join(base)}[s0]"]
+
+        inputs = [
+            "-ss",
+            f"{group_start:.3f}",
+            "-t",
+            f"{group_end - group_start:.3f}",
+            "-i",
+            video_path,
+        ]
+        n_inputs = 1
+        outputs = []  # (output args before codec, audio args, output path)
 
+        try:
+            for k, (clip_data, output_path, start_t, end_t) in enumerate(spans):
+                duration = end_t - start_t
+                label = f"s{k}"
+
+                # Per-clip branch: trim its window out of the shared decode
+                if shared:
+                    graph.append(
+                        f"[s{k}]trim=start={start_t - group_start:.3f}:"
+                        f"duration={duration:.3f},setpts=PTS-STARTPTS[c{k}]"
+                    )
+                    label = f"c{k}"
+
+                # B-Roll: trimmed proxy inputs shown only inside their gap
+                b_roll = self._b_roll_segments(track, start_t, duration, fps, logger)
+                for n, (b_start, b_end, proxy_path, proxy_start, loops) in enumerate(
+                    b_roll
+                ):
+                    if loops:
+                        inputs += ["-stream_loop", "-1"]
+                    else:
+                        inputs += ["-ss", f"{proxy_start:.3f}"]
+                    inputs += ["-t", f"{b_end - b_start:.3f}", "-i", proxy_path]
+
+                    # Shift the segment to its slot in the clip, then show it only there
+                    graph.append(
+                        f"[{n_inputs}:v:0]scale={out_w}:{out_h},setsar=1,"
+                        f"setpts=PTS-STARTPTS+{b_start:.3f}/TB[b{k}_{n}]"
+                    )
+                    graph.append(
+                        f"[{label}][b{k}_{n}]overlay=0:0:eof_action=pass:"
+                        f"enable='between(t,{b_start:.3f},{b_end:.3f})'[o{k}_{n}]"
+                    )
+                    label = f"o{k}_{n}"
+                    n_inputs += 1
+
+                ass_path = self._write_captions(
+                    clip_data,
+                    style_name,
+                    font_size,
+                    position,
+                    custom_config,
+                    caption_mode,
+                )
+                graph.append(
+                    f"[{label}]subtitles='{escape_filter_path(ass_path)}'[vout{k}]"
+                )
+
+                # Audio is cut per clip at the demuxer (input 0 already is the clip
+                # when rendering a single clip); stream copy still applies
+                if shared:
+                    inputs += [
+                        "-ss",
+                        f"{start_t:.3f}",
+                        "-t",
+                        f"{duration:.3f}",
+                        "-i",
+                        video_path,
+                    ]
+                    audio_input = n_inputs
+                    n_inputs += 1
+                else:
+                    audio_input = 0
+
+                music_path = self._pick_music(logger)
+                inputs += self._music_input_args(music_path)
+                music_input = n_inputs
+                if music_path:
+                    n_inputs += 1
+
+                audio_args = self._audio_args(
+                    video_path,
+                    audio_input,
+                    music_input,
+                    duration,
+                    music_path,
+                    self._relative_words(clip_data),
+                    out=f"aout{k}",
+                )
+                outputs.append(
+                    (["-map", f"[vout{k}]", "-r", f"{fps}"], audio_args, output_path)
+                )
+
+            base_cmd = [
+                get_ffmpeg_exe(),
+                "-y",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-progress",
+                "pipe:1",
+                "-nostats",
+            ]
+            base_cmd += inputs + ["-filter_complex", ";".join(graph)]
+            # Progress follows the first output (frame counts are per stream)
+            total_frames = int((spans[0][3] - spans[0][2]) * fps)
+
+            def encode(codec, preset, params):
+                cmd = list(base_cmd)
+                for video_args, audio_args, output_path in outputs:
+                    cmd += video_args + ["-c:v", codec, "-preset", preset]
+                    cmd += params + audio_args + [output_path]
+                run_ffmpeg(cmd, total_frames, proglog_logger)
+
+            self._encode(
+                encoder_profile,
+                output_bitrate,
+                encode,
+                ", ".join(span[1] for span in spans),
+                logger,
+            )
+        finally:
+            for path in temp_files:
+                if os.path.exists(path):
+                    os.remove(path)
 
 if __name__ == "__main__":
     print("Test mode: Please run via launch.bat")
@@ -6,14 +6,24 @@ cleanup from the main Flet UI process. When this process exits, the OS
 reclaims all GPU memory automatically — no C++ destructor crash.
 
 Usage:
-    python transcribe_worker.py <video_path> <output_json_path> [model_size]
+    python transcribe_worker.py <video_path> [model_size]
+    python transcribe_worker.py --serve [model_size]
 
 Output:
-    Writes a JSON file with the word list:
-    [{"start": 0.0, "end": 0.5, "word": "Hello"}, ...]
+    Streams each decoded segment's words as a JSON line on stdout, prefixed
+    with PROTOCOL_PREFIX: {"type": "words", "words": [...]}, then
+    {"type": "done", "count": N}. Everything else on stdout is plain log
+    output. Words: [{"start": 0.0, "end": 0.5, "word": "Hello"}, ...]
+
+Serve mode:
+    Loads the model once and keeps it resident. Jobs arrive as JSON lines
+    on stdin ({"id": ..., "video_path": ...} or {"type": "shutdown"});
+    replies are the same protocol lines tagged with the job id ("ready",
+    "words", "done", "error"). The process still isolates CTranslate2
+    from the backend: a crash only takes down the worker.
 
 Exit Codes:
-    0 = Success (JSON file written)
+    0 = Success ("done" message sent)
     1 = Error (check stderr)
 """
 
@@ -33,17 +43,142 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 
+# Marks protocol lines on stdout (everything else is log output)
+PROTOCOL_PREFIX = "@@WHISPER "
+
+# Decoding / VAD settings of every transcription (part of the transcript cache key)
+TRANSCRIBE_OPTIONS = {"beam_size": 5, "word_timestamps": True, "vad_filter": True}
+
+
+def emit(message):
+    """Writes one protocol message for the parent process."""
+    print(PROTOCOL_PREFIX + json.dumps(message, ensure_ascii=False), flush=True)
+
+
+def load_model(model_size):
+    import torch
+    from faster_whisper import WhisperModel
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    compute_type = "float16" if device == "cuda" else "int8"
+
+    print(
+        f"[WORKER] 🧠 Loading Whisper Model ({model_size}) to {device.upper()}...",
+        flush=True,
+    )
+
+    # Model cache directory
+    model_cache_dir = os.path.join(BASE_DIR, "models", "whisper")
+
+    model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        download_root=model_cache_dir,
+    )
+
+    print(
+        f"[WORKER] ✅ Model Loaded on {device.upper()} (Compute: {compute_type})",
+        flush=True,
+    )
+    return model
+
+
+def transcribe_words(model, video_path, on_segment=None):
+    """
+    Word-level transcription: [{"start", "end", "word"}, ...].
+    on_segment(words) is called with each segment's words as it is decoded.
+    """
+    print("[WORKER] 🎙️  Transcribing audio (Word-Level Timestamps)...", flush=True)
+
+    segments, info = model.transcribe(video_path, **TRANSCRIBE_OPTIONS)
+
+    print(
+        f"[WORKER]    Detected Language: {info.language.upper()} (Probability: {info.language_probability:.2f})",
+        flush=True,
+    )
+
+    word_list = []
+    for segment in segments:
+        if segment.words:
+            words = [
+                {
+                    "start": round(word.start, 3),
+                    "end": round(word.end, 3),
+                    "word": word.word.strip(),
+                }
+                for word in segment.words
+            ]
+            word_list.extend(words)
+            if on_segment:
+                on_segment(words)
+
+    print(
+        f"[WORKER] ✅ Transcription Complete. {len(word_list)} words extracted.",
+        flush=True,
+    )
+    return word_list
+
+
+def serve(model, stdin=None):
+    """Job loop of the persistent worker (see module docstring)."""
+    stdin = stdin or sys.stdin
+    emit({"type": "ready"})
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError:
+            emit({"type": "error", "id": None, "message": f"Bad job line: {line[:200]}"})
+            continue
+        if job.get("type") == "shutdown":
+            break
+
+        job_id = job.get("id")
+        print(f"[WORKER] Job {job_id}: {job.get('video_path')}", flush=True)
+        try:
+            if not os.path.exists(job["video_path"]):
+                raise FileNotFoundError(f"Video file not found: {job['video_path']}")
+            words = transcribe_words(
+                model,
+                job["video_path"],
+                on_segment=lambda w: emit({"type": "words", "id": job_id, "words": w}),
+            )
+            emit({"type": "done", "id": job_id, "count": len(words)})
+        except Exception as e:
+            import traceback
+
+            print(f"\n[WORKER] ❌ Transcription Error: {e}", file=sys.stderr, flush=True)
+            traceback.print_exc()
+            emit({"type": "error", "id": job_id, "message": str(e)})
+
+
 def main():
-    if len(sys.argv) < 3:
+    if len(sys.argv) >= 2 and sys.argv[1] == "--serve":
+        model_size = sys.argv[2] if len(sys.argv) > 2 else "large-v3-turbo"
+        print(f"[WORKER] Starting transcription server ({model_size})", flush=True)
+        try:
+            model = load_model(model_size)
+        except Exception as e:
+            print(f"[WORKER] ❌ Model load failed: {e}", file=sys.stderr, flush=True)
+            sys.exit(1)
+        serve(model)
+        # Same as single-shot mode: no explicit model cleanup, the OS
+        # reclaims CUDA memory when the process exits
+        sys.exit(0)
+
+    if len(sys.argv) < 2:
         print(
-            "Usage: transcribe_worker.py <video_path> <output_json_path> [model_size]",
+            "Usage: transcribe_worker.py <video_path> [model_size]",
             file=sys.stderr,
         )
         sys.exit(1)
 
     video_path = sys.argv[1]
-    output_json_path = sys.argv[2]
-    model_size = sys.argv[3] if len(sys.argv) > 3 else "large-v3-turbo"
+    model_size = sys.argv[2] if len(sys.argv) > 2 else "large-v3-turbo"
 
     if not os.path.exists(video_path):
         print(f"ERROR: Video file not found: {video_path}", file=sys.stderr)
@@ -54,67 +189,13 @@ def main():
     print(f"[WORKER] Model: {model_size}", flush=True)
 
     try:
-        import torch
-        from faster_whisper import WhisperModel
-
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        compute_type = "float16" if device == "cuda" else "int8"
-
-        print(
-            f"[WORKER] 🧠 Loading Whisper Model ({model_size}) to {device.upper()}...",
-            flush=True,
-        )
-
-        # Model cache directory
-        model_cache_dir = os.path.join(BASE_DIR, "models", "whisper")
-
-        model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type,
-            download_root=model_cache_dir,
-        )
-
-        print(
-            f"[WORKER] ✅ Model Loaded on {device.upper()} (Compute: {compute_type})",
-            flush=True,
+        model = load_model(model_size)
+        word_list = transcribe_words(
+            model,
+            video_path,
+            on_segment=lambda w: emit({"type": "words", "words": w}),
         )
-
-        # Transcribe
-        print("[WORKER] 🎙️  Transcribing audio (Word-Level Timestamps)...", flush=True)
-
-        segments, info = model.transcribe(
-            video_path, beam_size=5, word_timestamps=True, vad_filter=True
-        )
-
-        print(
-            f"[WORKER]    Detected Language: {info.language.upper()} (Probability: {info.language_probability:.2f})",
-            flush=True,
-        )
-
-        word_list = []
-        for segment in segments:
-            if segment.words:
-                for word in segment.words:
-                    word_list.append(
-                        {
-                            "start": round(word.start, 3),
-                            "end": round(word.end, 3),
-                            "word": word.word.strip(),
-                        }
-                    )
-                    print(".", end="", flush=True)
-
-        print(
-            f"\n[WORKER] ✅ Transcription Complete. {len(word_list)} words extracted.",
-            flush=True,
-        )
-
-        # Write results to JSON
-        with open(output_json_path, "w", encoding="utf-8") as f:
-            json.dump(word_list, f, ensure_ascii=False)
-
-        print(f"[WORKER] ✅ Results written to {output_json_path}", flush=True)
+        emit({"type": "done", "count": len(word_list)})
 
         # NO explicit cleanup! Let the process exit naturally.
         # The OS will reclaim all CUDA memory when this process terminates.
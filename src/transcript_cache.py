@@ -0,0 +1,46 @@
+"""
+Columnar on-disk format for cached transcripts.
+
+A word list is stored as a compressed .npz: float32 start/end columns, one
+int32 id per word into a string table of the distinct words, and the table
+itself as a single UTF-8 blob plus offsets (no pickled objects). Entries live
+in a DiskCache namespace keyed by Transcriber.cache_key().
+"""
+
+import numpy as np
+
+# Bumped whenever the stored layout changes (part of the cache key)
+TRANSCRIPT_FORMAT_VERSION = 1
+
+
+def save_words(words, path):
+    """Writes [{"start", "end", "word"}, ...] to `path` (.npz)."""
+    table = {}
+    ids = [table.setdefault(w["word"], len(table)) for w in words]
+    encoded = [text.encode("utf-8") for text in table]
+
+    np.savez_compressed(
+        path,
+        version=np.array([TRANSCRIPT_FORMAT_VERSION], dtype=np.int32),
+        starts=np.array([w["start"] for w in words], dtype=np.float32),
+        ends=np.array([w["end"] for w in words], dtype=np.float32),
+        word_ids=np.array(ids, dtype=np.int32),
+        table_bytes=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        table_offsets=np.cumsum([0] + [len(b) for b in encoded], dtype=np.int64),
+    )
+
+
+def load_words(path):
+    """Word list stored by save_words (timestamps rounded to ms, as Whisper's)."""
+    with np.load(path) as data:
+        if int(data["version"][0]) != TRANSCRIPT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported transcript format {int(data['version'][0])}")
+        blob = data["table_bytes"].tobytes()
+        offsets = data["table_offsets"].tolist()
+        table = [blob[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+        return [
+            {"start": round(start, 3), "end": round(end, 3), "word": table[i]}
+            for start, end, i in zip(
+                data["starts"].tolist(), data["ends"].tolist(), data["word_ids"].tolist()
+            )
+        ]
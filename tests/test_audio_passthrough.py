@@ -0,0 +1,94 @@
+import sys
+import os
+import subprocess
+import tempfile
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ffmpeg_utils import get_ffmpeg_exe, probe_audio_codec
+
+
+def make_source(path, audio_codec="aac"):
+    """8s 640x360 test pattern with a 440 Hz tone."""
+    subprocess.run(
+        [
+            get_ffmpeg_exe(),
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            "testsrc2=s=640x360:r=25:d=8",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=440:duration=8",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-c:a",
+            audio_codec,
+            "-shortest",
+            path,
+        ],
+        check=True,
+    )
+
+
+def audio_bitrate_kbps(path):
+    result = subprocess.run(
+        [get_ffmpeg_exe(), "-hide_banner", "-i", path],
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        if "Audio:" in line and "kb/s" in line:
+            return int(line.rsplit(",", 1)[1].split()[0])
+    return None
+
+
+def test_source_audio_is_copied():
+    """Without music, clip audio is cut from the source instead of re-encoded."""
+    from src.renderer import VideoRenderer
+
+    print("Testing audio stream-copy fast path...")
+    clip = {"start": 1.0, "end": 6.0, "words": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.mp4")
+        make_source(source)
+        source_kbps = audio_bitrate_kbps(source)
+
+        renderer = VideoRenderer(cache_root=tmp)
+        renderer.temp_dir = tmp
+        for backend in ("ffmpeg", "moviepy"):
+            output_path = os.path.join(tmp, f"out_{backend}.mp4")
+            renderer.render_clip(
+                source,
+                clip,
+                {},
+                output_path,
+                output_resolution="360x640",
+                backend=backend,
+                encoder_profile="x264_veryfast",
+            )
+            out_kbps = audio_bitrate_kbps(output_path)
+            print(f"{backend}: audio {probe_audio_codec(output_path)} {out_kbps} kb/s "
+                  f"(source {source_kbps} kb/s)")
+
+            assert probe_audio_codec(output_path) == "aac"
+            # A 320k re-encode would show up as a much higher bitrate
+            assert out_kbps <= source_kbps + 16
+
+        # No shared/leftover temp audio or video-only intermediates
+        leftovers = [
+            f for f in os.listdir(tmp) if f.startswith(("temp-audio", "video-only"))
+        ]
+        assert not leftovers, leftovers
+        print("✅ Source audio stream-copied; no temp files left behind.")
+
+
+if __name__ == "__main__":
+    test_source_audio_is_copied()
@@ -0,0 +1,130 @@
+import sys
+import os
+import re
+import time
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import ffmpeg_utils
+from src.audio_track import (
+    AUDIO_SAMPLE_RATE,
+    audio_track_path,
+    extract_audio_track,
+    remove_audio_track,
+)
+from src.ffmpeg_utils import get_ffmpeg_exe
+
+SOURCE_SECONDS = 60
+
+
+def make_source(path, seconds=SOURCE_SECONDS, audio=True):
+    """720p test pattern with a stereo 48 kHz AAC tone (or no audio)."""
+    cmd = [
+        get_ffmpeg_exe(), "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=s=1280x720:r=30:d={seconds}",
+    ]
+    if audio:
+        cmd += [
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}:sample_rate=48000",
+            "-ac", "2", "-c:a", "aac",
+        ]
+    cmd += ["-c:v", "libx264", "-preset", "ultrafast", "-shortest", path]
+    subprocess.run(cmd, check=True)
+
+
+def audio_stream_info(path):
+    result = subprocess.run(
+        [get_ffmpeg_exe(), "-hide_banner", "-i", path], capture_output=True, text=True
+    )
+    return re.search(r"Audio: (.*)", result.stderr).group(1)
+
+
+def test_track_extracted_once():
+    print("Testing audio track extraction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "source.mp4")
+        make_source(video)
+
+        track = extract_audio_track(video)
+        assert track == audio_track_path(video) == os.path.join(tmp, "source.16k.flac")
+        info = audio_stream_info(track)
+        assert info.startswith("flac") and f"{AUDIO_SAMPLE_RATE} Hz" in info and "mono" in info
+        assert not [f for f in os.listdir(tmp) if f.endswith(".part")]
+
+        # Cached next to the video: no second ffmpeg run
+        with patch.object(ffmpeg_utils, "run_ffmpeg") as run:
+            assert extract_audio_track(video) == track
+            assert not run.called
+
+        # A newer video invalidates the track
+        os.utime(video, (time.time() + 10, time.time() + 10))
+        with patch.object(ffmpeg_utils, "run_ffmpeg", wraps=ffmpeg_utils.run_ffmpeg) as run:
+            extract_audio_track(video)
+            assert run.called
+
+        # Independent of the video file
+        os.remove(video)
+        assert os.path.exists(track)
+        remove_audio_track(video)
+        assert not os.path.exists(track)
+    print("✅ 16 kHz mono FLAC written once, next to the video.")
+
+
+def test_ingest_falls_back_without_audio():
+    from src.ingest_transcribe import VideoIngestor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "silent.mp4")
+        make_source(video, seconds=2, audio=False)
+        assert VideoIngestor().extract_audio(video) == video
+        assert not os.path.exists(audio_track_path(video))
+    print("✅ Silent video: Whisper reads the video itself.")
+
+
+def test_decode_benchmark():
+    """Whisper input decode: from the video container vs the extracted track."""
+    from faster_whisper.audio import decode_audio
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "source.mp4")
+        make_source(video)
+
+        start = time.perf_counter()
+        track = extract_audio_track(video)
+        extract_time = time.perf_counter() - start
+
+        def best_of(path, runs=3):
+            best = None
+            for _ in range(runs):
+                start = time.perf_counter()
+                audio = decode_audio(path, sampling_rate=AUDIO_SAMPLE_RATE)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return audio, best
+
+        from_video, video_time = best_of(video)
+        from_track, track_time = best_of(track)
+
+        video_mb = os.path.getsize(video) / 1024 / 1024
+        track_mb = os.path.getsize(track) / 1024 / 1024
+        print(f"One-off extraction: {extract_time * 1000:.0f} ms")
+        print(f"Decode from video ({video_mb:.1f} MB): {video_time * 1000:.0f} ms")
+        print(f"Decode from track ({track_mb:.1f} MB): {track_time * 1000:.0f} ms")
+
+        # Same samples Whisper would have seen (up to AAC priming / resampler edges)
+        n = min(len(from_video), len(from_track))
+        assert abs(len(from_video) - len(from_track)) < AUDIO_SAMPLE_RATE // 10
+        assert np.abs(from_video[: n - 1600] - from_track[: n - 1600]).max() < 0.01
+        assert track_time < video_time
+
+
+if __name__ == "__main__":
+    test_track_extracted_once()
+    test_ingest_falls_back_without_audio()
+    test_decode_benchmark()
@@ -0,0 +1,128 @@
+import sys
+import os
+import json
+import time
+import random
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import b_roll_manager
+from src.b_roll_manager import BRollManager, ingest_b_roll
+from src.ffmpeg_utils import get_ffmpeg_exe, probe_video
+
+TARGET = (360, 640)
+
+
+def make_asset(path, seconds=6, size="960x540", rate=25):
+    subprocess.run(
+        [
+            get_ffmpeg_exe(), "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=s={size}:r={rate}:d={seconds}",
+            "-c:v", "libx264", "-preset", "ultrafast", path,
+        ],
+        check=True,
+    )
+
+
+def legacy_b_roll(file_path, duration, target_resolution):
+    """Reference: the original per-call load + per-frame resize/crop."""
+    from moviepy.video.io.VideoFileClip import VideoFileClip
+
+    clip = VideoFileClip(file_path)
+    start = random.uniform(0, clip.duration - duration)
+    clip = clip.subclipped(start, start + duration)
+    target_w, target_h = target_resolution
+    new_w = int(target_h * clip.w / clip.h)
+    clip = clip.resized(height=target_h)
+    return clip.cropped(x1=new_w / 2 - target_w / 2, width=target_w)
+
+
+def test_ingest_builds_manifest_once():
+    print("Testing B-Roll ingest...")
+    with tempfile.TemporaryDirectory() as tmp:
+        asset_dir = os.path.join(tmp, "b_roll")
+        proxy_dir = os.path.join(tmp, "proxies")
+        os.makedirs(asset_dir)
+        make_asset(os.path.join(asset_dir, "city.mp4"))
+        # Same name, other container: a separate proxy
+        make_asset(os.path.join(asset_dir, "city.mov"), seconds=2)
+
+        entries = ingest_b_roll(asset_dir, proxy_dir, TARGET, 30)
+        assert sorted(entries) == ["city.mov", "city.mp4"]
+        assert entries["city.mov"]["proxy"] != entries["city.mp4"]["proxy"]
+
+        proxy = os.path.join(proxy_dir, entries["city.mp4"]["proxy"])
+        width, height, fps, duration = probe_video(proxy)
+        assert (width, height) == TARGET and round(fps) == 30
+        assert abs(duration - 6.0) < 0.1
+
+        with open(os.path.join(proxy_dir, "manifest.json"), encoding="utf-8") as f:
+            assert json.load(f)["assets"]["city.mp4"]["duration"] == duration
+
+        # Second run: nothing changed -> nothing transcoded
+        with patch.object(b_roll_manager, "transcode_proxy") as transcode:
+            ingest_b_roll(asset_dir, proxy_dir, TARGET, 30)
+            assert transcode.call_count == 0
+
+        short_proxy = os.path.join(proxy_dir, entries["city.mov"]["proxy"])
+        assert abs(probe_video(short_proxy)[3] - 2.0) < 0.1
+
+        # Removed sources drop their proxy, and only theirs
+        os.remove(os.path.join(asset_dir, "city.mov"))
+        entries_after = ingest_b_roll(asset_dir, proxy_dir, TARGET, 30)
+        assert list(entries_after) == ["city.mp4"]
+        assert not os.path.exists(short_proxy)
+        assert probe_video(proxy)[3] == duration
+    print("✅ Proxies built once and indexed in manifest.json.")
+
+
+def test_segments_from_proxies():
+    """Segments are trimmed from proxies on keyframes; no per-frame resize."""
+    print("Testing B-Roll segment selection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        asset_dir = os.path.join(tmp, "b_roll")
+        os.makedirs(asset_dir)
+        source = os.path.join(asset_dir, "city.mp4")
+        make_asset(source)
+
+        manager = BRollManager(
+            asset_dir, proxy_dir=os.path.join(tmp, "proxies"), resolution=TARGET
+        )
+
+        # Starts on a whole second (a proxy keyframe), inside the proxy
+        for _ in range(20):
+            proxy_path, start, loops = manager.pick_segment(2.0)
+            assert start == int(start) and not loops
+            assert start + 2.0 <= probe_video(proxy_path)[3] + 0.05
+
+        # Longer than the proxy -> looped from the start
+        assert manager.pick_segment(9.0)[1:] == (0.0, True)
+
+        # Frame fetch cost: legacy load/resize/crop vs proxy trim
+        duration = 2.0
+        start = time.perf_counter()
+        clip = legacy_b_roll(source, duration, TARGET)
+        for frame in clip.iter_frames(fps=30):
+            pass
+        legacy_time = time.perf_counter() - start
+        clip.close()
+
+        start = time.perf_counter()
+        clip = manager.get_random_b_roll(duration, TARGET)
+        for frame in clip.iter_frames(fps=30):
+            assert frame.shape == (TARGET[1], TARGET[0], 3)
+        proxy_time = time.perf_counter() - start
+        clip.close()
+
+        print(f"Legacy B-Roll fetch: {legacy_time * 1000:.0f} ms")
+        print(f"Proxy B-Roll fetch:  {proxy_time * 1000:.0f} ms")
+    print("✅ Segments cut from normalised proxies.")
+
+
+if __name__ == "__main__":
+    test_ingest_builds_manifest_once()
+    test_segments_from_proxies()
@@ -0,0 +1,148 @@
+import sys
+import os
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import b_roll_manager
+from src.b_roll_manager import BRollManager
+from src.crop_track import CropTrack
+from src.ffmpeg_utils import get_ffmpeg_exe
+
+FPS = 25
+NO_FACE = (2.0, 5.0)  # seconds without a face -> B-Roll
+
+
+def make_inputs(tmp):
+    ffmpeg = get_ffmpeg_exe()
+    source = os.path.join(tmp, "source.mp4")
+    subprocess.run(
+        [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"color=c=blue:s=640x360:r={FPS}:d=8",
+            "-f", "lavfi", "-i", "sine=frequency=440:duration=8",
+            "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac",
+            "-shortest", source,
+        ],
+        check=True,
+    )
+    b_roll_dir = os.path.join(tmp, "assets", "b_roll")
+    os.makedirs(b_roll_dir)
+    subprocess.run(
+        [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=c=red:s=1280x720:r=30:d=6",
+            "-c:v", "libx264", "-preset", "ultrafast",
+            os.path.join(b_roll_dir, "red.mp4"),
+        ],
+        check=True,
+    )
+    return source
+
+
+def make_track(width=640, height=360, duration=8.0):
+    frames = np.arange(0, int(duration * FPS))
+    crop_w = int(height * 9 / 16)
+    face = ~((frames >= NO_FACE[0] * FPS) & (frames < NO_FACE[1] * FPS))
+    crop_x = np.full(len(frames), (width - crop_w) // 2)
+    return CropTrack(frames, crop_x, face, FPS, width, height, crop_w)
+
+
+def mean_color_at(path, t):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000)
+    ret, frame = cap.read()
+    cap.release()
+    assert ret
+    return frame.reshape(-1, 3).mean(axis=0)  # BGR
+
+
+def test_b_roll_overlay_both_backends():
+    """Gaps without a face show B-Roll in both the FFmpeg and MoviePy paths."""
+    from src.renderer import VideoRenderer
+
+    print("Testing B-Roll overlay...")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_inputs(tmp)
+        track = make_track()
+        os.chdir(tmp)
+        try:
+            with patch.object(
+                b_roll_manager, "get_proxy_dir", return_value=os.path.join(tmp, "proxies")
+            ):
+                renderer = VideoRenderer(cache_root=tmp)
+                renderer.temp_dir = tmp
+                for backend in ("ffmpeg", "moviepy"):
+                    output_path = os.path.join(tmp, f"out_{backend}.mp4")
+                    renderer.render_clip(
+                        source,
+                        {"start": 0.0, "end": 8.0, "words": []},
+                        track,
+                        output_path,
+                        output_resolution="360x640",
+                        backend=backend,
+                        encoder_profile="x264_veryfast",
+                    )
+                    b, g, r = mean_color_at(output_path, 3.5)
+                    b_face, _, r_face = mean_color_at(output_path, 1.0)
+                    print(f"{backend}: t=3.5 BGR=({b:.0f},{g:.0f},{r:.0f}) "
+                          f"t=1.0 B={b_face:.0f} R={r_face:.0f}")
+                    assert r > 200 and b < 50  # B-Roll (red) in the gap
+                    assert b_face > 200 and r_face < 50  # source (blue) elsewhere
+        finally:
+            os.chdir(cwd)
+    print("✅ B-Roll overlaid on 'no face' gaps.")
+
+
+def test_failed_b_roll_not_retried():
+    """A B-Roll clip that raises is skipped for the rest of its segment."""
+    from src.renderer import VideoRenderer
+
+    class BrokenClip:
+        calls = 0
+
+        def get_frame(self, t):
+            BrokenClip.calls += 1
+            raise OSError("decoder gone")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            with patch.object(
+                BRollManager, "get_random_b_roll", return_value=BrokenClip()
+            ):
+                renderer = VideoRenderer(cache_root=tmp)
+                renderer.temp_dir = tmp
+                output_path = os.path.join(tmp, "out.mp4")
+                renderer.render_clip(
+                    source,
+                    {"start": 0.0, "end": 8.0, "words": []},
+                    make_track(),
+                    output_path,
+                    output_resolution="360x640",
+                    backend="moviepy",
+                    encoder_profile="x264_veryfast",
+                )
+            b, _, r = mean_color_at(output_path, 3.5)
+            assert b > 200 and r < 50  # fell back to the face crop
+        finally:
+            os.chdir(cwd)
+
+    print(f"Broken B-Roll get_frame calls: {BrokenClip.calls}")
+    assert BrokenClip.calls == 1
+    print("✅ Failed B-Roll cached, not retried per frame.")
+
+
+if __name__ == "__main__":
+    test_b_roll_overlay_both_backends()
+    test_failed_b_roll_not_retried()
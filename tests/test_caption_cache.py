@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+import tempfile
+from unittest.mock import patch
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.disk_cache import DiskCache
+from src.fast_caption import SubtitleGenerator
+
+
+def make_words(n=180, offset=0.0):
+    return [
+        {"word": f"word{i}", "start": offset + i * 0.33, "end": offset + i * 0.33 + 0.25}
+        for i in range(n)
+    ]
+
+
+def legacy_ass(generator, words):
+    """Reference: the original header + joined event list."""
+    return generator.generate_header() + "".join(
+        e + "\n" for e in generator.generate_karaoke_line(words, 0, 0)
+    )
+
+
+def test_streamed_file_matches_legacy():
+    print("Testing streamed ASS output...")
+    words = make_words()
+    generator = SubtitleGenerator("Neon", 72, "top")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "captions.ass")
+        generator.generate_ass_file(words, path)
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == legacy_ass(generator, words)
+    print("✅ Streamed writer produces the same file.")
+
+
+def test_cache_key_inputs():
+    words = make_words(20)
+    key = SubtitleGenerator("Hormozi", 60, "center").cache_key(words)
+
+    assert SubtitleGenerator("Hormozi", 60, "center").cache_key(make_words(20)) == key
+    assert SubtitleGenerator("Beast", 60, "center").cache_key(words) != key
+    assert SubtitleGenerator("Hormozi", 64, "center").cache_key(words) != key
+    assert SubtitleGenerator("Hormozi", 60, "top").cache_key(words) != key
+    assert (
+        SubtitleGenerator(
+            "Hormozi", 60, "center", custom_config={"HighlightColour": "&H000000FF"}
+        ).cache_key(words)
+        != key
+    )
+    assert SubtitleGenerator("Hormozi", 60, "center").cache_key(words[1:]) != key
+    print("✅ Key covers words, style, custom config, font size and position.")
+
+
+def test_cached_ass_reused():
+    print("Testing ASS cache...")
+    words = make_words()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache("captions", 1024 * 1024, root=tmp)
+        generator = SubtitleGenerator("Hormozi", 60, "center")
+
+        with patch.object(
+            SubtitleGenerator, "generate_ass_file", wraps=generator.generate_ass_file
+        ) as generate:
+            first = generator.cached_ass_file(words, cache)
+            for _ in range(5):
+                assert SubtitleGenerator("Hormozi", 60, "center").cached_ass_file(
+                    words, cache
+                ) == first
+            assert generate.call_count == 1
+
+        other = SubtitleGenerator("Hormozi", 72, "center").cached_ass_file(words, cache)
+        assert other != first and os.path.exists(first)
+
+        # Cost per render: regenerate + rewrite vs cache lookup
+        runs = 50
+        start = time.perf_counter()
+        for k in range(runs):
+            generator.generate_ass_file(words, os.path.join(tmp, f"legacy_{k}.ass"))
+        legacy_time = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            generator.cached_ass_file(words, cache)
+        cached_time = (time.perf_counter() - start) / runs
+
+        print(f"Regenerate .ass: {legacy_time * 1000:.2f} ms")
+        print(f"Cache hit:       {cached_time * 1000:.2f} ms")
+    print("✅ Identical captions reuse the cached .ass file.")
+
+
+if __name__ == "__main__":
+    test_streamed_file_matches_legacy()
+    test_cache_key_inputs()
+    test_cached_ass_reused()
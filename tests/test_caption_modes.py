@@ -0,0 +1,114 @@
+import sys
+import os
+import re
+import time
+import subprocess
+import tempfile
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fast_caption import (
+    PHRASE_BREAK_GAP,
+    PHRASE_MAX_WORDS,
+    PHRASE_MIN_WORDS,
+    PHRASE_PAUSE,
+    SubtitleGenerator,
+)
+from src.ffmpeg_utils import escape_filter_path, get_ffmpeg_exe
+
+CLIP_SECONDS = 20
+
+
+def make_words(seconds=CLIP_SECONDS):
+    """~3 words/sec speech with a sentence break and a pause every few seconds."""
+    words = []
+    t = 0.2
+    i = 0
+    while t < seconds - 0.5:
+        text = f"word{i}" + ("." if i % 7 == 6 else "")
+        words.append({"word": text, "start": t, "end": t + 0.25})
+        t += 1.2 if i % 11 == 10 else 0.33
+        i += 1
+    return words
+
+
+def test_phrase_grouping():
+    print("Testing phrase grouping...")
+    words = make_words()
+    phrases = SubtitleGenerator.group_phrases(words)
+
+    assert [w for p in phrases for w in p] == words
+    assert all(1 <= len(p) <= PHRASE_MAX_WORDS for p in phrases)
+    # Sentence ends and pauses close a phrase once it has PHRASE_MIN_WORDS
+    for p in phrases:
+        for n, (a, b) in enumerate(zip(p, p[1:]), start=1):
+            gap = b["start"] - a["end"]
+            assert gap <= PHRASE_BREAK_GAP
+            if n >= PHRASE_MIN_WORDS:
+                assert not a["word"].endswith(".") and gap <= PHRASE_PAUSE
+    print(f"✅ {len(words)} words -> {len(phrases)} phrases.")
+
+
+def test_phrase_karaoke_timing():
+    words = [
+        {"word": "one", "start": 1.00, "end": 1.30},
+        {"word": "two", "start": 1.40, "end": 1.70},
+        {"word": "three", "start": 1.80, "end": 2.40},
+    ]
+    events = list(SubtitleGenerator(caption_mode="phrase").iter_events(words))
+    assert len(events) == 1
+    start, end = events[0].split(",")[1:3]
+    assert (start, end) == ("0:00:00.95", "0:00:02.60")
+
+    durations = [int(d) for d in re.findall(r"\\kf(\d+)", events[0])]
+    lead = int(re.search(r"\\k(\d+)\}", events[0]).group(1))
+    assert lead == 5
+    assert durations == [40, 40, 60]  # each word runs until the next starts
+    assert "ONE" in events[0] and "THREE" in events[0]
+    print("✅ \\kf durations follow the word timings.")
+
+
+def subtitles_filter_time(ass_path, runs=2):
+    """Best-of wall time of rendering the captions over a blank 1080x1920 clip."""
+    ffmpeg = get_ffmpeg_exe()
+    source = f"color=c=black:s=1080x1920:r=30:d={CLIP_SECONDS}"
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [
+                ffmpeg, "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", source,
+                "-vf", f"subtitles='{escape_filter_path(ass_path)}'" if ass_path else "null",
+                "-f", "null", "-",
+            ],
+            check=True,
+        )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def test_caption_mode_benchmark():
+    """libass cost per clip: per-word animated events vs grouped \\kf phrases."""
+    words = make_words()
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = subtitles_filter_time(None)
+        results = {}
+        for mode in ("word", "phrase"):
+            generator = SubtitleGenerator("Hormozi", 90, "center", caption_mode=mode)
+            path = os.path.join(tmp, f"{mode}.ass")
+            generator.generate_ass_file(words, path)
+            events = sum(1 for _ in generator.iter_events(words))
+            results[mode] = (events, subtitles_filter_time(path) - baseline)
+
+    for mode, (events, seconds) in results.items():
+        print(f"{mode:>6}: {events:3d} events, subtitles filter {seconds * 1000:.0f} ms / {CLIP_SECONDS}s clip")
+    assert results["phrase"][0] * 2 <= results["word"][0]
+
+
+if __name__ == "__main__":
+    test_phrase_grouping()
+    test_phrase_karaoke_timing()
+    test_caption_mode_benchmark()
@@ -0,0 +1,138 @@
+import sys
+import os
+import time
+import wave
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import chunked_transcribe
+from src.chunked_transcribe import SAMPLE_RATE, load_pcm, plan_shards, transcribe_chunked
+from src.transcribe_worker import transcribe_words
+
+SOURCE_SECONDS = 600
+SHARD_SECONDS = 60
+# Fake decode cost per second of audio (a real CPU model is ~0.1-0.5 s/s)
+DECODE_COST = 0.01
+FRAME = SAMPLE_RATE // 100  # 10 ms energy frames
+
+
+def energy_segments(audio, sample_rate=SAMPLE_RATE):
+    """Stand-in VAD for the synthetic tones (silero ignores them)."""
+    frames = np.asarray(audio[: len(audio) // FRAME * FRAME]).reshape(-1, FRAME)
+    active = np.concatenate([[False], np.abs(frames).max(axis=1) > 0.05, [False]])
+    edges = np.flatnonzero(np.diff(active.astype(np.int8)))
+    return [(a * FRAME, b * FRAME) for a, b in zip(edges[::2], edges[1::2])]
+
+
+class FakeModel:
+    """'Transcribes' each tone burst as one word; cost scales with audio length."""
+
+    def transcribe(self, audio, **kwargs):
+        time.sleep(len(audio) / SAMPLE_RATE * DECODE_COST)
+        words = [
+            SimpleNamespace(start=a / SAMPLE_RATE, end=b / SAMPLE_RATE, word=f" w{a}")
+            for a, b in energy_segments(audio)
+        ]
+        segments = [SimpleNamespace(words=words)]
+        return iter(segments), SimpleNamespace(language="en", language_probability=0.99)
+
+
+def fake_loader(model_size, cpu_threads):
+    return FakeModel()
+
+
+def make_speech(path, seconds=SOURCE_SECONDS, seed=1):
+    """0.2-0.6s tone "words" separated by 0.1-1.5s pauses, as a 16 kHz wav."""
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(seconds * SAMPLE_RATE, dtype=np.float32)
+    t = 0.5
+    while t < seconds - 1:
+        length = rng.uniform(0.2, 0.6)
+        a, b = int(t * SAMPLE_RATE), int((t + length) * SAMPLE_RATE)
+        audio[a:b] = 0.5 * np.sin(2 * np.pi * 300 * np.arange(b - a) / SAMPLE_RATE)
+        t += length + rng.uniform(0.1, 1.5)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((audio * 32767).astype(np.int16).tobytes())
+    return audio
+
+
+def test_plan_shards():
+    print("Testing shard planning...")
+    rate = 100  # samples per second, to keep the numbers readable
+    shard = 300 * rate
+    # Speech everywhere except 1s silences every 70s
+    speech = []
+    t = 0
+    while t < 1800 * rate:
+        speech.append((t, t + 69 * rate))
+        t += 70 * rate
+    shards = plan_shards(speech, 1800 * rate, shard)
+
+    assert shards[0][0] == 0 and shards[-1][1] == 1800 * rate
+    assert all(a == b for (_, a), (b, _) in zip(shards, shards[1:]))
+    for _, cut in shards[:-1]:
+        assert any(e < cut < s for (_, e), (s, _) in zip(speech, speech[1:]))
+    assert all(0.5 * shard < b - a < 1.5 * shard for a, b in shards[:-1])
+
+    # No silence at all: hard cuts at the target length
+    assert plan_shards([(0, 1000 * rate)], 1000 * rate, shard) == [
+        (0, shard), (shard, 2 * shard), (2 * shard, 1000 * rate)
+    ]
+    assert plan_shards([], 0, shard) == []
+    print(f"✅ {len(shards)} shards, all cut inside silences.")
+
+
+def test_chunked_matches_single_pass():
+    """Benchmark: words/sec and timestamp drift vs one serial pass."""
+    print("Testing chunked transcription...")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "speech.wav")
+        make_speech(source)
+
+        # Single pass over the whole (decoded) track
+        pcm = chunked_transcribe.extract_pcm(source, os.path.join(tmp, "full.f32"))
+        start = time.perf_counter()
+        single = transcribe_words(FakeModel(), np.array(load_pcm(pcm)))
+        single_time = time.perf_counter() - start
+
+        batches = []
+        with patch.object(chunked_transcribe, "speech_segments", energy_segments):
+            start = time.perf_counter()
+            chunked = transcribe_chunked(
+                source,
+                workers=3,
+                shard_seconds=SHARD_SECONDS,
+                temp_dir=tmp,
+                loader=fake_loader,
+                on_words=batches.append,
+            )
+            chunked_time = time.perf_counter() - start
+
+        assert not [f for f in os.listdir(tmp) if f.startswith("speech.") and f.endswith(".f32")]
+        assert [w for b in batches for w in b] == chunked
+        assert len(batches) >= SOURCE_SECONDS // SHARD_SECONDS - 1
+
+        assert len(chunked) == len(single)
+        drift = max(
+            max(abs(a["start"] - b["start"]), abs(a["end"] - b["end"]))
+            for a, b in zip(single, chunked)
+        )
+        print(f"Single pass: {len(single) / single_time:.0f} words/s ({single_time:.2f}s)")
+        print(f"Chunked:     {len(chunked) / chunked_time:.0f} words/s ({chunked_time:.2f}s, {len(batches)} shards)")
+        print(f"Max timestamp drift: {drift * 1000:.1f} ms")
+        assert drift <= 0.011  # one 10 ms detection frame + rounding
+    print("✅ Shards stitched back with offset-corrected timestamps.")
+
+
+if __name__ == "__main__":
+    test_plan_shards()
+    test_chunked_matches_single_pass()
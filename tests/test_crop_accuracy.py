@@ -0,0 +1,51 @@
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cropper import SmartCropper
+
+SAMPLE_VIDEO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_video.mp4")
+
+
+def run_analysis(cropper, analysis_height):
+    start = time.perf_counter()
+    track = cropper.analyze_video(SAMPLE_VIDEO, analysis_height=analysis_height)
+    return track, time.perf_counter() - start
+
+
+def test_analysis_height_accuracy():
+    """Accuracy-vs-speed report: low-res detection input against full-res analysis."""
+    print("Testing low-resolution face analysis...")
+    if not os.path.exists(SAMPLE_VIDEO):
+        print("⚠️ No sample video found. Skipping.")
+        return
+
+    cropper = SmartCropper()
+    full, full_time = run_analysis(cropper, 0)
+    print(f"Full res: {full_time:.2f}s ({len(full)} samples)")
+
+    for height in (720, 480, 360, 240):
+        track, elapsed = run_analysis(cropper, height)
+        assert (track.frames == full.frames).all()
+
+        deviations = np.abs(track.crop_x.astype(int) - full.crop_x.astype(int))
+        mean_dev = deviations.mean() if len(deviations) else 0.0
+        max_dev = deviations.max() if len(deviations) else 0
+        face_agreement = (track.face_mask == full.face_mask).mean() if len(full) else 1.0
+
+        print(
+            f"{height}p: {elapsed:.2f}s ({full_time / elapsed:.1f}x) | "
+            f"crop_x deviation mean {mean_dev:.1f}px, max {max_dev}px | "
+            f"face agreement {face_agreement:.0%}"
+        )
+
+    print("✅ Accuracy report complete.")
+
+
+if __name__ == "__main__":
+    test_analysis_height_accuracy()
@@ -0,0 +1,77 @@
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cropper import OPEN_END, SmartCropper, missing_frame_ranges
+from src.disk_cache import DiskCache
+
+SAMPLE_VIDEO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_video.mp4")
+
+
+def test_missing_frame_ranges():
+    covered = [(0, 26), (60, OPEN_END)]
+    # Starts of uncovered parts snap to the sampling grid (stride 4)
+    assert missing_frame_ranges([(0, 100)], covered, 4) == [(28, 60)]
+    assert missing_frame_ranges([(0, 20), (64, OPEN_END)], covered, 4) == []
+    assert missing_frame_ranges([(0, 40)], [], 4) == [(0, 40)]
+    print("✅ Only uncovered frames are scheduled.")
+
+
+def test_new_windows_reuse_cached_detections():
+    """LLM picks different windows on a re-run: only the new frames are analyzed."""
+    print("Testing crop analysis cache across clip windows...")
+    if not os.path.exists(SAMPLE_VIDEO):
+        print("⚠️ No sample video found. Skipping.")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache("crop_tracks", 1024 * 1024, root=tmp)
+        cropper = SmartCropper()
+
+        def analyze(time_ranges, smoothing="ema", use_cache=True):
+            with patch.object(
+                SmartCropper, "get_face_center", autospec=True,
+                side_effect=SmartCropper.get_face_center,
+            ) as detect:
+                track = cropper.analyze_video(
+                    SAMPLE_VIDEO,
+                    time_ranges=time_ranges,
+                    range_padding=0,
+                    smoothing=smoothing,
+                    cache=cache if use_cache else None,
+                )
+            return track, detect.call_count
+
+        first, first_calls = analyze([(0.0, 2.0)])
+        assert first_calls == len(first) > 0
+
+        # Overlapping new window: only 2-3s is decoded and analyzed
+        second, second_calls = analyze([(1.0, 3.0)])
+        reference, reference_calls = analyze([(1.0, 3.0)], use_cache=False)
+        assert 0 < second_calls < reference_calls
+        assert (second.frames == reference.frames).all()
+        assert (second.crop_x == reference.crop_x).all()
+        assert (second.face_mask == reference.face_mask).all()
+
+        # Same windows, other post-processing: no detection at all
+        third, third_calls = analyze([(0.5, 2.5)], smoothing="zero_phase")
+        assert third_calls == 0
+        reference, _ = analyze([(0.5, 2.5)], smoothing="zero_phase", use_cache=False)
+        assert np.array_equal(third.crop_x, reference.crop_x)
+
+        print(
+            f"Detections: {first_calls} (cold), {second_calls} (new window, "
+            f"{reference_calls} uncached), {third_calls} (restyle)"
+        )
+    print("✅ Cached detections reused across windows and smoothing modes.")
+
+
+if __name__ == "__main__":
+    test_missing_frame_ranges()
+    test_new_windows_reuse_cached_detections()
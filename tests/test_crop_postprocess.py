@@ -0,0 +1,105 @@
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cropper import build_crop_track
+
+
+def legacy_post_process(results, fps, width, target_width, stride, scene_boundaries):
+    """Reference: the original per-sample Python loop from analyze_video."""
+    frame_mapping = {}
+    current_rel_x = 0.5
+    last_valid_rel_x = 0.5
+
+    scene_cut_frames = set()
+    for scene in scene_boundaries:
+        t = scene.get("start", scene) if isinstance(scene, dict) else scene
+        scene_cut_frames.add(int(t * fps))
+
+    for idx, detected_rel_x in results:
+        target_rel_x = last_valid_rel_x
+        if detected_rel_x is not None:
+            target_rel_x = detected_rel_x
+            last_valid_rel_x = detected_rel_x
+
+        is_cut = False
+        for offset in range(stride + 1):
+            if (idx + offset) in scene_cut_frames or (idx - offset) in scene_cut_frames:
+                is_cut = True
+                break
+
+        this_alpha = 1.0 if is_cut else 0.2
+        current_rel_x = (this_alpha * target_rel_x) + ((1 - this_alpha) * current_rel_x)
+        center_pix = int(current_rel_x * width)
+        crop_x = int(center_pix - (target_width / 2))
+        frame_mapping[idx] = max(0, min(crop_x, width - target_width))
+
+    return frame_mapping
+
+
+def make_samples(hours=3.0, fps=30.0, stride=5, seed=7):
+    rng = np.random.default_rng(seed)
+    indices = np.arange(0, int(hours * 3600 * fps), stride)
+    # Random walk of the speaker position with ~15% missed detections
+    rel_xs = np.clip(0.5 + np.cumsum(rng.normal(0, 0.01, len(indices))), 0.05, 0.95)
+    rel_xs[rng.random(len(indices)) < 0.15] = np.nan
+    # A scene cut roughly every 40 seconds
+    scenes = [{"start": t} for t in np.arange(0, hours * 3600, 40.0) + 3.3]
+    return indices, rel_xs, scenes
+
+
+def test_post_process_benchmark():
+    """Post-process cost on a 3-hour sample list: legacy loop vs vectorized pass."""
+    print("Benchmarking crop post-processing (3h @ 30fps, 6Hz samples)...")
+    fps, width, height, target_width, stride = 30.0, 1920, 1080, 607, 5
+    indices, rel_xs, scenes = make_samples(fps=fps, stride=stride)
+    results = [
+        (int(i), None if np.isnan(x) else float(x)) for i, x in zip(indices, rel_xs)
+    ]
+
+    start = time.perf_counter()
+    legacy = legacy_post_process(results, fps, width, target_width, stride, scenes)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    track = build_crop_track(
+        indices, rel_xs, fps, width, height, target_width, stride, scenes
+    )
+    vector_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    zero_phase = build_crop_track(
+        indices,
+        rel_xs,
+        fps,
+        width,
+        height,
+        target_width,
+        stride,
+        scenes,
+        smoothing="zero_phase",
+    )
+    zero_phase_time = time.perf_counter() - start
+
+    legacy_x = np.array([legacy[int(i)] for i in indices])
+    max_diff = np.abs(legacy_x - track.crop_x.astype(int)).max()
+
+    print(f"Samples: {len(indices)}")
+    print(f"Legacy loop:     {legacy_time * 1000:.1f} ms")
+    print(f"Vectorized EMA:  {vector_time * 1000:.1f} ms ({legacy_time / vector_time:.1f}x)")
+    print(f"Zero-phase:      {zero_phase_time * 1000:.1f} ms")
+    print(f"Max crop_x difference vs legacy: {max_diff}px")
+
+    # Float rounding may flip a truncation by one pixel, nothing more
+    assert max_diff <= 1
+    assert len(zero_phase) == len(track)
+    print("✅ Vectorized post-process matches the legacy loop.")
+
+
+if __name__ == "__main__":
+    test_post_process_benchmark()
@@ -0,0 +1,69 @@
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crop_track import CropTrack
+
+
+def make_track():
+    # Samples every 4th frame; no face on frames 8-12
+    return CropTrack(
+        frames=[0, 4, 8, 12, 16],
+        crop_x=[100, 140, 140, 120, 100],
+        face_mask=[True, True, False, False, True],
+        fps=24.0,
+        width=1920,
+        height=1080,
+        crop_width=607,
+        stride=4,
+    )
+
+
+def test_crop_track_lookup():
+    print("Testing CropTrack vectorized lookup...")
+    track = make_track()
+
+    crop_x = track.crop_x_at_frames(np.arange(-2, 20))
+    # Clamped before the first / after the last sample, linear in between
+    assert crop_x[0] == 100 and crop_x[-1] == 100
+    assert crop_x[2 + 2] == 120  # frame 2: halfway 100 -> 140
+    assert crop_x[2 + 14] == 110  # frame 14: halfway 120 -> 100
+
+    faces = track.face_at_frames(np.arange(0, 24))
+    assert faces[:8].all()
+    assert not faces[8:16].any()
+    assert faces[16:20].all()
+    assert faces[20:].all()  # Outside the analyzed range -> default (True)
+
+    print("✅ Lookup matches expected interpolation and face hold.")
+
+
+def test_crop_track_npz_roundtrip():
+    print("Testing CropTrack .npz round trip...")
+    track = make_track()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "track.npz")
+        track.save(path)
+        loaded = CropTrack.load(path)
+
+    assert (loaded.frames == track.frames).all()
+    assert (loaded.crop_x == track.crop_x).all()
+    assert (loaded.face_mask == track.face_mask).all()
+    assert (loaded.fps, loaded.width, loaded.crop_width, loaded.stride) == (
+        24.0,
+        1920,
+        607,
+        4,
+    )
+    print("✅ Round trip preserved the track.")
+
+
+if __name__ == "__main__":
+    test_crop_track_lookup()
+    test_crop_track_npz_roundtrip()
@@ -0,0 +1,57 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.disk_cache import DiskCache, file_fingerprint
+
+
+def write_bytes(n):
+    def writer(path):
+        with open(path, "wb") as f:
+            f.write(b"x" * n)
+
+    return writer
+
+
+def test_lru_eviction():
+    print("Testing DiskCache LRU eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache("test", max_bytes=2500, root=tmp)
+
+        for name in ("a", "b"):
+            cache.put(name, ".bin", write_bytes(1000))
+            time.sleep(0.02)
+
+        # Touch "a" so "b" becomes the least recently used entry
+        assert cache.get("a", ".bin")
+        time.sleep(0.02)
+        cache.put("c", ".bin", write_bytes(1000))
+
+        assert cache.get("a", ".bin") is not None
+        assert cache.get("b", ".bin") is None
+        assert cache.get("c", ".bin") is not None
+    print("✅ Least recently used entry was evicted.")
+
+
+def test_keys_and_fingerprint():
+    print("Testing cache keys and file fingerprints...")
+    assert DiskCache.make_key(a=1, b="x") == DiskCache.make_key(b="x", a=1)
+    assert DiskCache.make_key(a=1) != DiskCache.make_key(a=2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        p1 = os.path.join(tmp, "one.mp4")
+        p2 = os.path.join(tmp, "two.mp4")
+        for p in (p1, p2):
+            with open(p, "wb") as f:
+                f.write(b"same content")
+        assert file_fingerprint(p1) == file_fingerprint(p2)
+    print("✅ Keys are order independent, fingerprints ignore file names.")
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_keys_and_fingerprint()
@@ -0,0 +1,112 @@
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import pipeline
+from src.audio_track import AUDIO_TRACK_SUFFIX, audio_track_path
+
+
+def run_jobs(tmp, calls):
+    """Runs run_ai_pipeline calls with every stage mocked; returns stage call counts."""
+    clips = [{"start": 10.0, "end": 40.0, "title": "clip"}]
+    rendered = []
+
+    class FakeRenderer:
+        def render_clip(self, video_path, clip, crop_track, output_path, **kwargs):
+            assert os.path.exists(video_path)
+            rendered.append((kwargs["style_name"], kwargs["draft"]))
+
+    sources = []
+
+    def download(url, *args, **kwargs):
+        path = os.path.join(tmp, f"source_{len(sources)}.mp4")
+        with open(path, "wb") as f:
+            f.write(b"video")
+        sources.append(path)
+        return path, "Draft Test"
+
+    ingestor = MagicMock()
+    ingestor.download.side_effect = download
+
+    def extract_audio(path, logger=None):
+        track = audio_track_path(path)
+        with open(track, "wb") as f:
+            f.write(b"flac")
+        return track
+
+    ingestor.extract_audio.side_effect = extract_audio
+    transcriber = MagicMock(cache_hit=False, worker_exited=False)
+    transcriber.transcribe.return_value = [{"start": 11.0, "end": 11.5, "word": "hi"}]
+    analyze = MagicMock(side_effect=lambda *a, **k: ([dict(c) for c in clips], []))
+    cropper = MagicMock()
+    cleanup = MagicMock()
+
+    with patch.multiple(
+        pipeline,
+        VideoIngestor=MagicMock(return_value=ingestor),
+        Transcriber=MagicMock(return_value=transcriber),
+        analyze_transcript=analyze,
+        SmartCropper=MagicMock(return_value=cropper),
+        VideoRenderer=FakeRenderer,
+        DiskCache=MagicMock(),
+    ), patch("src.cleanup.cleanup_temp_files", cleanup), patch(
+        "src.b_roll_manager.ingest_b_roll"
+    ):
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            for url, style, max_sec, draft in calls:
+                pipeline.run_ai_pipeline(
+                    url, style, "1080", 15, max_sec, None, None, 60, "center",
+                    "center", "auto", "1080x1920", "General",
+                    draft=draft, logger=MagicMock(),
+                )
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "download": ingestor.download.call_count,
+        "transcribe": transcriber.transcribe.call_count,
+        "analyze": analyze.call_count,
+        "crop": cropper.analyze_video.call_count,
+        "cleanup": cleanup.call_count,
+        "rendered": rendered,
+        "sources": sources,
+    }
+
+
+def test_drafts_reuse_previous_job():
+    print("Testing draft session reuse...")
+    url = "https://example.com/video"
+    with tempfile.TemporaryDirectory() as tmp:
+        # Style iterations: one download / Whisper / LLM / face pass
+        stats = run_jobs(tmp, [(url, "Hormozi", 60, True), (url, "Neon", 60, True)])
+        assert (stats["download"], stats["transcribe"], stats["analyze"], stats["crop"]) == (1, 1, 1, 1)
+        assert stats["rendered"] == [("Hormozi", True), ("Neon", True)]
+        assert os.path.exists(stats["sources"][0]) and stats["cleanup"] == 0
+        # The audio track is dropped after each job, even when the source is kept
+        assert not [f for f in os.listdir(tmp) if f.endswith(AUDIO_TRACK_SUFFIX)]
+
+        # New clip length: source and transcript reused, clips re-picked;
+        # then the final render of those clips consumes the session
+        stats = run_jobs(tmp, [(url, "Neon", 45, True), (url, "Neon", 45, False)])
+        assert (stats["download"], stats["transcribe"], stats["analyze"], stats["crop"]) == (0, 0, 1, 1)
+        assert stats["rendered"] == [("Neon", True), ("Neon", False)]
+        assert not [f for f in os.listdir(tmp) if f.startswith("source_")]
+        assert pipeline._draft_session is None and stats["cleanup"] == 1
+
+        # A draft of another video discards the kept source
+        stats = run_jobs(tmp, [(url, "Fire", 60, True), (url + "2", "Fire", 60, True)])
+        assert stats["download"] == 2
+        assert not os.path.exists(stats["sources"][0]) and os.path.exists(stats["sources"][1])
+        pipeline.release_draft_session()
+        assert not os.path.exists(stats["sources"][1])
+    print("✅ Drafts only re-render; the final render releases the kept source.")
+
+
+if __name__ == "__main__":
+    test_drafts_reuse_previous_job()
@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import tempfile
+from unittest.mock import patch
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import ffmpeg_utils
+from src.ffmpeg_utils import encoder_args, encoder_available, select_encoder
+
+SAMPLE_VIDEO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_video.mp4")
+
+
+def test_probe_runs_once_per_codec():
+    print("Testing encoder probe caching...")
+    encoder_available.cache_clear()
+    try:
+        with patch("subprocess.run") as run:
+            run.return_value.returncode = 1
+            for _ in range(5):
+                assert select_encoder("auto") == ffmpeg_utils.CPU_FALLBACK_PROFILE
+            assert run.call_count == 1
+    finally:
+        encoder_available.cache_clear()
+    print("✅ NVENC is probed once, later renders reuse the answer.")
+
+
+def test_profile_args():
+    print("Testing encoder profile arguments...")
+    codec, preset, params = encoder_args("nvenc", "8M")
+    assert (codec, preset) == ("h264_nvenc", "p4")
+    assert params[params.index("-b:v") + 1] == "8M"
+
+    codec, preset, params = encoder_args("x264_veryfast", "8M")
+    assert (codec, preset) == ("libx264", "veryfast")
+    assert "-crf" in params and "-b:v" not in params
+
+    assert select_encoder("no_such_profile") in ("nvenc", "x264_quality")
+    print("✅ Bitrate profiles honour output_bitrate, CRF profiles ignore it.")
+
+
+def test_profile_throughput():
+    """Wall time of one clip per CPU profile (FFmpeg backend)."""
+    from src.renderer import VideoRenderer
+
+    clip = {"start": 0.0, "end": 4.0, "words": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = VideoRenderer(cache_root=tmp)
+        renderer.temp_dir = tmp
+        for profile in ("x264_quality", "x264_faster", "x264_veryfast", "x265"):
+            if not encoder_available(ffmpeg_utils.ENCODER_PROFILES[profile]["codec"]):
+                print(f"{profile:14s} unavailable, skipped")
+                continue
+            output_path = os.path.join(tmp, f"{profile}.mp4")
+            start = time.perf_counter()
+            renderer.render_clip(
+                SAMPLE_VIDEO, clip, {}, output_path, encoder_profile=profile
+            )
+            elapsed = time.perf_counter() - start
+            size_kb = os.path.getsize(output_path) / 1024
+            print(f"{profile:14s} {elapsed:.2f}s  {size_kb:.0f} KB")
+
+
+if __name__ == "__main__":
+    test_probe_runs_once_per_codec()
+    test_profile_args()
+    test_profile_throughput()
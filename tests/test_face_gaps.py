@@ -0,0 +1,131 @@
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.crop_track import CropTrack
+
+
+def legacy_gaps(track, start_t, duration, fps, min_gap_sec=2.0):
+    """Reference: the original per-frame list + Python walk from render_clip."""
+    total_frames = int(duration * fps)
+    abs_start_frame = int(start_t * fps)
+    face_detected = track.face_at_frames(
+        abs_start_frame + np.arange(total_frames), default=True
+    ).tolist()
+
+    gaps = []
+    min_gap_frames = int(min_gap_sec * fps)
+    current_gap_start = None
+    for i, is_face in enumerate(face_detected):
+        if not is_face:
+            if current_gap_start is None:
+                current_gap_start = i
+        elif current_gap_start is not None:
+            if i - current_gap_start >= min_gap_frames:
+                gaps.append((current_gap_start / fps, i / fps))
+            current_gap_start = None
+    if current_gap_start is not None:
+        if len(face_detected) - current_gap_start >= min_gap_frames:
+            gaps.append((current_gap_start / fps, len(face_detected) / fps))
+    return gaps
+
+
+def make_track(hours=3.0, fps=30.0, stride=5, seed=3):
+    """Sampled track with face dropouts and holes between analyzed windows."""
+    rng = np.random.default_rng(seed)
+    frames = np.arange(0, int(hours * 3600 * fps), stride)
+    # Keep ~70% of the video, in 60s windows (the rest was never analyzed)
+    window = (frames // int(60 * fps)) % 10 < 7
+    frames = frames[window]
+    # Persistent face / no-face stretches: flip state with 3% chance per sample
+    flips = rng.random(len(frames)) < 0.03
+    face = (np.cumsum(flips) % 2) == 0
+    return CropTrack(
+        frames, np.zeros(len(frames)), face, fps, 1920, 1080, 607, stride=stride
+    )
+
+
+def test_matches_legacy_walk():
+    print("Testing RLE gaps against the legacy per-frame walk...")
+    track = make_track(hours=0.5)
+    fps = track.fps
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        start_t = float(rng.uniform(0, 1700))
+        duration = float(rng.uniform(15, 90))
+        expected = legacy_gaps(track, start_t, duration, fps)
+        # Same frame window as the legacy loop: [int(start*fps), +int(duration*fps))
+        first = int(start_t * fps)
+        end_t = (first + int(duration * fps) + 0.5) / fps
+        got = [
+            (a - first / fps, b - first / fps)
+            for a, b in track.no_face_intervals(start_t, end_t)
+        ]
+        assert np.allclose(got, expected) if expected else not got, (got, expected)
+    print("✅ Same gaps as the legacy loop.")
+
+
+def test_hysteresis_and_merge():
+    print("Testing hysteresis / merge distance...")
+    fps = 10.0
+    # 1 = face. Gap 10-30 with a 1-sample face blip at 20; gap 35-60;
+    # a 1-sample no-face blip at 70
+    face = np.ones(100, dtype=bool)
+    face[10:30] = False
+    face[20] = True
+    face[35:60] = False
+    face[70] = False
+    track = CropTrack(np.arange(100), np.zeros(100), face, fps, 1920, 1080, 607)
+
+    raw = track.no_face_intervals(min_gap=0)
+    assert raw == [(1.0, 2.0), (2.1, 3.0), (3.5, 6.0), (7.0, 7.1)], raw
+
+    debounced = track.no_face_intervals(min_gap=0, hysteresis=0.2)
+    assert debounced == [(1.0, 3.0), (3.5, 6.0)], debounced
+
+    merged = track.no_face_intervals(min_gap=0, hysteresis=0.2, merge_distance=0.6)
+    assert merged == [(1.0, 6.0)], merged
+
+    assert track.no_face_intervals(min_gap=2.5, hysteresis=0.2) == [(3.5, 6.0)]
+
+    report = track.face_presence_report(min_gap=0)
+    assert report["analyzed_sec"] == 10.0
+    assert abs(report["no_face_sec"] - 4.5) < 1e-9
+    assert abs(report["face_ratio"] - 0.55) < 1e-9
+    assert report["longest_gap_sec"] == 2.5
+    print("✅ Flicker debounced, nearby gaps merged, report consistent.")
+
+
+def test_gap_benchmark():
+    """3h source: legacy per-frame walk vs RLE over the sample mask."""
+    track = make_track()
+    duration = 3 * 3600.0
+
+    start = time.perf_counter()
+    legacy = legacy_gaps(track, 0.0, duration, track.fps)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gaps = track.no_face_intervals(0.0, duration)
+    rle_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = track.face_presence_report()
+    report_time = time.perf_counter() - start
+
+    print(f"Gaps found: {len(gaps)} (legacy {len(legacy)})")
+    print(f"Legacy walk: {legacy_time * 1000:.1f} ms")
+    print(f"RLE:         {rle_time * 1000:.2f} ms ({legacy_time / rle_time:.0f}x)")
+    print(f"Report:      {report_time * 1000:.2f} ms, face ratio {report['face_ratio']:.2f}")
+    assert len(gaps) == len(legacy)
+
+
+if __name__ == "__main__":
+    test_matches_legacy_walk()
+    test_hysteresis_and_merge()
+    test_gap_benchmark()
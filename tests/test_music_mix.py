@@ -0,0 +1,144 @@
+import sys
+import os
+import subprocess
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ffmpeg_utils import get_ffmpeg_exe
+from src.renderer import MUSIC_VOLUME, list_music_files, speech_windows
+
+VOICE_HZ = 440
+MUSIC_HZ = 1500
+
+
+def test_speech_windows():
+    print("Testing speech window merging...")
+    words = [
+        {"word": "a", "start": 1.0, "end": 1.4},
+        {"word": "b", "start": 1.6, "end": 2.0},  # 0.2s gap -> same phrase
+        {"word": "c", "start": 5.0, "end": 5.5},
+        {"word": "d", "start": 9.8, "end": 10.5},  # clipped to the clip end
+    ]
+    windows = speech_windows(words, duration=10.0)
+    expected = [(0.9, 2.1), (4.9, 5.6), (9.7, 10.0)]
+    assert np.allclose(windows, expected), windows
+    print("✅ Words merged into padded phrases.")
+
+
+def test_music_library_scanned_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        open(os.path.join(tmp, "track.mp3"), "wb").close()
+        with patch("os.listdir", wraps=os.listdir) as listdir:
+            for _ in range(5):
+                assert list_music_files(tmp) == ("track.mp3",)
+            assert listdir.call_count == 1
+    print("✅ Music library listed once per process.")
+
+
+def tone_level(samples, rate, hz):
+    spectrum = np.abs(np.fft.rfft(samples))
+    freqs = np.fft.rfftfreq(len(samples), 1 / rate)
+    return spectrum[np.abs(freqs - hz) < 10].max()
+
+
+def test_music_ducks_under_speech():
+    """Music is mixed by FFmpeg and ducked only while words are spoken."""
+    from src.renderer import VideoRenderer
+
+    ffmpeg = get_ffmpeg_exe()
+    words = [
+        {"word": "one", "start": 1.0, "end": 2.0},
+        {"word": "two", "start": 2.1, "end": 3.0},
+        {"word": "three", "start": 5.0, "end": 6.0},
+    ]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        music_dir = os.path.join(tmp, "assets", "music")
+        os.makedirs(music_dir)
+        source = os.path.join(tmp, "source.mp4")
+        # "Voice": a tone only while the words are spoken
+        subprocess.run(
+            [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "lavfi", "-i", "testsrc2=s=640x360:r=25:d=8",
+                "-f", "lavfi", "-i",
+                f"sine=frequency={VOICE_HZ}:duration=8,"
+                "volume=0:enable='not(between(t,1,3)+between(t,5,6))'",
+                "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac",
+                "-shortest", source,
+            ],
+            check=True,
+        )
+        # 2s music track, shorter than the clip -> must loop
+        subprocess.run(
+            [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "lavfi", "-i", f"sine=frequency={MUSIC_HZ}:duration=2",
+                os.path.join(music_dir, "bed.mp3"),
+            ],
+            check=True,
+        )
+        # Full-scale music level, measured the same way as the mix
+        rate = 8000
+        pcm = subprocess.run(
+            [ffmpeg, "-loglevel", "error", "-i", os.path.join(music_dir, "bed.mp3"),
+             "-ac", "1", "-ar", str(rate), "-f", "f32le", "-"],
+            capture_output=True,
+            check=True,
+        ).stdout
+        track = np.frombuffer(pcm, np.float32)
+        full = tone_level(track[int(0.5 * rate) : rate], rate, MUSIC_HZ)
+
+        os.chdir(tmp)
+        try:
+            renderer = VideoRenderer(cache_root=tmp)
+            renderer.temp_dir = tmp
+            for backend in ("ffmpeg", "moviepy"):
+                output_path = os.path.join(tmp, f"out_{backend}.mp4")
+                renderer.render_clip(
+                    source,
+                    {"start": 0.0, "end": 8.0, "words": words},
+                    {},
+                    output_path,
+                    output_resolution="360x640",
+                    backend=backend,
+                    encoder_profile="x264_veryfast",
+                )
+
+                pcm = subprocess.run(
+                    [ffmpeg, "-loglevel", "error", "-i", output_path,
+                     "-ac", "1", "-ar", str(rate), "-f", "f32le", "-"],
+                    capture_output=True,
+                    check=True,
+                ).stdout
+                audio = np.frombuffer(pcm, np.float32)
+
+                def music_at(t):
+                    seg = audio[int(t * rate) : int((t + 0.5) * rate)]
+                    return tone_level(seg, rate, MUSIC_HZ)
+
+                speaking = music_at(1.5)
+                pause = music_at(4.0)
+                looped_tail = music_at(7.0)
+                print(
+                    f"{backend}: music level speaking {speaking / full:.3f}, "
+                    f"pause {pause / full:.3f}, tail {looped_tail / full:.3f} (x track)"
+                )
+                # Bed at MUSIC_VOLUME between phrases, ducked below it under speech
+                assert abs(pause / full - MUSIC_VOLUME) < 0.02
+                assert speaking < full * MUSIC_VOLUME / 2  # at least ~6 dB of ducking
+                assert looped_tail > pause * 0.8  # looped to the clip end
+        finally:
+            os.chdir(cwd)
+    print("✅ Music ducks under speech and loops to the clip end.")
+
+
+if __name__ == "__main__":
+    test_speech_windows()
+    test_music_library_scanned_once()
+    test_music_ducks_under_speech()
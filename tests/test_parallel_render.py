@@ -0,0 +1,136 @@
+import sys
+import os
+import time
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import pipeline
+from src.pipeline import render_worker_count
+
+# The pipeline's GPU "stabilize" sleep is patched out; fake renders still wait
+real_sleep = time.sleep
+
+
+def test_render_worker_count():
+    print("Testing render worker limits...")
+    assert render_worker_count(0) == 1
+    assert render_worker_count(1) == 1
+    assert render_worker_count(5, max_parallel=2) == 2
+    assert render_worker_count(2, max_parallel=8) == 2
+
+    # 32-core box: NVENC stops at its session limit, x264 scales with the CPU
+    with patch.object(pipeline, "select_encoder", side_effect=lambda p: p), \
+            patch("os.cpu_count", return_value=32):
+        assert render_worker_count(10, encoder_profile="nvenc") == pipeline.NVENC_MAX_SESSIONS
+        assert render_worker_count(10, encoder_profile="x264_veryfast") == 8
+        assert render_worker_count(10, encoder_profile="draft") == 8
+    print("✅ Worker count respects clip count, encoder limit and override.")
+
+
+def run_pipeline_with_fake_renders(durations, max_parallel):
+    """Runs run_ai_pipeline with every stage mocked; renders just sleep."""
+    clips = [
+        {"start": i * 30.0, "end": i * 30.0 + 20.0, "title": f"clip {i}"}
+        for i in range(len(durations))
+    ]
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class FakeRenderer:
+        def render_clip(self, video_path, clip, crop_track, output_path, **kwargs):
+            i = int(clip["start"] // 30)
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            proglog = kwargs["proglog_logger"]
+            proglog(frame_index__total=10)
+            for step in range(10):
+                real_sleep(durations[i] / 10)
+                proglog(frame_index__index=step + 1)
+            with lock:
+                active["now"] -= 1
+
+    ingestor = MagicMock()
+    ingestor.download.return_value = ("missing_video.mp4", "Parallel Test")
+    transcriber = MagicMock()
+    transcriber.transcribe.return_value = []
+    cropper = MagicMock()
+
+    events = []
+    with tempfile.TemporaryDirectory() as tmp, patch.multiple(
+        pipeline,
+        VideoIngestor=MagicMock(return_value=ingestor),
+        Transcriber=MagicMock(return_value=transcriber),
+        analyze_transcript=MagicMock(return_value=(clips, [])),
+        SmartCropper=MagicMock(return_value=cropper),
+        VideoRenderer=FakeRenderer,
+        DiskCache=MagicMock(),
+    ), patch.object(pipeline.time, "sleep"):
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            result = pipeline.run_ai_pipeline(
+                "https://example.com/video",
+                "Hormozi",
+                "1080",
+                15,
+                60,
+                None,
+                None,
+                60,
+                "center",
+                "center",
+                "auto",
+                "1080x1920",
+                "General",
+                max_parallel_renders=max_parallel,
+                logger=MagicMock(),
+                progress_callback=lambda p, m: events.append((p, m)),
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    return result, events, elapsed, active["peak"]
+
+
+def test_parallel_render_scheduler():
+    """Clips render concurrently; CLIP_READY arrives in completion order."""
+    print("Testing parallel render scheduler...")
+    # Clip 1 is the slowest, so it must be announced last
+    durations = [0.6, 1.2, 0.3]
+
+    _, _, serial_time, serial_peak = run_pipeline_with_fake_renders(durations, 1)
+    result, events, parallel_time, parallel_peak = run_pipeline_with_fake_renders(
+        durations, 3
+    )
+
+    ready = [m for _, m in events if m.startswith("CLIP_READY:")]
+    ready_labels = [m.rsplit("|", 1)[1] for m in ready]
+    print(f"Serial:   {serial_time:.2f}s (peak {serial_peak} concurrent)")
+    print(f"Parallel: {parallel_time:.2f}s (peak {parallel_peak} concurrent)")
+    print(f"CLIP_READY order: {ready_labels}")
+
+    assert serial_peak == 1
+    assert parallel_peak == 3
+    assert parallel_time < serial_time
+    assert ready_labels == ["Clip 3", "Clip 1", "Clip 2"]
+    assert result == [m.split(":", 1)[1].rsplit("|", 1)[0] for m in ready]
+
+    # Aggregated render progress never goes backwards
+    render_progress = [
+        p for p, m in events if m.startswith(("Rendering Clip", "CLIP_READY:"))
+    ]
+    assert all(b >= a - 1e-9 for a, b in zip(render_progress, render_progress[1:]))
+    assert events[-1] == (1.0, "Done!")
+    print("✅ Parallel renders aggregate progress and report in completion order.")
+
+
+if __name__ == "__main__":
+    test_render_worker_count()
+    test_parallel_render_scheduler()
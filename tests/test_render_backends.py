@@ -0,0 +1,146 @@
+import sys
+import os
+import time
+import tempfile
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_VIDEO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_video.mp4")
+
+
+def make_moving_track(fps, width, height, duration):
+    """Synthetic face track sweeping left -> right so the crop actually moves."""
+    from src.crop_track import CropTrack
+
+    crop_w = int(height * (9 / 16))
+    frames = np.arange(0, int(duration * fps) + 1)
+    crop_x = np.linspace(0, width - crop_w, len(frames))
+    return CropTrack(
+        frames, crop_x, np.ones(len(frames), bool), fps, width, height, crop_w
+    )
+
+
+def read_frames(path):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_render_backend_benchmark():
+    """Render wall time per clip: MoviePy per-frame transform vs single FFmpeg graph."""
+    from src.ffmpeg_utils import probe_video
+    from src.renderer import VideoRenderer
+
+    width, height, fps, duration = probe_video(SAMPLE_VIDEO)
+    track = make_moving_track(fps, width, height, duration)
+    clip = {
+        "start": 0.5,
+        "end": min(duration, 4.5),
+        "words": [
+            {"word": "Render", "start": 0.6, "end": 1.0},
+            {"word": "backend", "start": 1.1, "end": 1.8},
+            {"word": "benchmark", "start": 2.0, "end": 3.0},
+        ],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = VideoRenderer(cache_root=tmp)
+        renderer.temp_dir = tmp
+
+        timings = {}
+        outputs = {}
+        for backend in ("moviepy", "ffmpeg"):
+            outputs[backend] = os.path.join(tmp, f"clip_{backend}.mp4")
+            start = time.perf_counter()
+            renderer.render_clip(
+                SAMPLE_VIDEO,
+                clip,
+                track,
+                outputs[backend],
+                output_resolution="540x960",
+                backend=backend,
+            )
+            timings[backend] = time.perf_counter() - start
+
+        moviepy_frames = read_frames(outputs["moviepy"])
+        ffmpeg_frames = read_frames(outputs["ffmpeg"])
+
+        print(f"MoviePy backend: {timings['moviepy']:.2f}s per clip")
+        print(
+            f"FFmpeg backend:  {timings['ffmpeg']:.2f}s per clip "
+            f"({timings['moviepy'] / timings['ffmpeg']:.1f}x)"
+        )
+
+        assert len(ffmpeg_frames) == len(moviepy_frames)
+        assert ffmpeg_frames[0].shape == (960, 540, 3)
+
+        # Same crop path: frames differ only by encoder noise
+        diffs = [
+            np.abs(a.astype(np.int16) - b.astype(np.int16)).mean()
+            for a, b in zip(moviepy_frames, ffmpeg_frames)
+        ]
+        print(f"Mean abs pixel difference: {np.mean(diffs):.2f} (max {max(diffs):.2f})")
+        assert max(diffs) < 4.0
+
+        # Temp artifacts are cleaned up by both backends
+        assert not [f for f in os.listdir(tmp) if f.endswith((".ass", ".cmd"))]
+        print("✅ FFmpeg backend output matches the MoviePy path.")
+
+
+def test_draft_preview():
+    """Draft mode: same crop track, 540x960 ultrafast, only the first N seconds."""
+    from src.ffmpeg_utils import probe_video
+    from src.renderer import VideoRenderer
+
+    width, height, fps, duration = probe_video(SAMPLE_VIDEO)
+    track = make_moving_track(fps, width, height, duration)
+    clip = {
+        "start": 0.0,
+        "end": duration,
+        "words": [
+            {"word": "Draft", "start": 0.2, "end": 0.8},
+            {"word": "preview", "start": 2.5, "end": 3.2},
+        ],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        renderer = VideoRenderer(cache_root=tmp)
+        renderer.temp_dir = tmp
+
+        full_path = os.path.join(tmp, "full.mp4")
+        start = time.perf_counter()
+        renderer.render_clip(SAMPLE_VIDEO, clip, track, full_path)
+        full_time = time.perf_counter() - start
+
+        draft_path = os.path.join(tmp, "draft.mp4")
+        start = time.perf_counter()
+        renderer.render_clip(
+            SAMPLE_VIDEO, clip, track, draft_path, draft=True, draft_seconds=2
+        )
+        draft_time = time.perf_counter() - start
+
+        draft_w, draft_h, _, draft_duration = probe_video(draft_path)
+        print(f"Full render:  {full_time:.2f}s, {os.path.getsize(full_path) // 1024} KB")
+        print(f"Draft render: {draft_time:.2f}s, {os.path.getsize(draft_path) // 1024} KB")
+
+        assert (draft_w, draft_h) == (540, 960)
+        assert abs(draft_duration - 2.0) < 0.1
+        assert clip["end"] == duration  # caller's clip untouched
+        assert draft_time < full_time
+    print("✅ Draft preview rendered at low res from the same crop track.")
+
+
+if __name__ == "__main__":
+    test_render_backend_benchmark()
+    test_draft_preview()
@@ -0,0 +1,129 @@
+import sys
+import os
+import time
+import subprocess
+import tempfile
+
+import numpy as np
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ffmpeg_utils import get_ffmpeg_exe, probe_video
+from src.pipeline import group_render_jobs
+
+FPS = 25
+
+
+def make_source(path, seconds=24):
+    subprocess.run(
+        [
+            get_ffmpeg_exe(), "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc2=s=1280x720:r={FPS}:d={seconds}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-g", str(FPS),
+            "-c:a", "aac", "-shortest", path,
+        ],
+        check=True,
+    )
+
+
+def read_frames(path):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame.astype(np.int16))
+    cap.release()
+    return frames
+
+
+def test_group_render_jobs():
+    print("Testing shared-decode grouping...")
+    clips = [
+        {"start": 0.0, "end": 20.0},
+        {"start": 20.0, "end": 40.0},  # contiguous series part
+        {"start": 35.0, "end": 50.0},  # overlaps
+        {"start": 120.0, "end": 140.0},  # far away
+        {"start": 140.5, "end": 160.0},  # within the gap
+    ]
+    jobs = [(i, clip, f"clip{i}.mp4") for i, clip in enumerate(clips)]
+
+    groups = group_render_jobs(jobs, max_gap=1.0, max_size=3)
+    assert [[i for i, _, _ in g] for g in groups] == [[0, 1, 2], [3, 4]]
+
+    # Session cap splits a long contiguous run
+    groups = group_render_jobs(jobs, max_gap=1.0, max_size=2)
+    assert [[i for i, _, _ in g] for g in groups] == [[0, 1], [2], [3, 4]]
+
+    # Input order doesn't matter
+    groups = group_render_jobs(jobs[::-1], max_gap=1.0, max_size=3)
+    assert [[i for i, _, _ in g] for g in groups] == [[0, 1, 2], [3, 4]]
+    print("✅ Overlapping/adjacent clips grouped up to the session limit.")
+
+
+def test_shared_decode_matches_separate_renders():
+    """One decode + split/trim gives the same clips as one render per clip."""
+    from src.renderer import VideoRenderer
+
+    print("Testing shared-decode group render...")
+    clips = [
+        {"start": 2.0, "end": 10.0, "words": [{"word": "one", "start": 3.0, "end": 4.0}]},
+        {"start": 10.0, "end": 18.0, "words": [{"word": "two", "start": 12.0, "end": 13.0}]},
+        {"start": 14.0, "end": 22.0, "words": []},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.mp4")
+        make_source(source)
+        renderer = VideoRenderer(cache_root=tmp)
+        renderer.temp_dir = tmp
+
+        start = time.perf_counter()
+        separate = []
+        for k, clip in enumerate(clips):
+            output_path = os.path.join(tmp, f"separate_{k}.mp4")
+            renderer.render_clip(
+                source,
+                clip,
+                {},
+                output_path,
+                output_resolution="540x960",
+                backend="ffmpeg",
+                encoder_profile="x264_veryfast",
+            )
+            separate.append(output_path)
+        separate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        grouped = [os.path.join(tmp, f"grouped_{k}.mp4") for k in range(len(clips))]
+        renderer.render_clip_group(
+            source,
+            list(zip(clips, grouped)),
+            {},
+            output_resolution="540x960",
+            encoder_profile="x264_veryfast",
+        )
+        grouped_time = time.perf_counter() - start
+
+        for clip, a, b in zip(clips, separate, grouped):
+            frames_a = read_frames(a)
+            frames_b = read_frames(b)
+            expected = int((clip["end"] - clip["start"]) * FPS)
+            assert abs(len(frames_a) - expected) <= 1, (len(frames_a), expected)
+            assert len(frames_a) == len(frames_b), (len(frames_a), len(frames_b))
+            diff = max(np.abs(fa - fb).mean() for fa, fb in zip(frames_a, frames_b))
+            assert diff < 2.0, diff  # same frames, up to encoder noise
+            assert abs(probe_video(a)[3] - probe_video(b)[3]) < 0.1
+
+        print(f"Separate renders: {separate_time:.2f}s")
+        print(f"Shared decode:    {grouped_time:.2f}s ({separate_time / grouped_time:.2f}x)")
+    print("✅ Grouped outputs match separate renders.")
+
+
+if __name__ == "__main__":
+    test_group_render_jobs()
+    test_shared_decode_matches_separate_renders()
@@ -1,6 +1,7 @@
 import sys
 import os
 import shutil
+import tempfile
 
 # Add project root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,7 +27,8 @@ def test_styles():
         c.write_videofile(video_path, fps=24)
         print("✅ Dummy video created.")
 
-    renderer = VideoRenderer()
+    cache_dir = tempfile.TemporaryDirectory()
+    renderer = VideoRenderer(cache_root=cache_dir.name)
 
     styles = ["Hormozi", "Fire", "Neon", "Minimal"]
 
@@ -44,6 +46,7 @@ def test_styles():
 
     dummy_crop_map = {}  # No face tracking needed for dummy test
 
+    failures = []
     for style in styles:
         output = f"tests/style_test_{style}.mp4"
         print(f"👉 Rendering {style}...")
@@ -59,6 +62,10 @@ def test_styles():
             print(f"✅ Created: {output}")
         except Exception as e:
             print(f"❌ Failed {style}: {e}")
+            failures.append(style)
+
+    cache_dir.cleanup()
+    assert not failures, f"Styles failed to render: {failures}"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# Add project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.disk_cache import DiskCache
+from src.ingest_transcribe import Transcriber
+from src.transcript_cache import load_words, save_words
+
+VOCABULARY = ["the", "a", "money", "business", "you", "café", "naïve", "😂", "don't", "1,000"]
+
+
+def make_words(n=9000):
+    """~1h of speech (2.5 words/sec) with a realistic repeated vocabulary."""
+    return [
+        {
+            "start": round(i * 0.4, 3),
+            "end": round(i * 0.4 + 0.3, 3),
+            "word": VOCABULARY[i * 7 % len(VOCABULARY)] + ("" if i % 13 else "."),
+        }
+        for i in range(n)
+    ]
+
+
+def test_columnar_round_trip():
+    print("Testing columnar transcript format...")
+    words = make_words()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words.npz")
+        save_words(words, path)
+        assert load_words(path) == words
+
+        empty = os.path.join(tmp, "empty.npz")
+        save_words([], empty)
+        assert load_words(empty) == []
+
+        json_path = os.path.join(tmp, "words.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(words, f, ensure_ascii=False)
+
+        start = time.perf_counter()
+        load_words(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(f"JSON:     {os.path.getsize(json_path) / 1024:.0f} KB")
+        print(f"Columnar: {os.path.getsize(path) / 1024:.0f} KB (load {load_ms:.1f} ms)")
+        assert os.path.getsize(path) * 4 < os.path.getsize(json_path)
+    print(f"✅ {len(words)} words round-trip exactly.")
+
+
+def test_transcriber_skips_whisper_on_hit():
+    print("Testing transcript cache in the Transcriber...")
+    words = make_words(200)
+    with tempfile.TemporaryDirectory() as tmp:
+        media = os.path.join(tmp, "abc123.16k.flac")
+        with open(media, "wb") as f:
+            f.write(os.urandom(64 * 1024))
+        cache = DiskCache("transcripts", 1024 * 1024, root=tmp)
+
+        def transcribe(self, video_path, logger=None, on_words=None):
+            time.sleep(0.2)  # Whisper
+            return [dict(w) for w in words]
+
+        with patch.object(Transcriber, "transcribe_server", autospec=True, side_effect=transcribe) as whisper, \
+                patch.object(Transcriber, "transcribe_subprocess", autospec=True, side_effect=transcribe):
+            first = Transcriber(cache=cache)
+            assert first.transcribe(media) == words and not first.cache_hit
+
+            # Same content under another name (re-download), new Transcriber
+            copy = os.path.join(tmp, "abc123_again.16k.flac")
+            shutil.copy(media, copy)
+            batches = []
+            second = Transcriber(cache=cache)
+            start = time.perf_counter()
+            assert second.transcribe(copy, on_words=batches.append) == words
+            hit_ms = (time.perf_counter() - start) * 1000
+            assert second.cache_hit and batches == [words]
+            calls = whisper.call_count + Transcriber.transcribe_subprocess.call_count
+            assert calls == 1
+
+            # Settings that change the words are part of the key
+            other = [
+                Transcriber(model_size="small", cache=cache),
+                Transcriber(mode="chunked", cache=cache),
+            ]
+            keys = {t.cache_key(media) for t in other + [first]}
+            assert len(keys) == 3
+            assert Transcriber(model_size="small", cache=cache).transcribe(media) == words
+            assert whisper.call_count + Transcriber.transcribe_subprocess.call_count == 2
+
+        print(f"Cache hit: {hit_ms:.1f} ms (fingerprint + load)")
+    print("✅ Whisper skipped for the same media and settings.")
+
+
+if __name__ == "__main__":
+    test_columnar_round_trip()
+    test_transcriber_skips_whisper_on_hit()